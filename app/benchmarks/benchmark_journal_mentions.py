@@ -0,0 +1,100 @@
+# Third-party packages
+import numpy as np
+import pandas as pd
+from pandera.typing import DataFrame
+
+# Built-in packages
+import argparse
+import time
+from datetime import datetime
+from typing import Dict
+
+# My Custom packages
+from app.src.graph_linkage.journal_mentions import (
+    JournalMentions,
+    add_article_information_columns,
+)
+import app.src.pandas_processing.transform as T
+
+
+def generate_articles(nb_articles: int, nb_journals: int, seed: int = 0) -> DataFrame:
+    """
+    Generates random articles shaped like the cleaned articles of the pipeline (indexed by ID), most of them mentioning a drug.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(["Study", "Of", "Patients", "Treated", "With", "Tetracycline"])
+
+    return pd.DataFrame(
+        {
+            "title": [" ".join(rng.choice(words, size=8)) for _ in range(nb_articles)],
+            "date": pd.Timestamp("2019-01-01")
+            + pd.to_timedelta(rng.integers(0, 1000, nb_articles), unit="D"),
+            "journal": [
+                f"Journal {number}"
+                for number in rng.integers(0, nb_journals, nb_articles)
+            ],
+            "article_type": rng.choice(["PubMed", "ClinicalTrial"], size=nb_articles),
+        },
+        index=pd.Index([str(number) for number in range(nb_articles)], name="id"),
+    )
+
+
+def time_article_information(articles_df: DataFrame) -> Dict:
+    """
+    Measures the per-article cost of getting the link fields (mention date string and type flags),
+    row by row like the former implementation and in bulk like `JournalMentions.get_articles_information`.
+    """
+    start = time.perf_counter()
+    for article_id in articles_df.index:
+        article_row = articles_df.loc[article_id]
+        datetime.strftime(article_row["date"], "%Y-%m-%d")
+        article_row["article_type"] == "PubMed"
+        article_row["article_type"] == "ClinicalTrial"
+    row_by_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    journal_mentions = JournalMentions(
+        title="Benchmark",
+        drugs_dataFrame=pd.DataFrame(),
+        journal_articles_dataFrame=add_article_information_columns(articles_df),
+    )
+    for _ in journal_mentions.get_articles_information():
+        pass
+    bulk_seconds = time.perf_counter() - start
+
+    return {
+        "row_by_row_us_per_article": row_by_row_seconds / len(articles_df) * 1e6,
+        "bulk_us_per_article": bulk_seconds / len(articles_df) * 1e6,
+    }
+
+
+def time_link_graph(articles_df: DataFrame, drugs_df: DataFrame) -> Dict:
+    """
+    Measures the per-article cost of the whole linking step (`build_link_graph_from_df`).
+    """
+    start = time.perf_counter()
+    T.build_link_graph_from_df(articles_df, drugs_df)
+    link_seconds = time.perf_counter() - start
+
+    return {"link_us_per_article": link_seconds / len(articles_df) * 1e6}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark of the per-article cost of the link step"
+    )
+    parser.add_argument("--nb_articles", type=int, default=20000)
+    parser.add_argument("--nb_journals", type=int, default=100)
+    args = parser.parse_args()
+
+    articles_df = generate_articles(args.nb_articles, args.nb_journals)
+    drugs_df = pd.DataFrame(
+        {"name": ["Tetracycline", "Ethanol"]},
+        index=pd.Index(["S03AA", "V03AB"], name="atccode"),
+    )
+
+    results = time_article_information(articles_df)
+    results.update(time_link_graph(articles_df, drugs_df))
+
+    for name, value in results.items():
+        print(f"{name} : {value:.2f}")
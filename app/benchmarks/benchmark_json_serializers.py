@@ -0,0 +1,96 @@
+# Built-in packages
+import argparse
+import io
+import time
+from typing import Dict, List
+
+# My Custom packages
+from app.utils.json_serializers import get_json_serializer
+
+# Approximate size of a mention once serialized (compact), used to reach the target graph size
+MENTION_SIZE_BYTES = 230
+
+
+def generate_graph(target_mb: int, nb_journals: int = 1000) -> Dict:
+    """
+    Generates a link graph of roughly `target_mb` MB once serialized (compact), with the schema of `graph_link.json`.
+    """
+    nb_mentions = target_mb * 1_000_000 // MENTION_SIZE_BYTES
+    nb_mentions_per_journal = max(nb_mentions // nb_journals, 1)
+
+    journals = []
+    for journal_number in range(nb_journals):
+        mentions = [
+            {
+                "articleId": f"{journal_number}-{mention_number}",
+                "articleTitle": f"Tetracycline Resistance Patterns Of Lactobacillus Buchneri Group Strains {mention_number}",
+                "mentionDate": "2020-01-01",
+                "mentionedDrugID": "S03AA",
+                "mentionedDrugName": "Tetracycline",
+            }
+            for mention_number in range(nb_mentions_per_journal)
+        ]
+        journals.append(
+            {
+                "title": f"Journal Of Food Protection {journal_number}",
+                "referencedBy": {
+                    "pubmedArticles": mentions[: nb_mentions_per_journal // 2],
+                    "clinicalTrials": mentions[nb_mentions_per_journal // 2 :],
+                },
+            }
+        )
+
+    return {"journals": journals}
+
+
+def benchmark_serializers(graph: Dict, serializer_names: List) -> List:
+    """
+    Times the dump (compact and pretty) and the load of the graph with each serializer, in memory to leave the disk out.
+    """
+    results = []
+
+    for name in serializer_names:
+        serializer = get_json_serializer(name)
+
+        for pretty in [False, True]:
+            binary_file = io.BytesIO()
+            start = time.perf_counter()
+            serializer.dump(graph, binary_file, pretty=pretty)
+            dump_seconds = time.perf_counter() - start
+
+            binary_file.seek(0)
+            start = time.perf_counter()
+            serializer.load(binary_file, is_link_graph=True)
+            load_seconds = time.perf_counter() - start
+
+            size_mb = binary_file.getbuffer().nbytes / 1e6
+            results.append(
+                {
+                    "serializer": name,
+                    "pretty": pretty,
+                    "size_mb": size_mb,
+                    "dump_mb_per_second": size_mb / dump_seconds,
+                    "load_mb_per_second": size_mb / load_seconds,
+                }
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the json serializers on a generated link graph"
+    )
+    parser.add_argument("--target_mb", type=int, default=1024)
+    parser.add_argument(
+        "--serializers", type=str, default="json;orjson", help="`;` separated names"
+    )
+    args = parser.parse_args()
+
+    graph = generate_graph(args.target_mb)
+
+    for result in benchmark_serializers(graph, args.serializers.split(";")):
+        print(
+            f"{result['serializer']:<8} pretty={result['pretty']!s:<5} : {result['size_mb']:.0f} MB, "
+            f"dump {result['dump_mb_per_second']:.0f} MB/s, load {result['load_mb_per_second']:.0f} MB/s"
+        )
@@ -1,157 +1,831 @@
 # Third Party Packages
+import pandas as pd
 from pandera.typing import DataFrame
 
 # Built-in Packages
 import argparse
-from typing import List
+import json
+import os
+import time
+from contextlib import closing
+from typing import Callable, Dict, List, Optional
 import warnings
 
 # My Custom Modules
-from app.utils.my_logger import logger
+from app.utils.my_logger import (
+    LOG_LEVELS,
+    configure_logger,
+    is_enabled_env_flag,
+    logger,
+)
 import app.utils.files_processing as U
+import app.utils.json_serializers as JS
+import app.utils.metrics as M
+import app.utils.stage_scheduler as SS
 import app.src.adhoc.json_processing as A
+import app.src.adhoc.sql_processing as S
+import app.src.adhoc.temporal_index as TI
+import app.src.adhoc.graph_diff as GD
+import app.src.adhoc.query_cache as QC
 import app.src.pandas_processing.load as L
 import app.src.pandas_processing.clean as C
 import app.src.pandas_processing.transform as T
+import app.src.pandas_processing.spill as SP
+import app.src.graph_linkage.journal_aliases as J
+import app.src.graph_linkage.drug_synonyms as DS
+import app.src.graph_linkage.checkpoints as CK
+import app.src.graph_linkage.article_ids as AI
+import app.src.graph_linkage.partitioned_graph as PG
 from app.src.constants import (
     CLINICAL_TRIALS_PATHS,
     PUBMED_PATHS,
     DRUGS_PATHS,
     OUTPUT_PATH,
+    GRAPH_STORE_PATH,
+    TEMPORAL_INDEX_PATH,
 )
 
+GRAPH_LINK_BACKENDS = ["pandas", "polars"]
 
-def clean_dataframes(
-    clinical_df: DataFrame, pubmed_df: DataFrame, drugs_df: DataFrame
-) -> List:
+
+def clean_clinical_df(clinical_df: DataFrame) -> DataFrame:
     """
-    This function is simply used to orchestrate the different cleaning steps in the correct order.
-    Check the docstring of each function or the in-line comments for more details.
+    Cleaning steps of the clinical trials : column names, date format, merge of the duplicate rows, titles and IDs.
     """
     # Standardize column names
     clinical_df = C.rename_column(clinical_df, {"scientific_title": "title"})
-    drugs_df = C.rename_column(drugs_df, {"drug": "name"})
-    logger.info("[Cleaning] - Successfully renamed columns.")
 
     # Standardize the Date format (into %Y-%m-%d)
     clinical_df = C.normalize_dates_format(clinical_df, "date", "%Y-%m-%d")
-    pubmed_df = C.normalize_dates_format(pubmed_df, "date", "%Y-%m-%d")
-    logger.info("[Cleaning] - Successfully standardized date formats.")
 
     # Merge duplicate rows together, filling in missing columns based on other rows
-    clinical_articles_group = clinical_df.groupby(["title", "date"], group_keys=False)[
-        clinical_df.columns.tolist()
-    ]
-    clinical_df = clinical_articles_group.apply(T.merge_rows).reset_index(drop=True)
+    clinical_df = C.merge_duplicate_rows(clinical_df, ["title", "date"])
 
-    pubmed_articles_group = pubmed_df.groupby(["title", "date"], group_keys=False)[
-        clinical_df.columns.tolist()
-    ]
-    pubmed_df = pubmed_articles_group.apply(T.merge_rows).reset_index(drop=True)
-    logger.info("[Cleaning] - Successfully filled in missing data.")
+    # Clean titles and names
+    clinical_df = clinical_df.assign(
+        title=clinical_df["title"].apply(C.clean_titles),
+        journal=clinical_df["journal"].apply(C.clean_titles),
+    )
 
-    # Fill in missing IDs
-    pubmed_df = C.fill_in_missing_ids_int(pubmed_df, "id")
-    logger.info("[Cleaning] - Successfully interpolated missingIDs.")
+    # Standardize the type of IDs used (string)
+    clinical_df = C.cast_id_as_string(clinical_df, "id")
 
-    # Clean titles and names
-    pubmed_df["title"] = pubmed_df["title"].apply(C.clean_titles)
-    pubmed_df["journal"] = pubmed_df["journal"].apply(C.clean_titles)
+    logger.info("[Cleaning] - Successfully cleaned the clinical trials.")
+    return clinical_df
 
-    clinical_df["title"] = clinical_df["title"].apply(C.clean_titles)
-    clinical_df["journal"] = clinical_df["journal"].apply(C.clean_titles)
 
-    drugs_df["name"] = drugs_df["name"].apply(C.clean_titles)
-    logger.info("[Cleaning] - Successfully cleaned all titles and names.")
+def clean_pubmed_df(
+    pubmed_df: DataFrame, missing_id_strategy: str = "sequential"
+) -> DataFrame:
+    """
+    Cleaning steps of the pubmed articles : date format, merge of the duplicate rows, missing IDs, titles and IDs.
+    The missing IDs are numbered after the maximum ID (`sequential`) or generated from the title and date of each article (`content_hash`).
+    """
+    # Standardize the Date format (into %Y-%m-%d)
+    pubmed_df = C.normalize_dates_format(pubmed_df, "date", "%Y-%m-%d")
+
+    # Merge duplicate rows together, filling in missing columns based on other rows
+    pubmed_df = C.merge_duplicate_rows(pubmed_df, ["title", "date"])
+
+    # Fill in missing IDs
+    if missing_id_strategy == "content_hash":
+        pubmed_df = C.fill_in_missing_ids_content_hash(pubmed_df, "id")
+    else:
+        pubmed_df = C.fill_in_missing_ids_int(pubmed_df, "id")
+
+    # Clean titles and names
+    pubmed_df = pubmed_df.assign(
+        title=pubmed_df["title"].apply(C.clean_titles),
+        journal=pubmed_df["journal"].apply(C.clean_titles),
+    )
 
     # Standardize the type of IDs used (string)
     pubmed_df = C.cast_id_as_string(pubmed_df, "id")
-    clinical_df = C.cast_id_as_string(clinical_df, "id")
 
-    return clinical_df, pubmed_df, drugs_df
+    logger.info("[Cleaning] - Successfully cleaned the pubmed articles.")
+    return pubmed_df
 
 
-def generate_graph_link(
-    clinical_trials_path: List, pubmed_paths: List, drugs_paths: List, output_path: str
-) -> None:
-    # Load Data
-    clinical_df = L.load_input_data(clinical_trials_path)
-    pubmed_df = L.load_input_data(pubmed_paths)
-    drugs_df = L.load_input_data(drugs_paths)
+def clean_drugs_df(drugs_df: DataFrame) -> DataFrame:
+    """
+    Cleaning steps of the drugs : column names and drug names.
+    """
+    drugs_df = C.rename_column(drugs_df, {"drug": "name"})
+    drugs_df = drugs_df.assign(name=drugs_df["name"].apply(C.clean_titles))
+
+    logger.info("[Cleaning] - Successfully cleaned the drugs.")
+    return drugs_df
 
-    # Clean dataframes
-    clinical_df_cleaned, pubmed_df_cleaned, drugs_df_cleaned = clean_dataframes(
-        clinical_df, pubmed_df, drugs_df
+
+def clean_dataframes(
+    clinical_df: DataFrame, pubmed_df: DataFrame, drugs_df: DataFrame
+) -> List:
+    """
+    This function is simply used to orchestrate the different cleaning steps in the correct order.
+    The three dataframes are cleaned independently, check the docstring of each function or the in-line comments for more details.
+    """
+    return (
+        clean_clinical_df(clinical_df),
+        clean_pubmed_df(pubmed_df),
+        clean_drugs_df(drugs_df),
     )
 
+
+def merge_articles_dfs(
+    clinical_df: DataFrame,
+    pubmed_df: DataFrame,
+    journal_aliases_path: Optional[str] = None,
+    memory_limit: Optional[int] = None,
+) -> DataFrame:
+    """
+    Merges the cleaned pubmed articles and clinical trials into one dataframe, tagged with the type of each article.
+    When a journal aliases path is provided, near-duplicate journal names are merged using (and updating) the cached alias map.
+    When the articles do not fit in the memory limit, each source is spilled to the disk by ID partitions instead of being merged in memory.
+    """
+    journal_alias_map = None
+    # Merge near-duplicate journal names (abbreviations, typos...) into a single node
+    if journal_aliases_path is not None:
+        journal_alias_map = J.canonicalize_journal_names(
+            pd.concat([pubmed_df["journal"], clinical_df["journal"]]),
+            journal_aliases_path,
+        )
+
+    if memory_limit is not None:
+        nb_partitions = SP.get_nb_spill_partitions(
+            [pubmed_df, clinical_df], memory_limit
+        )
+        if nb_partitions > 1:
+            return SP.spill_articles_by_id(
+                {"PubMed": pubmed_df, "ClinicalTrial": clinical_df},
+                nb_partitions,
+                journal_alias_map,
+            )
+
     # Enrich the dataframes with the types of articles, before merging
-    pubmed_df_cleaned["article_type"] = "PubMed"
-    clinical_df_cleaned["article_type"] = "ClinicalTrial"
+    pubmed_df = pubmed_df.assign(article_type="PubMed")
+    clinical_df = clinical_df.assign(article_type="ClinicalTrial")
 
     # Merge the articles dataframes into one
-    all_articles_df = T.merge_dataframes([pubmed_df_cleaned, clinical_df_cleaned])
+    all_articles_df = T.merge_dataframes([pubmed_df, clinical_df])
     logger.info(
         "[Transform] - Successfully merged the pubmed and clinical trials dataframes."
     )
 
+    if journal_alias_map is not None:
+        # A hash lookup per row, `replace` with a dictionary scales with the number of aliases
+        journals = all_articles_df["journal"]
+        all_articles_df["journal"] = journals.map(journal_alias_map).fillna(journals)
+
+    return all_articles_df
+
+
+def drop_duplicate_ids(all_articles_df: DataFrame, drugs_df: DataFrame) -> List:
+    """
+    Drops the articles with an empty title or journal, then the duplicate IDs, and indexes the articles and drugs by ID.
+    When the articles were spilled to the disk by ID partitions, they are deduped one partition at a time, then spilled by journal partitions.
+    """
+    drugs_df_cleaned = C.drop_duplicate_ids_then_index_df(drugs_df, "atccode")
+
+    if isinstance(all_articles_df, SP.SpilledSources):
+        return SP.dedupe_spilled_articles(all_articles_df), drugs_df_cleaned
+
     # Remove empty strings
     all_articles_df_cleaned = C.drop_empty_titles_and_journals(all_articles_df)
     logger.info("[Cleaning] - Successfully droped rows with empty titles and names.")
 
     # Drop duplicate IDs and index dataframes
-    drugs_df_cleaned, all_articles_df_cleaned = C.drop_duplicate_ids_then_index(
-        drugs_df_cleaned, all_articles_df_cleaned
+    all_articles_df_cleaned = C.drop_duplicate_ids_then_index_df(
+        all_articles_df_cleaned, "id"
     )
     logger.info("[Cleaning] - Successfully droped rows with duplicate IDs.")
 
-    # Finally, generate the graph as json file
-    output_graph = T.build_link_graph_from_df(all_articles_df_cleaned, drugs_df_cleaned)
-    U.write_dict_to_file(output_path, output_graph)
+    return all_articles_df_cleaned, drugs_df_cleaned
+
+
+def build_drug_matcher(
+    indexed_dfs: List, drug_synonyms_path: Optional[str] = None
+) -> Optional[DS.DrugAliasMatcher]:
+    # Compile the drug names and synonyms into a single matcher
+    if drug_synonyms_path is None:
+        return None
+
+    _, drugs_df = indexed_dfs
+    return DS.build_drug_alias_matcher(
+        drugs_df.index,
+        drugs_df["name"],
+        DS.load_drug_synonyms(drug_synonyms_path),
+    )
+
+
+def link_articles(
+    indexed_dfs: List,
+    drug_matcher: Optional[DS.DrugAliasMatcher] = None,
+    checkpoint_dir: Optional[str] = None,
+) -> Dict:
+    # Finally, generate the graph (one partition of articles at a time when they were spilled to the disk)
+    articles, drugs_df = indexed_dfs
+
+    if isinstance(articles, SP.SpilledArticles):
+        try:
+            return T.build_link_graph_from_spilled_articles(
+                articles, drugs_df, drug_matcher, checkpoint_dir
+            )
+        finally:
+            SP.remove_spilled_articles(articles)
+
+    return T.build_link_graph_from_df(articles, drugs_df, drug_matcher, checkpoint_dir)
+
+
+def link_and_write_articles(
+    indexed_dfs: List,
+    drug_matcher: Optional[DS.DrugAliasMatcher],
+    checkpoint_dir: Optional[str],
+    link_workers: int,
+    output_path: str,
+    fsync: bool = False,
+    pretty: bool = False,
+) -> Dict:
+    """
+    Streaming mode : each journal is written to the output graph as soon as it is linked, while the next journals are sliced and linked
+    by `link_workers` threads, instead of writing the graph once all the journals are linked. The written graph is the same.
+    """
+    articles, drugs_df = indexed_dfs
+
+    with U.open_journals_writer(
+        output_path, fsync=fsync, pretty=pretty
+    ) as write_journal:
+        output_graph = T.build_link_graph_from_df(
+            articles,
+            drugs_df,
+            drug_matcher,
+            checkpoint_dir,
+            nb_workers=link_workers,
+            journal_sink=write_journal,
+        )
     logger.info(f"[Transform] - Link graph successfully written to {output_path}.")
 
+    return output_graph
+
+
+def get_pandas_stages(
+    clinical_trials_path: List,
+    pubmed_paths: List,
+    drugs_paths: List,
+    journal_aliases_path: Optional[str] = None,
+    drug_synonyms_path: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    memory_limit: Optional[int] = None,
+    missing_id_strategy: str = "sequential",
+) -> List:
+    """
+    Returns the load -> clean -> dedup -> link steps of the pandas backend as a DAG of stages, the last one being `link_graph`.
+    The clinical trials, pubmed and drugs branches are independent until the merge, so they can run concurrently.
+    With a memory limit (in bytes), the articles are spilled to temporary files when over budget, so the merge and dedup stages are not cached.
+    """
+    return [
+        SS.Stage("load_clinical", lambda: L.load_input_data(clinical_trials_path)),
+        SS.Stage("load_pubmed", lambda: L.load_input_data(pubmed_paths)),
+        SS.Stage("load_drugs", lambda: L.load_input_data(drugs_paths)),
+        SS.Stage("clean_clinical", clean_clinical_df, ["load_clinical"]),
+        SS.Stage(
+            "clean_pubmed",
+            lambda pubmed_df: clean_pubmed_df(pubmed_df, missing_id_strategy),
+            ["load_pubmed"],
+        ),
+        SS.Stage("clean_drugs", clean_drugs_df, ["load_drugs"]),
+        SS.Stage(
+            "merge_articles",
+            lambda clinical_df, pubmed_df: merge_articles_dfs(
+                clinical_df, pubmed_df, journal_aliases_path, memory_limit
+            ),
+            ["clean_clinical", "clean_pubmed"],
+            cacheable=memory_limit is None,
+        ),
+        SS.Stage(
+            "drop_duplicate_ids",
+            drop_duplicate_ids,
+            ["merge_articles", "clean_drugs"],
+            cacheable=memory_limit is None,
+        ),
+        SS.Stage(
+            "build_drug_matcher",
+            lambda indexed_dfs: build_drug_matcher(indexed_dfs, drug_synonyms_path),
+            ["drop_duplicate_ids"],
+        ),
+        # The journals are already checkpointed one by one, and the shards are removed once the graph is written
+        SS.Stage(
+            "link_graph",
+            lambda indexed_dfs, drug_matcher: link_articles(
+                indexed_dfs, drug_matcher, checkpoint_dir
+            ),
+            ["drop_duplicate_ids", "build_drug_matcher"],
+            cacheable=checkpoint_dir is None,
+        ),
+    ]
+
+
+def build_graph_link_with_pandas(
+    clinical_trials_path: List,
+    pubmed_paths: List,
+    drugs_paths: List,
+    journal_aliases_path: Optional[str] = None,
+    drug_synonyms_path: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    memory_limit: Optional[int] = None,
+    missing_id_strategy: str = "sequential",
+    max_workers: int = 1,
+) -> Dict:
+    """
+    Runs the load -> clean -> dedup -> link steps with pandas and returns the link graph. This is the default backend.
+    When a checkpoint folder is provided, each completed journal is written there and the journals already written are not linked again.
+    When a journal aliases path is provided, near-duplicate journal names are merged using (and updating) the cached alias map.
+    When a drug synonyms path is provided, the drugs are also found by their synonyms and each mention records the matched alias.
+    When a memory limit (in bytes) is provided and the articles do not fit in it, they are spilled to the disk and linked one journal partition at a time.
+    """
+    stages = get_pandas_stages(
+        clinical_trials_path,
+        pubmed_paths,
+        drugs_paths,
+        journal_aliases_path,
+        drug_synonyms_path,
+        checkpoint_dir,
+        memory_limit,
+        missing_id_strategy,
+    )
+    outputs, _ = SS.run_stages(
+        stages, max_workers=max_workers, output_stages=["link_graph"]
+    )
+
+    return outputs["link_graph"]
+
 
-def fetch_top_journals() -> List:
+def get_graph_link_builder(backend: str) -> Callable:
     """
-    Returns a list of the name(s) of the journal(s) that has mentioned most unique drugs.
-    In the case of a tie, all the tied journal are returned.
+    Returns the function building the link graph with the given backend (pandas or polars).
+    Optional backends are only imported when selected, so their librairies are not required by the default backend.
     """
-    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH)
+    if backend == "pandas":
+        return build_graph_link_with_pandas
+
+    elif backend == "polars":
+        try:
+            import app.src.polars_processing.pipeline as PL
+        except ImportError as error:
+            raise ImportError(
+                "The polars backend requires the `polars` package, install it with `pip install polars`."
+            ) from error
+
+        return PL.build_graph_link
+
+    raise ValueError(
+        f"The backend {backend} is not supported (allowed values: {', '.join(GRAPH_LINK_BACKENDS)})."
+    )
 
-    unique_mentions_mapping = {}
 
-    for journal_object in graph_link_dict["journals"]:
-        curr_pubmed_articles, curr_clinical_trials_articles = (
-            A.get_all_articles_from_journal(journal_object)
+def get_graph_link_stages(
+    backend: str,
+    clinical_trials_path: List,
+    pubmed_paths: List,
+    drugs_paths: List,
+    **builder_options,
+) -> List:
+    """
+    Returns the stages building the link graph with the given backend, the last one being `link_graph`.
+    The polars backend optimizes its whole query plan at once, so it is a single stage.
+    """
+    if backend == "pandas":
+        return get_pandas_stages(
+            clinical_trials_path, pubmed_paths, drugs_paths, **builder_options
         )
 
-        set_curr_mentioned_drugs = A.get_drugs_mentioned_by_journal(
-            pubmed_of_journal=curr_pubmed_articles,
-            clinical_trials_of_journal=curr_clinical_trials_articles,
-            return_drug_names=False,  # Use IDs to be more accurate
+    build_graph_link = get_graph_link_builder(backend)
+    return [
+        SS.Stage(
+            "link_graph",
+            lambda: build_graph_link(
+                clinical_trials_path, pubmed_paths, drugs_paths, **builder_options
+            ),
         )
+    ]
 
-        unique_mentions_mapping[journal_object["title"]] = len(set_curr_mentioned_drugs)
 
-    max_nb_unique_mentions = max(unique_mentions_mapping.values())
-    top_journals = [
-        key
-        for key, value in unique_mentions_mapping.items()
-        if value == max_nb_unique_mentions
-    ]
+def write_graph_link(
+    output_graph: Dict,
+    output_path: str,
+    checkpoint_dir: Optional[str] = None,
+    fsync: bool = False,
+    pretty: bool = False,
+) -> Dict:
+    # Write the graph as json file (from the journal shards when checkpointing)
+    if checkpoint_dir is not None:
+        write_statistics = CK.assemble_graph_from_shards(
+            checkpoint_dir,
+            [journal["title"] for journal in output_graph["journals"]],
+            output_path,
+            fsync=fsync,
+            pretty=pretty,
+        )
+    else:
+        write_statistics = U.write_dict_to_file(
+            output_path, output_graph, fsync=fsync, pretty=pretty
+        )
+    logger.info(f"[Transform] - Link graph successfully written to {output_path}.")
+
+    return write_statistics
+
 
+def write_temporal_index(output_graph: Dict, temporal_index_path: str) -> None:
+    # Index the mention dates of each drug and journal for the time based adhoc queries
+    TI.write_temporal_index(temporal_index_path, TI.build_temporal_index(output_graph))
     logger.info(
-        f"The journal(s) {', '.join(top_journals)} has mentioned {max_nb_unique_mentions} unique drugs"
+        f"[Transform] - Temporal index successfully written to {temporal_index_path}."
     )
 
-    return top_journals
 
+def write_graph_store(output_graph: Dict, graph_store_path: str) -> None:
+    # Persist the graph in the SQL store used by the adhoc queries
+    with closing(S.open_graph_store(graph_store_path)) as connection:
+        S.write_graph_to_store(connection, output_graph)
+    logger.info(
+        f"[Graph Store] - Link graph successfully stored in {graph_store_path}."
+    )
+
+
+def write_partitioned_graph(
+    output_graph: Dict, partitioned_graph_dir: str, nb_buckets: int, fsync: bool
+) -> None:
+    # Split the graph by journal buckets, read in parallel by the adhoc queries
+    PG.write_partitioned_graph(
+        output_graph, partitioned_graph_dir, nb_buckets=nb_buckets, fsync=fsync
+    )
+
+
+def write_drug_similarities(
+    output_graph: Dict,
+    similarities_output_path: str,
+    level: str = "article",
+    metric: str = "jaccard",
+    top_k: int = 5,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict:
+    # Select the top k most similar drugs of every drug, from their co-occurrences in the graph
+    M = import_matrix_processing()
+    similar_drugs = M.get_top_similar_drugs(
+        list_journals=output_graph["journals"],
+        level=level,
+        metric=metric,
+        top_k=top_k,
+        start_date=start_date,
+        end_date=end_date,
+    )
 
-def fetch_drugs_mentioned_by_pubmed_journals(drug_name: str) -> List:
+    U.write_dict_to_file(similarities_output_path, similar_drugs)
+    logger.info(
+        f"Drug similarities successfully written to {similarities_output_path}."
+    )
+
+    return similar_drugs
+
+
+def record_output_metrics(timings: Dict, output_paths: List) -> None:
+    """
+    Records the duration of each stage run and the size of each output file written in the run metrics.
+    """
+    for stage_name, duration in timings.items():
+        M.observe("graph_link_stage_duration_seconds", duration, stage=stage_name)
+
+    for path in output_paths:
+        if path is not None and os.path.exists(path):
+            M.set_gauge(
+                "graph_link_output_size_bytes", os.path.getsize(path), path=path
+            )
+
+
+def generate_graph_link(
+    clinical_trials_path: List,
+    pubmed_paths: List,
+    drugs_paths: List,
+    output_path: str,
+    backend: str = "pandas",
+    graph_store_path: Optional[str] = None,
+    temporal_index_path: Optional[str] = None,
+    journal_aliases_path: Optional[str] = None,
+    drug_synonyms_path: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+    fsync: bool = False,
+    pretty: bool = False,
+    max_workers: int = 1,
+    stage_cache_dir: Optional[str] = None,
+    rerun_stages: List = (),
+    skip_stages: List = (),
+    memory_limit: Optional[int] = None,
+    missing_id_strategy: str = "sequential",
+    metrics_path: Optional[str] = None,
+    link_workers: int = 0,
+    partitioned_graph_dir: Optional[str] = None,
+    nb_output_buckets: int = 16,
+    similarities_output_path: Optional[str] = None,
+    similarity_options: Optional[Dict] = None,
+) -> Dict:
+    """
+    Builds the link graph then writes its outputs (json graph, temporal index, graph store), run as a DAG of stages.
+    The independent stages (the loading and cleaning of each input, the outputs) run concurrently with up to `max_workers` threads.
+    With a stage cache folder, the output of each stage is cached, and only the stages rerun (or depending on a stage run) run again.
+    The metrics of the run (row counts, stage durations, output sizes) are written to `metrics_path` once the run ends, even when it fails.
+    With link workers, the journals are linked by a pool of threads and written as soon as they are linked, in a streaming pipeline.
+    With a partitioned graph folder, the graph is also written as one file per bucket of journals, with a manifest of their byte offsets.
+    With a similarities output path, the top k similar drugs of every drug are selected from the graph and written there
+    (`similarity_options` holds the `level`, `metric` and `top_k` arguments of `write_drug_similarities`).
+    Returns the duration in seconds of each stage run.
+    """
+    M.METRICS.reset()
+    run_start_time = time.perf_counter()
+
+    builder_options = {
+        "journal_aliases_path": journal_aliases_path,
+        "drug_synonyms_path": drug_synonyms_path,
+        "missing_id_strategy": missing_id_strategy,
+    }
+    input_paths = clinical_trials_path + pubmed_paths + drugs_paths
+    if drug_synonyms_path is not None:
+        input_paths = input_paths + [drug_synonyms_path]
+
+    # Checkpoint each completed journal, so an interrupted run can be resumed
+    if checkpoint_dir is not None:
+        if backend != "pandas":
+            raise ValueError(
+                f"Checkpoints are only supported by the pandas backend, not by {backend}."
+            )
+
+        fingerprint = CK.get_inputs_fingerprint(input_paths, builder_options)
+        CK.open_checkpoint_dir(checkpoint_dir, fingerprint, resume)
+        builder_options["checkpoint_dir"] = checkpoint_dir
+
+    # Keep the articles on the disk by journal partitions when over the memory budget
+    if memory_limit is not None:
+        if backend != "pandas":
+            raise ValueError(
+                f"The memory limit is only supported by the pandas backend, not by {backend}."
+            )
+
+    # The spilled journals are linked out of order, so they can not be written as soon as they are linked
+    if link_workers > 0 and (backend != "pandas" or memory_limit is not None):
+        raise ValueError(
+            "The link workers are only supported by the pandas backend, without memory limit."
+        )
+
+    # The cached stage outputs are only reused with the same inputs and backend
+    if stage_cache_dir is not None:
+        SS.open_stage_cache(
+            stage_cache_dir,
+            CK.get_inputs_fingerprint(
+                input_paths, {"backend": backend, **builder_options}
+            ),
+        )
+
+    if memory_limit is not None:
+        builder_options["memory_limit"] = memory_limit
+
+    stages = get_graph_link_stages(
+        backend, clinical_trials_path, pubmed_paths, drugs_paths, **builder_options
+    )
+    if link_workers > 0:
+        # The link stage writes the graph itself, one journal at a time, so it must always run
+        link_stage = stages.pop()
+        stages.append(
+            SS.Stage(
+                "link_graph",
+                lambda indexed_dfs, drug_matcher: link_and_write_articles(
+                    indexed_dfs,
+                    drug_matcher,
+                    checkpoint_dir,
+                    link_workers,
+                    output_path,
+                    fsync=fsync,
+                    pretty=pretty,
+                ),
+                link_stage.inputs,
+                cacheable=False,
+            )
+        )
+    else:
+        stages.append(
+            SS.Stage(
+                "write_graph",
+                lambda output_graph: write_graph_link(
+                    output_graph,
+                    output_path,
+                    checkpoint_dir,
+                    fsync=fsync,
+                    pretty=pretty,
+                ),
+                ["link_graph"],
+                cacheable=False,
+            )
+        )
+    if temporal_index_path is not None:
+        stages.append(
+            SS.Stage(
+                "write_temporal_index",
+                lambda output_graph: write_temporal_index(
+                    output_graph, temporal_index_path
+                ),
+                ["link_graph"],
+                cacheable=False,
+            )
+        )
+    # Optionally, persist the graph in the SQL store used by the adhoc queries
+    if graph_store_path is not None:
+        stages.append(
+            SS.Stage(
+                "write_graph_store",
+                lambda output_graph: write_graph_store(output_graph, graph_store_path),
+                ["link_graph"],
+                cacheable=False,
+            )
+        )
+    if partitioned_graph_dir is not None:
+        stages.append(
+            SS.Stage(
+                "write_partitioned_graph",
+                lambda output_graph: write_partitioned_graph(
+                    output_graph, partitioned_graph_dir, nb_output_buckets, fsync
+                ),
+                ["link_graph"],
+                cacheable=False,
+            )
+        )
+    if similarities_output_path is not None:
+        stages.append(
+            SS.Stage(
+                "write_drug_similarities",
+                lambda output_graph: write_drug_similarities(
+                    output_graph, similarities_output_path, **(similarity_options or {})
+                ),
+                ["link_graph"],
+                cacheable=False,
+            )
+        )
+
+    run_succeeded = False
+    try:
+        _, timings = SS.run_stages(
+            stages,
+            max_workers=max_workers,
+            cache_dir=stage_cache_dir,
+            rerun_stages=rerun_stages,
+            skip_stages=skip_stages,
+        )
+        run_succeeded = True
+    finally:
+        M.set_gauge("graph_link_last_run_success", int(run_succeeded))
+        M.set_gauge(
+            "graph_link_last_run_duration_seconds",
+            time.perf_counter() - run_start_time,
+        )
+        if run_succeeded:
+            record_output_metrics(
+                timings,
+                [
+                    output_path,
+                    temporal_index_path,
+                    graph_store_path,
+                    partitioned_graph_dir
+                    and PG.get_manifest_path(partitioned_graph_dir),
+                    similarities_output_path,
+                ],
+            )
+        if metrics_path is not None:
+            M.write_metrics_file(metrics_path)
+
+    # The run is complete, the next run must start from scratch
+    if checkpoint_dir is not None:
+        CK.remove_checkpoint_dir(checkpoint_dir)
+
+    return timings
+
+
+def get_queried_graph_path(
+    graph_store_path: Optional[str], partitioned_graph_dir: Optional[str]
+) -> str:
+    # The file identifying the version of the graph read by the adhoc queries, for the query cache
+    if graph_store_path is not None:
+        return graph_store_path
+    if partitioned_graph_dir is not None:
+        return PG.get_manifest_path(partitioned_graph_dir)
+
+    return OUTPUT_PATH
+
+
+def rank_top_journals(
+    graph_store_path: Optional[str],
+    metric: str,
+    top_n: int,
+    partitioned_graph_dir: Optional[str] = None,
+    max_workers: int = 1,
+) -> List:
+    if graph_store_path is not None:
+        with closing(
+            S.open_graph_store(graph_store_path, create_if_missing=False)
+        ) as connection:
+            return S.get_top_journals(connection, metric=metric, top_n=top_n)
+
+    if partitioned_graph_dir is not None:
+        return A.rank_top_journals_of_partitioned_graph(
+            partitioned_graph_dir, metric=metric, top_n=top_n, max_workers=max_workers
+        )
+
+    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH, is_link_graph=True)
+    return A.rank_top_journals(graph_link_dict["journals"], metric=metric, top_n=top_n)
+
+
+def fetch_top_journals(
+    graph_store_path: Optional[str] = None,
+    metric: str = "unique_drugs",
+    top_n: int = 1,
+    query_cache: Optional[QC.QueryCache] = None,
+    partitioned_graph_dir: Optional[str] = None,
+    max_workers: int = 1,
+) -> List:
+    """
+    Returns a list of the name(s) of the top N journal(s) for the given metric (by default, the journal that has mentioned most unique drugs).
+    In the case of a tie with the N-th journal, all the tied journal are returned.
+    When a graph store path is provided, the answer is computed with SQL instead of scanning the json graph.
+    When a partitioned graph folder is provided, its buckets are ranked by a pool of `max_workers` processes.
+    With a query cache, the ranking is only computed once per version of the graph.
+    """
+    ranking = QC.get_or_compute(
+        query_cache,
+        get_queried_graph_path(graph_store_path, partitioned_graph_dir),
+        "get_top_journal",
+        {"metric": metric, "top_n": top_n, "graph_store": graph_store_path is not None},
+        lambda: rank_top_journals(
+            graph_store_path, metric, top_n, partitioned_graph_dir, max_workers
+        ),
+    )
+
+    logger.info(
+        f"The top {top_n} journal(s) by {metric} are : {', '.join(f'{title} ({score})' for title, score in ranking)}"
+    )
+
+    return [title for title, _ in ranking]
+
+
+def fetch_drugs_mentioned_by_pubmed_journals(
+    drug_name: str,
+    graph_store_path: Optional[str] = None,
+    query_cache: Optional[QC.QueryCache] = None,
+    partitioned_graph_dir: Optional[str] = None,
+    max_workers: int = 1,
+) -> List:
     """
     This function will, for a specific drugm return a list of all drugs mentioned by the same journals that are only referenced by pubmed articles.
-    The list includes the input drug too
+    The list includes the input drug too. When a graph store path is provided, the answer is computed with SQL.
+    When a partitioned graph folder is provided, its buckets are searched by a pool of `max_workers` processes.
+    With a query cache, the drugs are only computed once per drug and version of the graph.
     """
-    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH)
+    return QC.get_or_compute(
+        query_cache,
+        get_queried_graph_path(graph_store_path, partitioned_graph_dir),
+        "get_drug_mentions",
+        {"drug_name": drug_name.title(), "graph_store": graph_store_path is not None},
+        lambda: get_drugs_mentioned_by_pubmed_journals(
+            drug_name, graph_store_path, partitioned_graph_dir, max_workers
+        ),
+    )
+
+
+def get_drugs_mentioned_by_pubmed_journals(
+    drug_name: str,
+    graph_store_path: Optional[str] = None,
+    partitioned_graph_dir: Optional[str] = None,
+    max_workers: int = 1,
+) -> List:
+    if graph_store_path is not None:
+        with closing(
+            S.open_graph_store(graph_store_path, create_if_missing=False)
+        ) as connection:
+            output_drug_mentions = S.get_drugs_mentioned_by_similar_journals(
+                connection,
+                drug_name=drug_name.title(),
+                skip_clinical_trials=True,
+            )
+        return list(output_drug_mentions)
+
+    if partitioned_graph_dir is not None:
+        output_drug_mentions = (
+            A.get_drugs_mentioned_by_similar_journals_of_partitioned_graph(
+                partitioned_graph_dir,
+                drug_name=drug_name.title(),
+                skip_clinical_trials=True,
+                max_workers=max_workers,
+            )
+        )
+        return list(output_drug_mentions)
+
+    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH, is_link_graph=True)
 
     output_drug_mentions = A.get_drugs_mentioned_by_similar_journals(
         list_journals=graph_link_dict["journals"],
@@ -162,7 +836,136 @@ def fetch_drugs_mentioned_by_pubmed_journals(drug_name: str) -> List:
     return list(output_drug_mentions)
 
 
+def import_matrix_processing():
+    """
+    Imports the sparse matrix adhoc module, which requires the optional scipy package.
+    """
+    try:
+        import app.src.adhoc.matrix_processing as M
+    except ImportError as error:
+        raise ImportError(
+            "The sparse matrix adhoc actions require the `scipy` package, install it with `pip install scipy`."
+        ) from error
+
+    return M
+
+
+def fetch_all_drugs_mentioned_by_pubmed_journals(adjacency_output_path: str) -> Dict:
+    """
+    Batch version of `fetch_drugs_mentioned_by_pubmed_journals`, computing the drug mentions of every drug at once.
+    The result is written as an adjacency file (drug name -> list of drugs mentioned by the same pubmed only journals).
+    """
+    M = import_matrix_processing()
+    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH, is_link_graph=True)
+
+    adjacency = M.get_all_drugs_mentioned_by_similar_journals(
+        list_journals=graph_link_dict["journals"],
+        skip_clinical_trials=True,
+    )
+
+    U.write_dict_to_file(adjacency_output_path, adjacency)
+    logger.info(
+        f"Drug mentions adjacency successfully written to {adjacency_output_path}."
+    )
+
+    return adjacency
+
+
+def fetch_similar_drugs(
+    similarities_output_path: str,
+    drug_name: Optional[str] = None,
+    level: str = "article",
+    metric: str = "jaccard",
+    top_k: int = 5,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict:
+    """
+    Computes the top k most similar drugs of every drug, based on how often they are mentioned together (by the same article or journal).
+    All similarities are written to a json file. When a drug name is provided, only its similar drugs are returned.
+    """
+    graph_link_dict = U.import_json_file_as_dict(OUTPUT_PATH, is_link_graph=True)
+
+    similar_drugs = write_drug_similarities(
+        graph_link_dict,
+        similarities_output_path,
+        level=level,
+        metric=metric,
+        top_k=top_k,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    if drug_name is not None:
+        return {drug_name.title(): similar_drugs.get(drug_name.title(), [])}
+
+    return similar_drugs
+
+
+def fetch_mention_statistics(
+    entity: str,
+    name: str,
+    frequency: str = "month",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    temporal_index_path: Optional[str] = TEMPORAL_INDEX_PATH,
+) -> Dict:
+    """
+    Returns the number of mentions of a drug or journal per day, week, month or year, optionally between two dates.
+    The answer is read from the temporal index written by generate_graph_link, without parsing the json graph.
+    """
+    if temporal_index_path is None:
+        raise ValueError(
+            "The mention statistics require a temporal index, set its path with the TemporalIndexPath environment variable."
+        )
+
+    temporal_index = TI.load_temporal_index(temporal_index_path)
+
+    mentions_per_period = TI.rollup_mentions(
+        temporal_index,
+        entity=entity,
+        name=name.title(),
+        frequency=frequency,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    logger.info(
+        f"The {entity} {name.title()} was mentioned {sum(mentions_per_period.values())} times between {start_date or 'the first mention'} and {end_date or 'the last mention'}."
+    )
+    return mentions_per_period
+
+
+def diff_graph_files(graph_paths: List, nb_partitions: int = 16) -> Dict:
+    """
+    Compares two link graph files (old then new) and reports the added, removed and changed journals and mentions.
+    Both files are streamed, so they do not need to fit in memory.
+    """
+    if len(graph_paths) != 2:
+        raise ValueError(
+            f"Exactly two graph paths are expected (old and new), got {len(graph_paths)}."
+        )
+
+    old_graph_path, new_graph_path = graph_paths
+    return GD.diff_graphs(old_graph_path, new_graph_path, nb_partitions=nb_partitions)
+
+
+def query_graph_store(query: str, graph_store_path: str) -> DataFrame:
+    """
+    Runs an arbitrary SQL query against the graph store (tables : journals, articles, drugs, mentions).
+    """
+    with closing(
+        S.open_graph_store(graph_store_path, create_if_missing=False)
+    ) as connection:
+        return S.run_query(connection, query)
+
+
 if __name__ == "__main__":
+    # Copy-on-write (the default from pandas 3.0) : a dataframe derived from another one (rename, assign, set_index...)
+    # shares its columns until one of them is modified, so the cleaning functions return new dataframes without copying them.
+    # Only enabled by the command line, the modules importing the pipeline keep their pandas options.
+    pd.set_option("mode.copy_on_write", True)
+
     parser = argparse.ArgumentParser(
         description="Servier - Test Data Engineering by Hussein Ballouk"
     )
@@ -191,10 +994,100 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output_path",
         type=str,
-        help="The name and path of the output json file. Default value : output/graph_link.json",
+        help="The name and path of the output json file, compressed when ending with `.gz` or `.zst` (requires `pip install zstandard`). Default value : output/graph_link.json",
         default=OUTPUT_PATH,
     )
 
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="With generate_graph_link, flush the output file to the disk before the run ends. Slower, but the graph survives a power loss. Default value : False",
+    )
+
+    parser.add_argument(
+        "--journal_aliases_path",
+        type=str,
+        help="The path of the json cache of journal aliases. When provided, generate_graph_link merges near-duplicate journal names and only scores the names missing from the cache. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--drug_synonyms_path",
+        type=str,
+        help="The path of a csv file of drug synonyms (`atccode` and `synonym` columns, one row per alias). When provided, generate_graph_link also matches the drugs by their synonyms and each mention records the matched alias. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--missing_id_strategy",
+        type=str,
+        choices=AI.MISSING_ID_STRATEGIES,
+        help="How generate_graph_link fills in the missing pubmed IDs : numbered after the maximum ID (sequential, depends on the order of the rows), or generated from the title and date of each article (content_hash, the same whatever the order, chunk or run). Default value : sequential",
+        default="sequential",
+    )
+
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="With generate_graph_link, indent the json graph for humans (larger and slower to write). Default value : False",
+    )
+
+    parser.add_argument(
+        "--json_serializer",
+        type=str,
+        choices=JS.JSON_SERIALIZERS,
+        help="The library used to read and write the json files. With auto, the fastest installed one is used (orjson, then msgspec, then the standard json library). Default value : auto",
+        default="auto",
+    )
+
+    parser.add_argument(
+        "--checkpoint_dir",
+        type=str,
+        help="The folder where generate_graph_link writes each completed journal, removed once the graph is written. Only supported by the pandas backend. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With generate_graph_link and --checkpoint_dir, skip the journals already written by an interrupted run with the same inputs. Default value : False",
+    )
+
+    parser.add_argument(
+        "--memory_limit",
+        type=SP.parse_memory_limit,
+        help="The memory budget of the articles in generate_graph_link (e.g. 512MB, 2GB). When the articles do not fit, they are spilled to the temporary folder (`TMPDIR`) by journal partitions and linked one partition at a time, with the same output. Only supported by the pandas backend, requires `pip install pyarrow`. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        help="The number of stages of generate_graph_link run at the same time (the loading and cleaning of each input, and the outputs, are independent). Also the number of processes reading the buckets of --partitioned_graph_dir with the get_top_journal and get_drug_mentions actions. Default value : 1 (no concurrency)",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--stage_cache_dir",
+        type=str,
+        help="The folder where generate_graph_link caches the output of each stage. The next runs with the same inputs reuse them instead of running the stages again. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--rerun_stages",
+        type=str,
+        help="String of `;` separated names of the stages of generate_graph_link run again even if cached (and so the stages depending on them). Requires --stage_cache_dir. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--skip_stages",
+        type=str,
+        help="String of `;` separated names of the stages of generate_graph_link never run (e.g. write_graph_store). Their output is read from --stage_cache_dir when another stage needs it. Default value : None",
+        default=None,
+    )
+
     parser.add_argument(
         "--adhoc_drug_name",
         type=str,
@@ -202,25 +1095,315 @@ if __name__ == "__main__":
         default=None,
     )
 
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=GRAPH_LINK_BACKENDS,
+        help="The dataframe library used to generate the link graph. The polars backend requires `pip install polars`. Default value : pandas",
+        default="pandas",
+    )
+
+    parser.add_argument(
+        "--adjacency_output_path",
+        type=str,
+        help="The name and path of the json adjacency file written by the get_all_drug_mentions action. Default value : output/drug_mentions_adjacency.json",
+        default="output/drug_mentions_adjacency.json",
+    )
+
+    parser.add_argument(
+        "--adhoc_journal_name",
+        type=str,
+        help="The name of the journal used by the get_mention_stats action, instead of --adhoc_drug_name. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--frequency",
+        type=str,
+        choices=TI.ROLLUP_FREQUENCIES,
+        help="The period used to count mentions with the get_mention_stats action. Default value : month",
+        default="month",
+    )
+
+    parser.add_argument(
+        "--temporal_index_path",
+        type=str,
+        help="The path of the temporal index read by get_mention_stats. When set, generate_graph_link also writes the temporal index there. Default value : the TemporalIndexPath environment variable, if any (no temporal index otherwise)",
+        default=TEMPORAL_INDEX_PATH,
+    )
+
+    parser.add_argument(
+        "--top_n",
+        type=int,
+        help="The number of journals returned by the get_top_journal action (tied journals are all returned). Default value : 1",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        help="The number of similar drugs kept per drug by the get_similar_drugs action, and by generate_graph_link with --write_drug_similarities. Default value : 5",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--similarities_output_path",
+        type=str,
+        help="The name and path of the json file written by the get_similar_drugs action, and by generate_graph_link with --write_drug_similarities. Default value : output/drug_similarities.json",
+        default="output/drug_similarities.json",
+    )
+
+    parser.add_argument(
+        "--write_drug_similarities",
+        action="store_true",
+        help="With generate_graph_link, also select the top k similar drugs of every drug in a stage after the linking, written to --similarities_output_path (requires `pip install scipy`). Default value : False",
+    )
+
+    parser.add_argument(
+        "--cooccurrence_level",
+        type=str,
+        choices=["article", "journal"],
+        help="Whether two drugs co-occur when mentioned by the same article or by the same journal, used by the get_similar_drugs action and --write_drug_similarities. Default value : article",
+        default="article",
+    )
+
+    parser.add_argument(
+        "--similarity_metric",
+        type=str,
+        choices=["jaccard", "cosine"],
+        help="The similarity score used by the get_similar_drugs action and --write_drug_similarities. Default value : jaccard",
+        default="jaccard",
+    )
+
+    parser.add_argument(
+        "--start_date",
+        type=str,
+        help="Only use the mentions from this date (%%Y-%%m-%%d) with the get_similar_drugs and get_mention_stats actions. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--end_date",
+        type=str,
+        help="Only use the mentions up to this date (%%Y-%%m-%%d) with the get_similar_drugs and get_mention_stats actions. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--metric",
+        type=str,
+        choices=A.RANKING_METRICS,
+        help="The metric used to rank journals with the get_top_journal action. Default value : unique_drugs",
+        default="unique_drugs",
+    )
+
+    parser.add_argument(
+        "--graph_store_path",
+        type=str,
+        help="The path of the SQLite graph store. Default value : output/graph_link.db",
+        default=GRAPH_STORE_PATH,
+    )
+
+    parser.add_argument(
+        "--use_graph_store",
+        action="store_true",
+        help="With generate_graph_link, also persist the graph in the graph store. With the adhoc actions, answer using SQL on the graph store instead of the json graph. Default value : False",
+    )
+
+    parser.add_argument(
+        "--sql_query",
+        type=str,
+        help="The SQL query to run against the graph store. Must use the query action with this argument. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--diff_graph_paths",
+        type=str,
+        help="String of the `;` separated paths of the old and new link graphs compared by the diff_graph action. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--nb_partitions",
+        type=int,
+        help="The number of partitions used by the diff_graph action, to increase for graphs much larger than the memory. Default value : 16",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--query_cache_path",
+        type=str,
+        help="The SQLite file caching the results of the get_top_journal and get_drug_mentions actions. A result is reused until the graph (json graph or graph store) changes, the hit and miss statistics are logged. Default value : None (no cache)",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--query_cache_size",
+        type=SP.parse_memory_limit,
+        help="The total size of the cached query results (e.g. 64MB), the least recently used results are evicted beyond it. Default value : 64MB",
+        default=QC.DEFAULT_QUERY_CACHE_MAX_BYTES,
+    )
+
+    parser.add_argument(
+        "--link_workers",
+        type=int,
+        help="Streaming mode of generate_graph_link (pandas backend, without --memory_limit) : a reader thread slices the journals, this number of threads link them, and each journal is written to the output graph as soon as it is linked, the stages being connected by bounded queues. 0 links all the journals, then writes the graph. Default value : 0",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--partitioned_graph_dir",
+        type=str,
+        help="The folder of the partitioned graph : generate_graph_link also writes the graph as one file per bucket of journals (by hash of their title) with a manifest of the journals, counts and byte offsets of each bucket, and the get_top_journal and get_drug_mentions actions read its buckets in parallel instead of the json graph. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--nb_output_buckets",
+        type=int,
+        help="The number of buckets of the partitioned graph written by generate_graph_link. Default value : 16",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--metrics_path",
+        type=str,
+        help="The file where generate_graph_link writes the metrics of the run (rows loaded per input file, duplicates merged, empty rows dropped, titles without drug, edges emitted, stage durations, output sizes) in the Prometheus text format, e.g. for the textfile collector of the node exporter (.prom extension). Written at the end of each run, even a failed one. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        help="Server mode : serves the metrics of generate_graph_link on http://127.0.0.1:<port>/metrics during the run, and after it until interrupted (Ctrl+C). Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--log_level",
+        type=str.upper,
+        choices=LOG_LEVELS,
+        help="The minimum level of the logged messages. The messages of each journal and title are only logged at the DEBUG level, the titles without drug are summarized in a single warning. Default value : the LogLevel environment variable, else INFO",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--log_json",
+        action="store_true",
+        help="Write each log message as a JSON object (one per line), for log collectors. Also enabled by the LogJson=1 environment variable. Default value : False",
+    )
+
+    parser.add_argument(
+        "--log_enqueue",
+        action="store_true",
+        help="Write the log messages from a background thread, so the pipeline does not wait for a slow stderr (file, network pipe). Each message then costs a serialization, keep it off for a fast terminal. Also enabled by the LogEnqueue=1 environment variable. Default value : False",
+    )
+
     parser.add_argument(
         "action",
         type=str,
-        choices=["generate_graph_link", "get_top_journal", "get_drug_mentions"],
-        help="Manage the different parts of the application (allowed values: generate_graph_link, get_top_journal, get_drug_mentions). Please note that you must provide the --adhoc_drug_name if you waish to use the get_drug_mentions action",
+        choices=[
+            "generate_graph_link",
+            "get_top_journal",
+            "get_drug_mentions",
+            "get_all_drug_mentions",
+            "get_similar_drugs",
+            "get_mention_stats",
+            "diff_graph",
+            "query",
+        ],
+        help="Manage the different parts of the application (allowed values: generate_graph_link, get_top_journal, get_drug_mentions, get_all_drug_mentions, get_similar_drugs, get_mention_stats, diff_graph, query). Please note that you must provide the --adhoc_drug_name if you waish to use the get_drug_mentions action, the --diff_graph_paths if you wish to use the diff_graph action, and the --sql_query if you wish to use the query action",
     )
 
     args = parser.parse_args()
 
+    configure_logger(
+        level=args.log_level,
+        json_output=args.log_json or is_enabled_env_flag("LogJson"),
+        enqueue=args.log_enqueue or is_enabled_env_flag("LogEnqueue"),
+    )
+
+    graph_store_path = args.graph_store_path if args.use_graph_store else None
+    query_cache = (
+        QC.QueryCache(args.query_cache_path, max_bytes=args.query_cache_size)
+        if args.query_cache_path is not None
+        else None
+    )
+    JS.set_default_json_serializer(args.json_serializer)
+
+    if args.top_n < 1:
+        parser.error("The --top_n flag must be a positive integer.")
+    if args.top_k < 1:
+        parser.error("The --top_k flag must be a positive integer.")
+
     if args.action == "generate_graph_link":
-        generate_graph_link(
-            clinical_trials_path=args.clinical_trials_paths.split(";"),
-            pubmed_paths=args.pubmed_paths.split(";"),
-            drugs_paths=args.drugs_paths.split(";"),
-            output_path=args.output_path,
+        if args.resume and args.checkpoint_dir is None:
+            parser.error("The --resume flag requires the use of --checkpoint_dir flag.")
+        if args.link_workers < 0:
+            parser.error("The --link_workers flag can not be negative.")
+        if args.nb_output_buckets < 1:
+            parser.error("The --nb_output_buckets flag must be a positive integer.")
+        if args.rerun_stages is not None and args.stage_cache_dir is None:
+            parser.error(
+                "The --rerun_stages flag requires the use of --stage_cache_dir flag."
+            )
+
+        metrics_server = (
+            M.start_metrics_server(args.metrics_port)
+            if args.metrics_port is not None
+            else None
         )
+        try:
+            generate_graph_link(
+                clinical_trials_path=args.clinical_trials_paths.split(";"),
+                pubmed_paths=args.pubmed_paths.split(";"),
+                drugs_paths=args.drugs_paths.split(";"),
+                output_path=args.output_path,
+                backend=args.backend,
+                graph_store_path=graph_store_path,
+                temporal_index_path=args.temporal_index_path,
+                journal_aliases_path=args.journal_aliases_path,
+                drug_synonyms_path=args.drug_synonyms_path,
+                checkpoint_dir=args.checkpoint_dir,
+                resume=args.resume,
+                fsync=args.fsync,
+                pretty=args.pretty,
+                max_workers=args.max_workers,
+                stage_cache_dir=args.stage_cache_dir,
+                rerun_stages=args.rerun_stages.split(";") if args.rerun_stages else [],
+                skip_stages=args.skip_stages.split(";") if args.skip_stages else [],
+                memory_limit=args.memory_limit,
+                missing_id_strategy=args.missing_id_strategy,
+                metrics_path=args.metrics_path,
+                link_workers=args.link_workers,
+                partitioned_graph_dir=args.partitioned_graph_dir,
+                nb_output_buckets=args.nb_output_buckets,
+                similarities_output_path=(
+                    args.similarities_output_path
+                    if args.write_drug_similarities
+                    else None
+                ),
+                similarity_options={
+                    "level": args.cooccurrence_level,
+                    "metric": args.similarity_metric,
+                    "top_k": args.top_k,
+                },
+            )
+        finally:
+            # Server mode : the metrics of the run stay available to the scraper
+            if metrics_server is not None:
+                M.serve_until_interrupted(metrics_server)
 
     elif args.action == "get_top_journal":
-        top_journals = fetch_top_journals()
+        top_journals = fetch_top_journals(
+            graph_store_path,
+            metric=args.metric,
+            top_n=args.top_n,
+            query_cache=query_cache,
+            partitioned_graph_dir=args.partitioned_graph_dir,
+            max_workers=args.max_workers,
+        )
         print(top_journals)
 
     elif args.action == "get_drug_mentions":
@@ -229,5 +1412,65 @@ if __name__ == "__main__":
                 "The get_drug_mentions action requires the use of --adhoc_drug_name flag."
             )
         else:
-            output = fetch_drugs_mentioned_by_pubmed_journals(args.adhoc_drug_name)
+            output = fetch_drugs_mentioned_by_pubmed_journals(
+                args.adhoc_drug_name,
+                graph_store_path,
+                query_cache=query_cache,
+                partitioned_graph_dir=args.partitioned_graph_dir,
+                max_workers=args.max_workers,
+            )
+            print(output)
+
+    elif args.action == "get_all_drug_mentions":
+        fetch_all_drugs_mentioned_by_pubmed_journals(args.adjacency_output_path)
+
+    elif args.action == "get_similar_drugs":
+        output = fetch_similar_drugs(
+            similarities_output_path=args.similarities_output_path,
+            drug_name=args.adhoc_drug_name,
+            level=args.cooccurrence_level,
+            metric=args.similarity_metric,
+            top_k=args.top_k,
+            start_date=args.start_date,
+            end_date=args.end_date,
+        )
+        if args.adhoc_drug_name is not None:
+            print(output)
+
+    elif args.action == "get_mention_stats":
+        if (args.adhoc_drug_name is None) == (args.adhoc_journal_name is None):
+            parser.error(
+                "The get_mention_stats action requires the use of either --adhoc_drug_name or --adhoc_journal_name flag."
+            )
+        elif args.temporal_index_path is None:
+            parser.error(
+                "The get_mention_stats action requires the use of --temporal_index_path flag (or the TemporalIndexPath environment variable)."
+            )
+        else:
+            output = fetch_mention_statistics(
+                entity="drug" if args.adhoc_drug_name is not None else "journal",
+                name=args.adhoc_drug_name or args.adhoc_journal_name,
+                frequency=args.frequency,
+                start_date=args.start_date,
+                end_date=args.end_date,
+                temporal_index_path=args.temporal_index_path,
+            )
             print(output)
+
+    elif args.action == "diff_graph":
+        if args.diff_graph_paths is None:
+            parser.error(
+                "The diff_graph action requires the use of --diff_graph_paths flag."
+            )
+        else:
+            output = diff_graph_files(
+                args.diff_graph_paths.split(";"), nb_partitions=args.nb_partitions
+            )
+            print(json.dumps(output, indent=4, ensure_ascii=False))
+
+    elif args.action == "query":
+        if args.sql_query is None:
+            parser.error("The query action requires the use of --sql_query flag.")
+        else:
+            output = query_graph_store(args.sql_query, args.graph_store_path)
+            print(output.to_string(index=False))
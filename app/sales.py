@@ -0,0 +1,181 @@
+# Built-in Packages
+import argparse
+from contextlib import closing
+from typing import Dict
+
+# My Custom Modules
+import app.src.sales.engine as E
+import app.src.sales.queries as Q
+import app.src.sales.rollups as R
+
+
+def benchmark_queries(
+    engine: str,
+    db_path: str,
+    nb_transactions: int,
+    nb_clients: int,
+    nb_products: int,
+    layout: str,
+    nb_runs: int,
+    use_rollups: bool = False,
+) -> Dict:
+    """
+    Generates the sales tables in an embedded engine, then runs and times the queries of the `sql/` folder.
+    With rollups, the daily rollup tables are also built and their queries are timed and checked against the raw queries.
+    """
+    with closing(E.connect(engine, db_path)) as connection:
+        E.create_sales_tables(
+            connection,
+            engine,
+            nb_transactions=nb_transactions,
+            nb_clients=nb_clients,
+            nb_products=nb_products,
+            layout=layout,
+        )
+
+        if not use_rollups:
+            return Q.benchmark_sales_queries(connection, nb_runs=nb_runs)
+
+        start_date, end_date = connection.execute(
+            "SELECT MIN(date), MAX(date) FROM TRANSACTIONS"
+        ).fetchone()
+        R.create_rollup_tables(connection)
+        R.update_rollups(connection, str(start_date), str(end_date))
+
+        results = Q.benchmark_sales_queries(
+            connection,
+            query_names=list(R.ROLLUP_QUERIES) + list(R.ROLLUP_QUERIES.values()),
+            nb_runs=nb_runs,
+        )
+        results["rollup_checks"] = R.check_rollup_queries(connection)
+        return results
+
+
+def update_rollups(engine: str, db_path: str, start_date: str, end_date: str) -> Dict:
+    """
+    Daily job appending the transactions of the given days to the rollup tables (created if missing).
+    """
+    with closing(E.connect(engine, db_path)) as connection:
+        rollups_exist = connection.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'SALES_BY_DATE'"
+            if engine == "sqlite"
+            else "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'SALES_BY_DATE'"
+        ).fetchone()[0]
+
+        if not rollups_exist:
+            R.create_rollup_tables(connection)
+
+        return R.update_rollups(connection, start_date, end_date)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Servier - Test Data Engineering by Hussein Ballouk - SQL section"
+    )
+
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=E.SALES_ENGINES,
+        help="The embedded SQL engine used to run the queries. The duckdb engine requires `pip install duckdb`. Default value : sqlite",
+        default="sqlite",
+    )
+
+    parser.add_argument(
+        "--db_path",
+        type=str,
+        help="The path of the database file. Default value : :memory:",
+        default=":memory:",
+    )
+
+    parser.add_argument(
+        "--nb_transactions",
+        type=int,
+        help="The number of synthetic transactions to generate (up to 100M). Default value : 1000000",
+        default=1_000_000,
+    )
+
+    parser.add_argument(
+        "--nb_clients",
+        type=int,
+        help="The number of distinct clients. Default value : 10000",
+        default=10_000,
+    )
+
+    parser.add_argument(
+        "--nb_products",
+        type=int,
+        help="The number of distinct products. Default value : 1000",
+        default=1_000,
+    )
+
+    parser.add_argument(
+        "--layout",
+        type=str,
+        choices=E.TABLE_LAYOUTS,
+        help="The physical layout of the TRANSACTIONS table. The partitioned_parquet layout requires the duckdb engine. Default value : unsorted",
+        default="unsorted",
+    )
+
+    parser.add_argument(
+        "--nb_runs",
+        type=int,
+        help="The number of timed runs per query. Default value : 3",
+        default=3,
+    )
+
+    parser.add_argument(
+        "--use_rollups",
+        action="store_true",
+        help="With benchmark_queries, also build the daily rollup tables, then time and check the queries reading them. Default value : False",
+    )
+
+    parser.add_argument(
+        "--start_date",
+        type=str,
+        help="The first day (%%Y-%%m-%%d) to aggregate with the update_rollups action. Default value : None",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--end_date",
+        type=str,
+        help="The last day (%%Y-%%m-%%d) to aggregate with the update_rollups action. Default value : the start date",
+        default=None,
+    )
+
+    parser.add_argument(
+        "action",
+        type=str,
+        choices=["benchmark_queries", "update_rollups"],
+        help="Manage the SQL part of the application (allowed values: benchmark_queries, update_rollups). Please note that you must provide the --db_path of an existing database and the --start_date if you wish to use the update_rollups action",
+    )
+
+    args = parser.parse_args()
+
+    if args.action == "benchmark_queries":
+        results = benchmark_queries(
+            engine=args.engine,
+            db_path=args.db_path,
+            nb_transactions=args.nb_transactions,
+            nb_clients=args.nb_clients,
+            nb_products=args.nb_products,
+            layout=args.layout,
+            nb_runs=args.nb_runs,
+            use_rollups=args.use_rollups,
+        )
+        print(results)
+
+    elif args.action == "update_rollups":
+        if args.start_date is None:
+            parser.error(
+                "The update_rollups action requires the use of --start_date flag."
+            )
+        else:
+            output = update_rollups(
+                engine=args.engine,
+                db_path=args.db_path,
+                start_date=args.start_date,
+                end_date=args.end_date or args.start_date,
+            )
+            print(output)
@@ -0,0 +1,238 @@
+# Built-in packages
+import codecs
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from typing import Dict, Iterator, List
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+
+# Size of the chunks read from the graph files, only a few chunks are kept in memory at once
+READ_CHUNK_SIZE = 1024 * 1024
+# Maximum number of journals and mentions listed for each kind of difference
+NB_DIFF_SAMPLES = 10
+REFERENCE_KINDS = ["pubmedArticles", "clinicalTrials"]
+# Separator of the fields of the partition files, a control character never found in titles nor IDs
+FIELD_SEPARATOR = "\x1f"
+
+SEPARATORS_PATTERN = re.compile(r"[\s,]*")
+
+
+def iter_graph_journals(
+    filepath: str, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[Dict]:
+    """
+    Streams the journals of a link graph file (optionally compressed), decoding them one at a time.
+    Only the journal being decoded is kept in memory, never the whole graph.
+
+    Parameters:
+        - filepath (str): The path of the link graph json file.
+        - chunk_size (int): The number of bytes read at once.
+
+    Returns:
+        - Iterator: The journals of the graph, in the order of the file.
+    """
+    json_decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    with U.open_input_file(filepath) as hd:
+        buffer = ""
+        end_of_file = False
+
+        def read_more(size: int) -> None:
+            nonlocal buffer, end_of_file
+            chunk = hd.read(size)
+            end_of_file = not chunk
+            buffer += text_decoder.decode(chunk, final=end_of_file)
+
+        # The graph has a single key, so its first list is the list of journals
+        while "[" not in buffer:
+            if end_of_file:
+                raise ValueError(f"No list of journals found in {filepath}.")
+            read_more(chunk_size)
+        position = buffer.index("[") + 1
+
+        while True:
+            position = SEPARATORS_PATTERN.match(buffer, position).end()
+
+            if position == len(buffer):
+                if end_of_file:
+                    raise ValueError(f"The graph {filepath} is truncated.")
+                read_more(chunk_size)
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                journal, position = json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if end_of_file:
+                    raise
+                # The journal is not fully read yet : drop what was decoded, then read as much again
+                buffer = buffer[position:]
+                position = 0
+                read_more(max(chunk_size, len(buffer)))
+                continue
+
+            yield journal
+
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+
+def hash_mention(mention: Dict) -> str:
+    """
+    Canonical hash of a mention : the same fields and values always give the same hash, whatever the order of the keys.
+    """
+    mention_str = repr(sorted(mention.items()))
+    return hashlib.sha1(mention_str.encode("utf-8")).hexdigest()[:16]
+
+
+def get_partition(journal_title: str, nb_partitions: int) -> int:
+    return zlib.crc32(journal_title.encode("utf-8")) % nb_partitions
+
+
+def partition_graph(filepath: str, partitions_folder: str, nb_partitions: int) -> None:
+    """
+    Streams a graph and writes one line per journal and per mention to the partition of the journal (by hash of its title).
+    Each mention is identified by its journal, kind of article, article ID and drug ID, and described by its canonical hash.
+    """
+    partition_files = [
+        open(os.path.join(partitions_folder, str(partition)), "w", encoding="utf-8")
+        for partition in range(nb_partitions)
+    ]
+
+    try:
+        for journal in iter_graph_journals(filepath):
+            title = journal["title"]
+            partition_file = partition_files[get_partition(title, nb_partitions)]
+            partition_file.write(f"{title}\n")
+
+            for kind in REFERENCE_KINDS:
+                for mention in journal["referencedBy"][kind]:
+                    record = [
+                        title,
+                        kind,
+                        str(mention["articleId"]),
+                        str(mention["mentionedDrugID"]),
+                        hash_mention(mention),
+                    ]
+                    partition_file.write(FIELD_SEPARATOR.join(record) + "\n")
+    finally:
+        for partition_file in partition_files:
+            partition_file.close()
+
+
+def load_partition(partition_path: str) -> Dict:
+    """
+    Loads a partition as {journal title: {(kind, article ID, drug ID): mention hash}}.
+    """
+    journals = {}
+
+    with open(partition_path, "r", encoding="utf-8") as hd:
+        for line in hd:
+            record = line.rstrip("\n").split(FIELD_SEPARATOR)
+            mentions = journals.setdefault(record[0], {})
+            if len(record) > 1:
+                mentions[tuple(record[1:4])] = record[4]
+
+    return journals
+
+
+def add_samples(samples: List, journal_title: str, mention_keys) -> None:
+    for mention_key in mention_keys:
+        if len(samples) >= NB_DIFF_SAMPLES:
+            return
+        samples.append([journal_title, *mention_key])
+
+
+def diff_graphs(old_filepath: str, new_filepath: str, nb_partitions: int = 16) -> Dict:
+    """
+    Compares two link graphs and reports the added, removed and changed journals and mentions.
+    Both graphs are streamed and split by journal into partition files, then compared one partition at a time,
+    so the memory used is bounded by the size of a partition instead of the size of the graphs.
+    The comparison is canonical : the order of the journals, mentions and keys does not matter.
+
+    Parameters:
+        - old_filepath (str): The path of the reference graph.
+        - new_filepath (str): The path of the graph compared to the reference.
+        - nb_partitions (int): The number of partitions, to increase for graphs much larger than the memory.
+
+    Returns:
+        - Dict: Whether the graphs are identical, the number of journals and mentions per kind of difference, and a few samples of each.
+    """
+    counts = {
+        entity: {"added": 0, "removed": 0, "changed": 0, "unchanged": 0}
+        for entity in ["journals", "mentions"]
+    }
+    samples = {
+        f"{difference}_{entity}": []
+        for entity in ["journals", "mentions"]
+        for difference in ["added", "removed", "changed"]
+    }
+
+    with tempfile.TemporaryDirectory() as partitions_folder:
+        for side, filepath in [("old", old_filepath), ("new", new_filepath)]:
+            os.makedirs(os.path.join(partitions_folder, side))
+            partition_graph(
+                filepath, os.path.join(partitions_folder, side), nb_partitions
+            )
+
+        for partition in range(nb_partitions):
+            old_journals, new_journals = [
+                load_partition(os.path.join(partitions_folder, side, str(partition)))
+                for side in ["old", "new"]
+            ]
+
+            for title in sorted(old_journals.keys() | new_journals.keys()):
+                old_mentions = old_journals.get(title, {})
+                new_mentions = new_journals.get(title, {})
+
+                added = new_mentions.keys() - old_mentions.keys()
+                removed = old_mentions.keys() - new_mentions.keys()
+                common = old_mentions.keys() & new_mentions.keys()
+                changed = [
+                    key for key in common if old_mentions[key] != new_mentions[key]
+                ]
+
+                counts["mentions"]["added"] += len(added)
+                counts["mentions"]["removed"] += len(removed)
+                counts["mentions"]["changed"] += len(changed)
+                counts["mentions"]["unchanged"] += len(common) - len(changed)
+                add_samples(samples["added_mentions"], title, sorted(added))
+                add_samples(samples["removed_mentions"], title, sorted(removed))
+                add_samples(samples["changed_mentions"], title, sorted(changed))
+
+                if title not in old_journals:
+                    difference = "added"
+                elif title not in new_journals:
+                    difference = "removed"
+                elif added or removed or changed:
+                    difference = "changed"
+                else:
+                    difference = "unchanged"
+
+                counts["journals"][difference] += 1
+                if difference != "unchanged":
+                    journal_samples = samples[f"{difference}_journals"]
+                    if len(journal_samples) < NB_DIFF_SAMPLES:
+                        journal_samples.append(title)
+
+    identical = all(
+        counts[entity][difference] == 0
+        for entity in counts
+        for difference in ["added", "removed", "changed"]
+    )
+    logger.info(
+        f"[Diff] - {old_filepath} and {new_filepath} are {'identical' if identical else 'different'} : "
+        f"{counts['journals']} journals, {counts['mentions']} mentions."
+    )
+
+    return {"identical": identical, **counts, "samples": samples}
@@ -1,8 +1,18 @@
 # Built-in packages
-from typing import Dict, List, Set
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Set, Tuple
 
 # My Custom packages
 from app.utils.my_logger import logger
+import app.src.graph_linkage.partitioned_graph as PG
+
+RANKING_METRICS = [
+    "unique_drugs",
+    "total_mentions",
+    "pubmed_mentions",
+    "clinical_mentions",
+]
 
 
 def get_all_articles_from_journal(journal_dict: Dict) -> List:
@@ -58,19 +68,11 @@ def get_drugs_mentioned_by_journal(
     return mentioned_drugs_no_duplicates
 
 
-def get_drugs_mentioned_by_similar_journals(
+def find_drugs_mentioned_by_similar_journals(
     list_journals: List, drug_name: str, skip_clinical_trials: bool
-) -> Set:
+) -> Tuple[Set, Set]:
     """
-    Return a set of drugs mentioned alongside a specific drug, only mentioned by non-clinical trials referenced journals.
-
-    Parameters:
-        - list_journals (List): List of all journals.
-        - drug_name (str): The specific drug name to search for.
-        - skip_clinical_trials (bool): Flag to skip journals referenced by clinical trials.
-
-    Returns:
-        - output_drug_mentions: Set of drugs mentioned alongside the specific drug name.
+    Returns the drugs mentioned alongside a specific drug, and the titles of the journals mentioning it (see `get_drugs_mentioned_by_similar_journals`).
     """
     output_drug_mentions = set()
     non_clinical_trials_journals = set()  # For logging purposes only
@@ -95,9 +97,256 @@ def get_drugs_mentioned_by_similar_journals(
             # For logging purposes only
             non_clinical_trials_journals.add(journal["title"])
 
+    return output_drug_mentions, non_clinical_trials_journals
+
+
+def log_drugs_mentioned_by_similar_journals(
+    drug_name: str, output_drug_mentions: Set, non_clinical_trials_journals: Set
+) -> None:
     non_clinical_trials_journals = list(non_clinical_trials_journals)
 
     logger.info(
         f"The drug {drug_name} was mentioned alongside the following drug names `{', '.join(list(output_drug_mentions))}` by these non-clinical trials referenced journals : `{', '.join(non_clinical_trials_journals)}`"
     )
+
+
+def get_drugs_mentioned_by_similar_journals(
+    list_journals: List, drug_name: str, skip_clinical_trials: bool
+) -> Set:
+    """
+    Return a set of drugs mentioned alongside a specific drug, only mentioned by non-clinical trials referenced journals.
+
+    Parameters:
+        - list_journals (List): List of all journals.
+        - drug_name (str): The specific drug name to search for.
+        - skip_clinical_trials (bool): Flag to skip journals referenced by clinical trials.
+
+    Returns:
+        - output_drug_mentions: Set of drugs mentioned alongside the specific drug name.
+    """
+    output_drug_mentions, non_clinical_trials_journals = (
+        find_drugs_mentioned_by_similar_journals(
+            list_journals, drug_name, skip_clinical_trials
+        )
+    )
+
+    log_drugs_mentioned_by_similar_journals(
+        drug_name, output_drug_mentions, non_clinical_trials_journals
+    )
+    return output_drug_mentions
+
+
+def get_journal_metric(journal_dict: Dict, metric: str) -> int:
+    """
+    Computes the score of a journal for the given ranking metric.
+
+    Parameters:
+        - journal_dict (Dict): A dictionary containing information about the journal.
+        - metric (str): One of RANKING_METRICS. unique_drugs counts distinct drug IDs, the *_mentions metrics count article-drug mentions.
+
+    Returns:
+        - int: The score of the journal.
+    """
+    pubmed, clinical_trials = get_all_articles_from_journal(journal_dict)
+
+    if metric == "unique_drugs":
+        return len(
+            get_drugs_mentioned_by_journal(
+                pubmed_of_journal=pubmed,
+                clinical_trials_of_journal=clinical_trials,
+                return_drug_names=False,  # Use IDs to be more accurate
+            )
+        )
+    elif metric == "total_mentions":
+        return len(pubmed) + len(clinical_trials)
+    elif metric == "pubmed_mentions":
+        return len(pubmed)
+    elif metric == "clinical_mentions":
+        return len(clinical_trials)
+
+    raise ValueError(
+        f"The metric {metric} is not supported (allowed values: {', '.join(RANKING_METRICS)})."
+    )
+
+
+def select_top_entries(entries: Iterable, top_n: int) -> List:
+    """
+    Keeps the top N (score, position, title) entries in a single pass over entries of increasing position, with a bounded heap.
+    Entries tied with the N-th one are all kept. Returns the entries sorted by decreasing score, then increasing position.
+    """
+    if top_n < 1:
+        raise ValueError(f"top_n must be a positive integer, got {top_n}.")
+
+    # Min-heap of (score, -position, title), the weakest kept journal sits at the root
+    top_heap = []
+    # Journals beyond the N first ones, but tied with the weakest kept journal
+    tied_entries = []
+
+    for score, position, title in entries:
+        entry = (score, -position, title)
+
+        if len(top_heap) < top_n:
+            heapq.heappush(top_heap, entry)
+        elif entry[0] > top_heap[0][0]:
+            tied_entries.append(heapq.heappushpop(top_heap, entry))
+            tied_entries = [tie for tie in tied_entries if tie[0] == top_heap[0][0]]
+        elif entry[0] == top_heap[0][0]:
+            tied_entries.append(entry)
+
+    ranking = sorted(top_heap + tied_entries, key=lambda entry: (-entry[0], -entry[1]))
+
+    return [
+        (score, -negative_position, title)
+        for score, negative_position, title in ranking
+    ]
+
+
+def rank_top_journals(
+    list_journals: Iterable, metric: str = "unique_drugs", top_n: int = 1
+) -> List:
+    """
+    Returns the top N journals for the given metric in a single pass, keeping only a bounded heap instead of every journal's score.
+    Journals tied with the N-th journal are all returned, so the output can be longer than N (like the original top journal question).
+
+    Parameters:
+        - list_journals (Iterable): The journals of the link graph, can be a generator.
+        - metric (str): One of RANKING_METRICS.
+        - top_n (int): Number of journals to keep (before ties).
+
+    Returns:
+        - List: [journal_title, score] pairs sorted by decreasing score, ties keep the order of the graph.
+    """
+    entries = (
+        (get_journal_metric(journal_dict, metric), position, journal_dict["title"])
+        for position, journal_dict in enumerate(list_journals)
+    )
+
+    return [[title, score] for score, _, title in select_top_entries(entries, top_n)]
+
+
+def map_partitioned_graph(
+    graph_dir: str, map_bucket: Callable, max_workers: int = 1, **parameters
+) -> List:
+    """
+    Calls `map_bucket(graph_dir, bucket_entry, **parameters)` on each non-empty bucket of a partitioned graph, with a pool of `max_workers` processes.
+    The buckets are read and decoded in the worker processes (parsing json holds the GIL, so threads would not read in parallel),
+    and only the partial results, much smaller than the journals, are sent back.
+
+    Parameters:
+        - graph_dir (str): The folder of the partitioned graph.
+        - map_bucket (Callable): The function computing the partial result of a bucket, defined at the module level (sent to the worker processes).
+        - max_workers (int): The number of worker processes, the buckets are read by the current process when 1.
+        - **parameters: The other arguments of `map_bucket`.
+
+    Returns:
+        - List: The partial result of each non-empty bucket, in the order of the buckets.
+    """
+    bucket_entries = [
+        bucket_entry
+        for bucket_entry in PG.load_manifest(graph_dir)["buckets"]
+        if bucket_entry["nbJournals"] > 0
+    ]
+
+    if max_workers <= 1 or len(bucket_entries) <= 1:
+        return [
+            map_bucket(graph_dir, bucket_entry, **parameters)
+            for bucket_entry in bucket_entries
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(bucket_entries))
+    ) as executor:
+        futures = [
+            executor.submit(map_bucket, graph_dir, bucket_entry, **parameters)
+            for bucket_entry in bucket_entries
+        ]
+        return [future.result() for future in futures]
+
+
+def rank_bucket_journals(
+    graph_dir: str, bucket_entry: Dict, metric: str, top_n: int
+) -> List:
+    journals = PG.load_bucket_journals(graph_dir, bucket_entry)
+    entries = (
+        (
+            get_journal_metric(journal_dict, metric),
+            journal_entry["position"],
+            journal_dict["title"],
+        )
+        for journal_dict, journal_entry in zip(journals, bucket_entry["journals"])
+    )
+
+    return select_top_entries(entries, top_n)
+
+
+def rank_top_journals_of_partitioned_graph(
+    graph_dir: str, metric: str = "unique_drugs", top_n: int = 1, max_workers: int = 1
+) -> List:
+    """
+    Same ranking as `rank_top_journals`, on a partitioned graph whose buckets are ranked in parallel.
+    A journal of the global top N (ties included) is in the top N of its bucket, so merging the top N of each bucket gives the same ranking.
+
+    Parameters:
+        - graph_dir (str): The folder of the partitioned graph.
+        - metric (str): One of RANKING_METRICS.
+        - top_n (int): Number of journals to keep (before ties).
+        - max_workers (int): The number of processes reading the buckets.
+
+    Returns:
+        - List: [journal_title, score] pairs sorted by decreasing score, ties keep the order of the graph.
+    """
+    if top_n < 1:
+        raise ValueError(f"top_n must be a positive integer, got {top_n}.")
+
+    bucket_rankings = map_partitioned_graph(
+        graph_dir, rank_bucket_journals, max_workers, metric=metric, top_n=top_n
+    )
+    candidates = sorted(
+        (entry for bucket_ranking in bucket_rankings for entry in bucket_ranking),
+        key=lambda entry: entry[1],
+    )
+
+    return [[title, score] for score, _, title in select_top_entries(candidates, top_n)]
+
+
+def find_bucket_drugs_mentioned_by_similar_journals(
+    graph_dir: str, bucket_entry: Dict, drug_name: str, skip_clinical_trials: bool
+) -> Tuple[Set, Set]:
+    return find_drugs_mentioned_by_similar_journals(
+        PG.load_bucket_journals(graph_dir, bucket_entry),
+        drug_name,
+        skip_clinical_trials,
+    )
+
+
+def get_drugs_mentioned_by_similar_journals_of_partitioned_graph(
+    graph_dir: str, drug_name: str, skip_clinical_trials: bool, max_workers: int = 1
+) -> Set:
+    """
+    Same result as `get_drugs_mentioned_by_similar_journals`, on a partitioned graph whose buckets are searched in parallel.
+
+    Parameters:
+        - graph_dir (str): The folder of the partitioned graph.
+        - drug_name (str): The specific drug name to search for.
+        - skip_clinical_trials (bool): Flag to skip journals referenced by clinical trials.
+        - max_workers (int): The number of processes reading the buckets.
+
+    Returns:
+        - output_drug_mentions: Set of drugs mentioned alongside the specific drug name.
+    """
+    output_drug_mentions, non_clinical_trials_journals = set(), set()
+
+    for bucket_drug_mentions, bucket_journals in map_partitioned_graph(
+        graph_dir,
+        find_bucket_drugs_mentioned_by_similar_journals,
+        max_workers,
+        drug_name=drug_name,
+        skip_clinical_trials=skip_clinical_trials,
+    ):
+        output_drug_mentions |= bucket_drug_mentions
+        non_clinical_trials_journals |= bucket_journals
+
+    log_drugs_mentioned_by_similar_journals(
+        drug_name, output_drug_mentions, non_clinical_trials_journals
+    )
     return output_drug_mentions
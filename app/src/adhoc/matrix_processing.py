@@ -0,0 +1,249 @@
+# Third-party packages
+import numpy as np
+from scipy import sparse
+
+# Built-in packages
+from typing import Dict, List, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+from app.src.adhoc.json_processing import (
+    get_all_articles_from_journal,
+    get_drugs_mentioned_by_journal,
+)
+
+COOCCURRENCE_LEVELS = ["article", "journal"]
+SIMILARITY_METRICS = ["jaccard", "cosine"]
+
+
+def build_drug_journal_matrix(list_journals: List, skip_clinical_trials: bool) -> List:
+    """
+    Builds the sparse drug x journal incidence matrix of the link graph, in a single pass over the journals.
+    A cell is 1 when the journal mentions the drug (by name, like `get_drugs_mentioned_by_similar_journals`).
+
+    Parameters:
+        - list_journals (List): List of all journals.
+        - skip_clinical_trials (bool): Flag to leave out the journals referenced by clinical trials (their drugs still get a row).
+
+    Returns:
+        - List: The CSR incidence matrix, the drug names of its rows and the journal titles of its columns.
+    """
+    drug_names, drug_positions = [], {}
+    journal_titles, row_indices, column_indices = [], [], []
+
+    for journal in list_journals:
+        pubmed, clinical_trials = get_all_articles_from_journal(journal)
+
+        set_drugs_mentioned_by_journal = get_drugs_mentioned_by_journal(
+            pubmed_of_journal=pubmed,
+            clinical_trials_of_journal=clinical_trials,
+            return_drug_names=True,
+        )
+
+        for drug_name in set_drugs_mentioned_by_journal:
+            if drug_name not in drug_positions:
+                drug_positions[drug_name] = len(drug_names)
+                drug_names.append(drug_name)
+
+        if clinical_trials != [] and skip_clinical_trials:
+            # Skip journals that are referenced by clinical trials
+            continue
+
+        for drug_name in set_drugs_mentioned_by_journal:
+            row_indices.append(drug_positions[drug_name])
+            column_indices.append(len(journal_titles))
+
+        journal_titles.append(journal["title"])
+
+    incidence_matrix = sparse.csr_matrix(
+        (np.ones(len(row_indices), dtype=np.int32), (row_indices, column_indices)),
+        shape=(len(drug_names), len(journal_titles)),
+    )
+
+    return [incidence_matrix, drug_names, journal_titles]
+
+
+def get_all_drugs_mentioned_by_similar_journals(
+    list_journals: List, skip_clinical_trials: bool
+) -> Dict:
+    """
+    Batch equivalent of `get_drugs_mentioned_by_similar_journals`, answering for every drug of the graph at once.
+    Two drugs are co-mentioned when a journal mentions both, which is a non-zero cell of the product incidence x incidence.T.
+
+    Parameters:
+        - list_journals (List): List of all journals.
+        - skip_clinical_trials (bool): Flag to skip journals referenced by clinical trials.
+
+    Returns:
+        - adjacency: Drug name -> sorted list of the drugs mentioned alongside it (including itself, empty if only mentioned by skipped journals).
+    """
+    incidence_matrix, drug_names, journal_titles = build_drug_journal_matrix(
+        list_journals, skip_clinical_trials
+    )
+
+    co_mentions_matrix = (incidence_matrix @ incidence_matrix.T).tocsr()
+    co_mentions_matrix.sort_indices()
+
+    adjacency = {}
+    for position, drug_name in enumerate(drug_names):
+        row_start, row_end = co_mentions_matrix.indptr[position : position + 2]
+        adjacency[drug_name] = sorted(
+            drug_names[index] for index in co_mentions_matrix.indices[row_start:row_end]
+        )
+
+    logger.info(
+        f"Computed the co-mentions of {len(drug_names)} drugs over {len(journal_titles)} journals ({co_mentions_matrix.nnz} drug pairs)."
+    )
+    return adjacency
+
+
+def build_drug_incidence_matrix(
+    list_journals: List,
+    level: str = "article",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> List:
+    """
+    Builds the sparse binary drug x unit incidence matrix, where a unit is an article or a journal.
+    Only the mentions whose `mentionDate` falls in [start_date, end_date] are used, when those bounds are provided.
+
+    Parameters:
+        - list_journals (List): List of all journals.
+        - level (str): One of COOCCURRENCE_LEVELS, article or journal.
+        - start_date (str, optional): First mention date to keep (%Y-%m-%d).
+        - end_date (str, optional): Last mention date to keep (%Y-%m-%d).
+
+    Returns:
+        - List: The CSR incidence matrix and the drug names of its rows.
+    """
+    if level not in COOCCURRENCE_LEVELS:
+        raise ValueError(
+            f"The level {level} is not supported (allowed values: {', '.join(COOCCURRENCE_LEVELS)})."
+        )
+
+    drug_positions, unit_positions = {}, {}
+    row_indices, column_indices = [], []
+
+    for journal in list_journals:
+        pubmed, clinical_trials = get_all_articles_from_journal(journal)
+
+        for article_object in pubmed + clinical_trials:
+            mention_date = article_object["mentionDate"]
+
+            # Dates are %Y-%m-%d strings, so string and date orders are the same
+            if (start_date is not None and mention_date < start_date) or (
+                end_date is not None and mention_date > end_date
+            ):
+                continue
+
+            unit = (
+                journal["title"] if level == "journal" else article_object["articleId"]
+            )
+            drug_name = article_object["mentionedDrugName"]
+
+            row_indices.append(
+                drug_positions.setdefault(drug_name, len(drug_positions))
+            )
+            column_indices.append(unit_positions.setdefault(unit, len(unit_positions)))
+
+    incidence_matrix = sparse.csr_matrix(
+        (np.ones(len(row_indices), dtype=np.int32), (row_indices, column_indices)),
+        shape=(len(drug_positions), len(unit_positions)),
+    )
+    # A drug mentioned twice by the same journal counts once
+    incidence_matrix.sum_duplicates()
+    incidence_matrix.data[:] = 1
+
+    return [incidence_matrix, list(drug_positions)]
+
+
+def compute_drug_similarities(incidence_matrix, metric: str = "jaccard"):
+    """
+    Computes the sparse drug x drug co-occurrence matrix (number of shared units), then turns it into similarity scores.
+        - jaccard: shared / (units of drug A + units of drug B - shared)
+        - cosine: shared / sqrt(units of drug A * units of drug B)
+    Only the pairs of drugs sharing at least one unit are computed and stored.
+
+    Parameters:
+        - incidence_matrix: Binary drug x unit matrix, see `build_drug_incidence_matrix`.
+        - metric (str): One of SIMILARITY_METRICS.
+
+    Returns:
+        - similarity_matrix: CSR drug x drug matrix of similarity scores, the diagonal is removed.
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(
+            f"The metric {metric} is not supported (allowed values: {', '.join(SIMILARITY_METRICS)})."
+        )
+
+    cooccurrence_matrix = (incidence_matrix @ incidence_matrix.T).tocoo()
+    units_per_drug = np.asarray(incidence_matrix.sum(axis=1)).ravel()
+
+    rows, columns = cooccurrence_matrix.row, cooccurrence_matrix.col
+    shared_units = cooccurrence_matrix.data.astype(np.float64)
+
+    if metric == "jaccard":
+        scores = shared_units / (
+            units_per_drug[rows] + units_per_drug[columns] - shared_units
+        )
+    else:
+        scores = shared_units / np.sqrt(units_per_drug[rows] * units_per_drug[columns])
+
+    off_diagonal = rows != columns
+
+    return sparse.csr_matrix(
+        (scores[off_diagonal], (rows[off_diagonal], columns[off_diagonal])),
+        shape=cooccurrence_matrix.shape,
+    )
+
+
+def get_top_similar_drugs(
+    list_journals: List,
+    level: str = "article",
+    metric: str = "jaccard",
+    top_k: int = 5,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict:
+    """
+    Returns, for every drug of the graph, the top k drugs that appear together with it (at article or journal level).
+
+    Parameters:
+        - list_journals (List): List of all journals.
+        - level (str): One of COOCCURRENCE_LEVELS.
+        - metric (str): One of SIMILARITY_METRICS.
+        - top_k (int): Maximum number of similar drugs per drug.
+        - start_date (str, optional): First mention date to keep (%Y-%m-%d).
+        - end_date (str, optional): Last mention date to keep (%Y-%m-%d).
+
+    Returns:
+        - similar_drugs: Drug name -> [drug_name, score] pairs sorted by decreasing score (then name).
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be a positive integer, got {top_k}.")
+
+    incidence_matrix, drug_names = build_drug_incidence_matrix(
+        list_journals, level=level, start_date=start_date, end_date=end_date
+    )
+    similarity_matrix = compute_drug_similarities(incidence_matrix, metric=metric)
+
+    similar_drugs = {}
+    for position, drug_name in enumerate(drug_names):
+        row_start, row_end = similarity_matrix.indptr[position : position + 2]
+        row_scores = similarity_matrix.data[row_start:row_end]
+        row_drugs = [
+            drug_names[index] for index in similarity_matrix.indices[row_start:row_end]
+        ]
+
+        ranking = sorted(
+            zip(row_scores, row_drugs), key=lambda pair: (-pair[0], pair[1])
+        )
+        similar_drugs[drug_name] = [
+            [other_drug_name, round(float(score), 6)]
+            for score, other_drug_name in ranking[:top_k]
+        ]
+
+    logger.info(
+        f"Computed the {metric} similarities of {len(drug_names)} drugs at {level} level ({similarity_matrix.nnz} drug pairs)."
+    )
+    return similar_drugs
@@ -0,0 +1,192 @@
+# Built-in packages
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+from app.utils.files_processing import create_folders_if_not_exist
+
+DEFAULT_QUERY_CACHE_MAX_BYTES = 64 * 1024**2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+QUERY_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    cache_key TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS graph_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS statistics (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_last_used_at ON results (last_used_at);
+"""
+
+# Keeps the most recently used results within the size limit, the older ones are deleted
+EVICTION_QUERY = """
+DELETE FROM results
+WHERE cache_key IN (
+    SELECT cache_key
+    FROM (
+        SELECT
+            cache_key,
+            SUM(size) OVER (ORDER BY last_used_at DESC, cache_key) AS cumulative_size
+        FROM
+            results
+    )
+    WHERE cumulative_size > ?
+)
+"""
+
+
+@dataclass
+class QueryCache:
+    path: str  # The SQLite file of the cache
+    max_bytes: int = DEFAULT_QUERY_CACHE_MAX_BYTES  # Total size of the cached results
+
+
+def open_query_cache(cache_path: str) -> sqlite3.Connection:
+    create_folders_if_not_exist(cache_path)
+    # Several analysts may query at the same time, each one waits for the others' writes
+    connection = sqlite3.connect(cache_path, timeout=30)
+    connection.executescript(QUERY_CACHE_SCHEMA)
+
+    return connection
+
+
+def hash_file(filepath: str) -> str:
+    content_hash = hashlib.blake2b(digest_size=16)
+
+    with open(filepath, "rb") as hd:
+        for chunk in iter(lambda: hd.read(HASH_CHUNK_SIZE), b""):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def get_graph_content_hash(connection: sqlite3.Connection, graph_path: str) -> str:
+    """
+    Returns the hash of the content of the graph file. The file is only hashed again when its size or modification time changed,
+    so the cached results of a graph regenerated with the same content stay valid.
+    """
+    graph_stat = os.stat(graph_path)
+    graph_key = os.path.abspath(graph_path)
+
+    row = connection.execute(
+        "SELECT content_hash FROM graph_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+        (graph_key, graph_stat.st_size, graph_stat.st_mtime_ns),
+    ).fetchone()
+    if row is not None:
+        return row[0]
+
+    content_hash = hash_file(graph_path)
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO graph_hashes VALUES (?, ?, ?, ?)",
+            (graph_key, graph_stat.st_size, graph_stat.st_mtime_ns, content_hash),
+        )
+
+    return content_hash
+
+
+def get_cache_key(query_name: str, parameters: Dict, content_hash: str) -> str:
+    key_str = json.dumps(
+        {"query": query_name, "parameters": parameters, "graph": content_hash},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+    return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+
+
+def increment_statistic(connection: sqlite3.Connection, name: str) -> Dict:
+    connection.execute(
+        "INSERT INTO statistics VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET value = value + 1",
+        (name,),
+    )
+
+    return dict(connection.execute("SELECT name, value FROM statistics").fetchall())
+
+
+def log_cache_statistics(query_name: str, status: str, statistics: Dict) -> None:
+    nb_hits, nb_misses = statistics.get("hits", 0), statistics.get("misses", 0)
+
+    logger.info(
+        f"[Query Cache] - {status} for {query_name} ({nb_hits} hits, {nb_misses} misses since the cache was created, "
+        f"{nb_hits / (nb_hits + nb_misses):.1%} hit ratio)."
+    )
+
+
+def get_or_compute(
+    query_cache: Optional[QueryCache],
+    graph_path: str,
+    query_name: str,
+    parameters: Dict,
+    compute: Callable,
+) -> Any:
+    """
+    Returns the cached result of the query on the current graph, or computes and caches it.
+    The cache key is made of the query, its parameters and the hash of the content of the graph, so the results of a previous graph are never returned.
+    Once the cached results are over the size limit, the least recently used ones are evicted.
+
+    Parameters:
+        - query_cache (QueryCache): The cache, None to always compute the result.
+        - graph_path (str): The graph file the query reads (json graph or graph store).
+        - query_name (str): The name of the query.
+        - parameters (Dict): The parameters of the query (json serializable).
+        - compute (Callable): The function computing the result (json serializable), called without arguments on a cache miss.
+
+    Returns:
+        - Any: The result of the query. Tuples are returned as lists when read from the cache.
+    """
+    if query_cache is None:
+        return compute()
+
+    with closing(open_query_cache(query_cache.path)) as connection:
+        cache_key = get_cache_key(
+            query_name, parameters, get_graph_content_hash(connection, graph_path)
+        )
+
+        row = connection.execute(
+            "SELECT result FROM results WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if row is not None:
+            with connection:
+                connection.execute(
+                    "UPDATE results SET last_used_at = ? WHERE cache_key = ?",
+                    (time.time_ns(), cache_key),
+                )
+                statistics = increment_statistic(connection, "hits")
+            log_cache_statistics(query_name, "Hit", statistics)
+
+            return json.loads(row[0])
+
+        result = compute()
+
+        result_bytes = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (cache_key, result_bytes, len(result_bytes), time.time_ns()),
+            )
+            connection.execute(EVICTION_QUERY, (query_cache.max_bytes,))
+            statistics = increment_statistic(connection, "misses")
+        log_cache_statistics(query_name, "Miss", statistics)
+
+    return result
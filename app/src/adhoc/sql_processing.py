@@ -0,0 +1,306 @@
+# Third-party packages
+import pandas as pd
+from pandera.typing import DataFrame
+
+# Built-in packages
+import os
+import sqlite3
+from typing import Dict, List, Set
+
+# My Custom packages
+from app.utils.my_logger import logger
+from app.utils.files_processing import create_folders_if_not_exist
+
+# Stores of another version are rebuilt by the next write of the graph (`PRAGMA user_version`)
+GRAPH_STORE_VERSION = 2
+
+GRAPH_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journals (
+    journal_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    journal_id INTEGER NOT NULL REFERENCES journals (journal_id),
+    title TEXT NOT NULL,
+    article_type TEXT NOT NULL CHECK (article_type IN ('PubMed', 'ClinicalTrial'))
+);
+
+CREATE TABLE IF NOT EXISTS drugs (
+    drug_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    article_id TEXT NOT NULL REFERENCES articles (article_id),
+    drug_id TEXT NOT NULL REFERENCES drugs (drug_id),
+    mention_date TEXT NOT NULL,
+    nb_mentions INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (article_id, drug_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_journal_id ON articles (journal_id);
+CREATE INDEX IF NOT EXISTS idx_drugs_name ON drugs (name);
+CREATE INDEX IF NOT EXISTS idx_mentions_drug_id ON mentions (drug_id);
+CREATE INDEX IF NOT EXISTS idx_mentions_mention_date ON mentions (mention_date);
+"""
+
+DROP_GRAPH_STORE_TABLES = """
+DROP TABLE IF EXISTS mentions;
+DROP TABLE IF EXISTS articles;
+DROP TABLE IF EXISTS drugs;
+DROP TABLE IF EXISTS journals;
+"""
+
+# SQL expression computing each metric of `app.src.adhoc.json_processing.RANKING_METRICS` per journal
+JOURNAL_METRICS_EXPRESSIONS = {
+    "unique_drugs": "COUNT(DISTINCT m.drug_id)",
+    # A drug listed several times for an article by the graph (once per matched alias) counts each time, like in the json
+    "total_mentions": "COALESCE(SUM(m.nb_mentions), 0)",
+    "pubmed_mentions": "COALESCE(SUM(CASE WHEN a.article_type = 'PubMed' THEN m.nb_mentions END), 0)",
+    "clinical_mentions": "COALESCE(SUM(CASE WHEN a.article_type = 'ClinicalTrial' THEN m.nb_mentions END), 0)",
+}
+
+TOP_JOURNALS_QUERY = """
+WITH journal_scores AS (
+    SELECT
+        j.journal_id AS journal_id,
+        j.title AS title,
+        {metric_expression} AS score
+    FROM
+        journals AS j
+    LEFT JOIN articles AS a ON a.journal_id = j.journal_id
+    LEFT JOIN mentions AS m ON m.article_id = a.article_id
+    GROUP BY
+        j.journal_id
+),
+journal_ranks AS (
+    SELECT
+        journal_id,
+        title,
+        score,
+        RANK() OVER (ORDER BY score DESC) AS journal_rank
+    FROM
+        journal_scores
+)
+SELECT
+    title,
+    score
+FROM
+    journal_ranks
+WHERE
+    journal_rank <= :top_n
+ORDER BY
+    score DESC,
+    journal_id ASC
+"""
+
+DRUGS_MENTIONED_BY_SIMILAR_JOURNALS_QUERY = """
+WITH journals_mentioning_drug AS (
+    SELECT DISTINCT
+        a.journal_id AS journal_id
+    FROM
+        mentions AS m
+    JOIN articles AS a ON a.article_id = m.article_id
+    JOIN drugs AS d ON d.drug_id = m.drug_id
+    WHERE
+        d.name = :drug_name
+),
+journals_referenced_by_clinical_trials AS (
+    SELECT DISTINCT
+        journal_id
+    FROM
+        articles
+    WHERE
+        article_type = 'ClinicalTrial'
+)
+SELECT DISTINCT
+    j.title AS journal_title,
+    d.name AS drug_name
+FROM
+    journals_mentioning_drug AS jmd
+JOIN journals AS j ON j.journal_id = jmd.journal_id
+JOIN articles AS a ON a.journal_id = jmd.journal_id
+JOIN mentions AS m ON m.article_id = a.article_id
+JOIN drugs AS d ON d.drug_id = m.drug_id
+WHERE
+    NOT :skip_clinical_trials
+    OR jmd.journal_id NOT IN (SELECT journal_id FROM journals_referenced_by_clinical_trials)
+"""
+
+
+def open_graph_store(
+    db_path: str, create_if_missing: bool = True
+) -> sqlite3.Connection:
+    """
+    Opens (and creates if needed) the SQLite graph store, making sure its tables and indexes exist.
+
+    Parameters:
+        - db_path (str): The path to the SQLite database file. Use ":memory:" for a temporary store.
+        - create_if_missing (bool): When False, a missing store raises an error instead of being created empty.
+
+    Returns:
+        - connection: The connection to the graph store.
+    """
+    if db_path != ":memory:":
+        if not create_if_missing and not os.path.exists(db_path):
+            raise FileNotFoundError(
+                f"The graph store {db_path} does not exist, generate it with `python main.py generate_graph_link --use_graph_store`."
+            )
+        create_folders_if_not_exist(db_path)
+
+    connection = sqlite3.connect(db_path)
+    store_version = connection.execute("PRAGMA user_version").fetchone()[0]
+    nb_tables = connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'"
+    ).fetchone()[0]
+
+    if nb_tables > 0 and store_version != GRAPH_STORE_VERSION:
+        if not create_if_missing:
+            connection.close()
+            raise ValueError(
+                f"The graph store {db_path} has the unsupported version {store_version}, regenerate it with `python main.py generate_graph_link --use_graph_store`."
+            )
+        # The store only holds a copy of the link graph, written again by the caller
+        connection.executescript(DROP_GRAPH_STORE_TABLES)
+
+    connection.executescript(GRAPH_STORE_SCHEMA)
+    connection.execute(f"PRAGMA user_version = {GRAPH_STORE_VERSION}")
+    return connection
+
+
+def write_graph_to_store(connection: sqlite3.Connection, graph_link_dict: Dict) -> None:
+    """
+    Persists the link graph into the graph store. The previous content of the store is replaced.
+
+    Parameters:
+        - connection (sqlite3.Connection): The connection to the graph store.
+        - graph_link_dict (Dict): The link graph, as generated by `build_link_graph_from_df`.
+    """
+    journals_rows, articles_rows, drugs_rows, mentions_rows = [], [], {}, {}
+
+    for journal_id, journal_dict in enumerate(graph_link_dict["journals"]):
+        journals_rows.append((journal_id, journal_dict["title"]))
+
+        referenced_by = journal_dict["referencedBy"]
+        articles_by_type = [
+            ("PubMed", referenced_by["pubmedArticles"]),
+            ("ClinicalTrial", referenced_by["clinicalTrials"]),
+        ]
+
+        for article_type, articles in articles_by_type:
+            for article_object in articles:
+                articles_rows.append(
+                    (
+                        article_object["articleId"],
+                        journal_id,
+                        article_object["articleTitle"],
+                        article_type,
+                    )
+                )
+                drugs_rows[article_object["mentionedDrugID"]] = article_object[
+                    "mentionedDrugName"
+                ]
+                # A drug listed several times for an article is stored once, with the number of times it is listed
+                mention_key = (
+                    article_object["articleId"],
+                    article_object["mentionedDrugID"],
+                )
+                if mention_key in mentions_rows:
+                    mentions_rows[mention_key][3] += 1
+                else:
+                    mentions_rows[mention_key] = [
+                        *mention_key,
+                        article_object["mentionDate"],
+                        1,
+                    ]
+
+    # Single transaction, either the whole graph is stored or nothing is
+    with connection:
+        for table in ["mentions", "articles", "drugs", "journals"]:
+            connection.execute(f"DELETE FROM {table}")
+
+        connection.executemany("INSERT INTO journals VALUES (?, ?)", journals_rows)
+        # An article mentioning multiple drugs appears once per drug in the graph
+        connection.executemany(
+            "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?)", articles_rows
+        )
+        connection.executemany("INSERT INTO drugs VALUES (?, ?)", drugs_rows.items())
+        connection.executemany(
+            "INSERT INTO mentions VALUES (?, ?, ?, ?)", mentions_rows.values()
+        )
+
+    nb_mentions = sum(mention_row[3] for mention_row in mentions_rows.values())
+    logger.info(
+        f"[Graph Store] - Stored {len(journals_rows)} journals, {len(drugs_rows)} drugs and {nb_mentions} mentions."
+    )
+
+
+def get_top_journals(
+    connection: sqlite3.Connection, metric: str = "unique_drugs", top_n: int = 1
+) -> List:
+    """
+    SQL equivalent of `app.src.adhoc.json_processing.rank_top_journals`. Returns the top N journals for the given metric, including ties with the N-th journal.
+
+    Parameters:
+        - connection (sqlite3.Connection): The connection to the graph store.
+        - metric (str): One of `JOURNAL_METRICS_EXPRESSIONS` keys.
+        - top_n (int): Number of journals to keep (before ties).
+
+    Returns:
+        - List: [journal_title, score] pairs sorted by decreasing score.
+    """
+    if metric not in JOURNAL_METRICS_EXPRESSIONS:
+        raise ValueError(
+            f"The metric {metric} is not supported (allowed values: {', '.join(JOURNAL_METRICS_EXPRESSIONS)})."
+        )
+
+    query = TOP_JOURNALS_QUERY.format(
+        metric_expression=JOURNAL_METRICS_EXPRESSIONS[metric]
+    )
+    rows = connection.execute(query, {"top_n": top_n}).fetchall()
+
+    return [[title, score] for title, score in rows]
+
+
+def get_drugs_mentioned_by_similar_journals(
+    connection: sqlite3.Connection, drug_name: str, skip_clinical_trials: bool
+) -> Set:
+    """
+    SQL equivalent of `app.src.adhoc.json_processing.get_drugs_mentioned_by_similar_journals`.
+
+    Parameters:
+        - connection (sqlite3.Connection): The connection to the graph store.
+        - drug_name (str): The specific drug name to search for.
+        - skip_clinical_trials (bool): Flag to skip journals referenced by clinical trials.
+
+    Returns:
+        - output_drug_mentions: Set of drugs mentioned alongside the specific drug name.
+    """
+    rows = connection.execute(
+        DRUGS_MENTIONED_BY_SIMILAR_JOURNALS_QUERY,
+        {"drug_name": drug_name, "skip_clinical_trials": skip_clinical_trials},
+    ).fetchall()
+
+    output_drug_mentions = {drug for _, drug in rows}
+    non_clinical_trials_journals = list(dict.fromkeys(journal for journal, _ in rows))
+
+    logger.info(
+        f"The drug {drug_name} was mentioned alongside the following drug names `{', '.join(list(output_drug_mentions))}` by these non-clinical trials referenced journals : `{', '.join(non_clinical_trials_journals)}`"
+    )
+    return output_drug_mentions
+
+
+def run_query(connection: sqlite3.Connection, query: str) -> DataFrame:
+    """
+    Runs an arbitrary SQL query against the graph store (tables : journals, articles, drugs, mentions).
+
+    Parameters:
+        - connection (sqlite3.Connection): The connection to the graph store.
+        - query (str): The SQL query to run.
+
+    Returns:
+        - DataFrame: The result of the query.
+    """
+    return pd.read_sql_query(query, connection)
@@ -0,0 +1,201 @@
+# Third-party packages
+import numpy as np
+
+# Built-in packages
+from typing import Dict, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+from app.src.adhoc.json_processing import get_all_articles_from_journal
+
+INDEXED_ENTITIES = ["drug", "journal"]
+ROLLUP_FREQUENCIES = ["day", "week", "month", "year"]
+
+
+def date_to_day(date_str: str) -> int:
+    """
+    Converts a %Y-%m-%d date to the number of days since 1970-01-01, the unit stored in the temporal index.
+    """
+    return int(np.datetime64(date_str, "D").astype(np.int32))
+
+
+def build_entity_index(mention_days_mapping: Dict) -> Dict:
+    """
+    Packs the mention days of each entity into a CSR-like layout : all sorted days in one int32 array, with offsets per entity.
+    Names are sorted too, so an entity is found with a binary search.
+    """
+    names = sorted(mention_days_mapping)
+    lengths = [len(mention_days_mapping[name]) for name in names]
+
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    days = np.empty(offsets[-1], dtype=np.int32)
+    for position, name in enumerate(names):
+        days[offsets[position] : offsets[position + 1]] = np.sort(
+            np.asarray(mention_days_mapping[name], dtype=np.int32)
+        )
+
+    return {"names": np.array(names, dtype=str), "offsets": offsets, "days": days}
+
+
+def build_temporal_index(graph_link_dict: Dict) -> Dict:
+    """
+    Builds the temporal index of the link graph : for each drug and each journal, the sorted days of its mentions.
+    Each `mentionDate` string is parsed once here, so later queries only run binary searches on int32 arrays.
+
+    Parameters:
+        - graph_link_dict (Dict): The link graph, as generated by `build_link_graph_from_df`.
+
+    Returns:
+        - temporal_index: Entity (drug or journal) -> names, offsets and days arrays.
+    """
+    drug_days_mapping, journal_days_mapping = {}, {}
+    parsed_dates = {}
+
+    for journal in graph_link_dict["journals"]:
+        pubmed, clinical_trials = get_all_articles_from_journal(journal)
+        journal_days = journal_days_mapping.setdefault(journal["title"], [])
+
+        for article_object in pubmed + clinical_trials:
+            mention_date = article_object["mentionDate"]
+            if mention_date not in parsed_dates:
+                parsed_dates[mention_date] = date_to_day(mention_date)
+
+            journal_days.append(parsed_dates[mention_date])
+            drug_days_mapping.setdefault(
+                article_object["mentionedDrugName"], []
+            ).append(parsed_dates[mention_date])
+
+    return {
+        "drug": build_entity_index(drug_days_mapping),
+        "journal": build_entity_index(journal_days_mapping),
+    }
+
+
+def write_temporal_index(temporal_index_path: str, temporal_index: Dict) -> None:
+    arrays = {
+        f"{entity}_{array_name}": array
+        for entity, entity_index in temporal_index.items()
+        for array_name, array in entity_index.items()
+    }
+    # Written through a file handle so numpy does not append its own .npz extension, and atomically so a reader never loads a truncated index
+    with U.atomic_output_file(temporal_index_path) as hd:
+        np.savez(hd, **arrays)
+
+
+def load_temporal_index(temporal_index_path: str) -> Dict:
+    with np.load(temporal_index_path) as arrays:
+        return {
+            entity: {
+                array_name: arrays[f"{entity}_{array_name}"]
+                for array_name in ["names", "offsets", "days"]
+            }
+            for entity in INDEXED_ENTITIES
+        }
+
+
+def get_mention_days(
+    temporal_index: Dict,
+    entity: str,
+    name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Returns the sorted mention days of a drug or journal, between two dates (both included) when they are provided.
+    The date range is found with two binary searches, without reading the other mentions.
+
+    Parameters:
+        - temporal_index (Dict): The index returned by `build_temporal_index` or `load_temporal_index`.
+        - entity (str): One of INDEXED_ENTITIES.
+        - name (str): The name of the drug or the title of the journal.
+        - start_date (str, optional): First date to keep (%Y-%m-%d).
+        - end_date (str, optional): Last date to keep (%Y-%m-%d).
+
+    Returns:
+        - np.ndarray: int32 array of days since 1970-01-01, empty if the name is not in the index.
+    """
+    if entity not in INDEXED_ENTITIES:
+        raise ValueError(
+            f"The entity {entity} is not supported (allowed values: {', '.join(INDEXED_ENTITIES)})."
+        )
+
+    entity_index = temporal_index[entity]
+    names = entity_index["names"]
+    position = np.searchsorted(names, name)
+
+    if position == len(names) or names[position] != name:
+        logger.warning(f"The {entity} {name} has no mention in the temporal index.")
+        return np.empty(0, dtype=np.int32)
+
+    offsets = entity_index["offsets"]
+    days = entity_index["days"][offsets[position] : offsets[position + 1]]
+
+    first = (
+        0
+        if start_date is None
+        else np.searchsorted(days, date_to_day(start_date), "left")
+    )
+    last = (
+        len(days)
+        if end_date is None
+        else np.searchsorted(days, date_to_day(end_date), "right")
+    )
+
+    return days[first:last]
+
+
+def count_mentions_between(
+    temporal_index: Dict,
+    entity: str,
+    name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> int:
+    return len(get_mention_days(temporal_index, entity, name, start_date, end_date))
+
+
+def rollup_mentions(
+    temporal_index: Dict,
+    entity: str,
+    name: str,
+    frequency: str = "month",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict:
+    """
+    Counts the mentions of a drug or journal per day, week (starting on monday), month or year.
+
+    Parameters:
+        - temporal_index (Dict): The temporal index.
+        - entity (str): One of INDEXED_ENTITIES.
+        - name (str): The name of the drug or the title of the journal.
+        - frequency (str): One of ROLLUP_FREQUENCIES.
+        - start_date (str, optional): First date to keep (%Y-%m-%d).
+        - end_date (str, optional): Last date to keep (%Y-%m-%d).
+
+    Returns:
+        - Dict: Period label (ex: 2020-01-01, 2019-12-30, 2020-01 or 2020) -> number of mentions, in chronological order.
+    """
+    days = get_mention_days(temporal_index, entity, name, start_date, end_date)
+    dates = days.astype("datetime64[D]")
+
+    if frequency == "day":
+        periods = dates
+    elif frequency == "week":
+        # 1970-01-01 was a thursday, so monday-based weeks start 3 days before each multiple of 7
+        periods = (days - (days + 3) % 7).astype("datetime64[D]")
+    elif frequency == "month":
+        periods = dates.astype("datetime64[M]")
+    elif frequency == "year":
+        periods = dates.astype("datetime64[Y]")
+    else:
+        raise ValueError(
+            f"The frequency {frequency} is not supported (allowed values: {', '.join(ROLLUP_FREQUENCIES)})."
+        )
+
+    unique_periods, counts = np.unique(periods, return_counts=True)
+
+    return {str(period): int(count) for period, count in zip(unique_periods, counts)}
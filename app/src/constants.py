@@ -4,3 +4,6 @@ CLINICAL_TRIALS_PATHS = os.environ["ClinicalTrialsPaths"]
 PUBMED_PATHS = os.environ["PubMedPaths"]
 DRUGS_PATHS = os.environ["DrugsPaths"]
 OUTPUT_PATH = os.environ["OutputPath"]
+GRAPH_STORE_PATH = os.environ["GraphStorePath"]
+# Optional, the temporal index is only built when its path is set
+TEMPORAL_INDEX_PATH = os.environ.get("TemporalIndexPath")
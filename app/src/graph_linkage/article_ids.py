@@ -0,0 +1,26 @@
+# Built-in packages
+import hashlib
+
+MISSING_ID_STRATEGIES = ["sequential", "content_hash"]
+# Prefix of the generated IDs, which can never be mistaken for a numeric PubMed ID
+CONTENT_HASH_ID_PREFIX = "H"
+ID_DATE_FORMAT = "%Y-%m-%d"
+
+
+def get_content_hash_id(title: str, date: str) -> str:
+    """
+    Generates the ID of an article without ID from its title and date (`%Y-%m-%d`), the key of an article once duplicates are merged.
+    The ID only depends on the article itself, not on the other articles nor on their order, so it is the same whatever the
+    chunk or shard the article is read in, and stays the same across reruns and incremental updates.
+
+    Parameters:
+        - title (str): The title of the article, as read from the input files.
+        - date (str): The date of the article, formatted as `%Y-%m-%d`.
+
+    Returns:
+        - str: The generated ID, 16 hexadecimal characters (64 bits) prefixed by `H`.
+    """
+    key = f"{title}\x1f{date}"
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+    return f"{CONTENT_HASH_ID_PREFIX}{digest}"
@@ -0,0 +1,182 @@
+# Built-in packages
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, List, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+from app.utils.json_serializers import get_json_serializer
+
+FINGERPRINT_FILENAME = "fingerprint.txt"
+# Journal shards (sha1 of the title), and their temporary files left by an interrupted write
+SHARD_FILENAME_PATTERN = re.compile(r"[0-9a-f]{40}\.json(\.\d+\.tmp)?")
+
+
+def get_inputs_fingerprint(input_paths: List, options: Dict) -> str:
+    """
+    Builds a fingerprint of the inputs of a run : path, size and modification time of each input file, and the options changing the graph.
+    The journal shards of a previous run are only reused when the fingerprints are the same.
+
+    Parameters:
+        - input_paths (List): The paths of the input files.
+        - options (Dict): The options of the run changing the content of the graph.
+
+    Returns:
+        - str: The fingerprint of the inputs.
+    """
+    inputs = []
+    for path in input_paths:
+        stat = os.stat(path)
+        inputs.append([path, stat.st_size, stat.st_mtime_ns])
+
+    inputs_str = json.dumps({"inputs": inputs, "options": options}, sort_keys=True)
+    return hashlib.sha256(inputs_str.encode("utf-8")).hexdigest()
+
+
+def open_checkpoint_dir(checkpoint_dir: str, fingerprint: str, resume: bool) -> None:
+    """
+    Prepares the folder of the journal shards. When resuming a run with the same inputs, the existing shards are kept.
+    Otherwise (no resume, or different inputs), the existing shards are removed and the run starts from scratch.
+
+    Parameters:
+        - checkpoint_dir (str): The folder of the journal shards.
+        - fingerprint (str): The fingerprint of the inputs of the current run.
+        - resume (bool): Whether the journals already written by a previous run should be skipped.
+
+    Raises ValueError when the folder is not empty and was not created by a previous run (no fingerprint), so its files are never removed.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    fingerprint_path = os.path.join(checkpoint_dir, FINGERPRINT_FILENAME)
+
+    if os.listdir(checkpoint_dir) and not os.path.exists(fingerprint_path):
+        raise ValueError(
+            f"The folder {checkpoint_dir} is not empty and is not a checkpoint folder (no {FINGERPRINT_FILENAME}), use an empty or new folder."
+        )
+
+    if resume and os.path.exists(fingerprint_path):
+        with open(fingerprint_path, "r", encoding="utf-8") as hd:
+            previous_fingerprint = hd.read()
+
+        if previous_fingerprint == fingerprint:
+            nb_shards = len(list_shard_paths(checkpoint_dir))
+            logger.info(
+                f"[Checkpoint] - Resuming from {nb_shards} journal(s) already written in {checkpoint_dir}."
+            )
+            return
+
+        logger.warning(
+            f"[Checkpoint] - The inputs changed since the shards of {checkpoint_dir} were written, starting from scratch."
+        )
+
+    for shard_path in list_shard_paths(checkpoint_dir):
+        os.remove(shard_path)
+
+    with open(fingerprint_path, "w", encoding="utf-8") as hd:
+        hd.write(fingerprint)
+
+
+def list_shard_paths(checkpoint_dir: str) -> List:
+    # Only the files written by this module, the other files of the folder are never touched
+    return [
+        os.path.join(checkpoint_dir, filename)
+        for filename in os.listdir(checkpoint_dir)
+        if SHARD_FILENAME_PATTERN.fullmatch(filename)
+    ]
+
+
+def get_shard_path(checkpoint_dir: str, journal: str) -> str:
+    # Journal titles can contain any character, so the file name is a hash of the title
+    journal_hash = hashlib.sha1(journal.encode("utf-8")).hexdigest()
+    return os.path.join(checkpoint_dir, f"{journal_hash}.json")
+
+
+def write_journal_shard(checkpoint_dir: str, journal_graph: Dict) -> None:
+    """
+    Writes the graph of a completed journal. The shard is written atomically, so an interrupted run never leaves a truncated shard behind.
+    """
+    shard_path = get_shard_path(checkpoint_dir, journal_graph["title"])
+
+    with U.atomic_output_file(shard_path) as hd:
+        get_json_serializer().dump(journal_graph, hd)
+
+
+def load_journal_shard(checkpoint_dir: str, journal: str) -> Optional[Dict]:
+    """
+    Returns the graph of a journal written by a previous run, or None if the journal was not completed.
+    """
+    shard_path = get_shard_path(checkpoint_dir, journal)
+
+    if not os.path.exists(shard_path):
+        return None
+
+    with open(shard_path, "rb") as hd:
+        return get_json_serializer().load(hd)
+
+
+def assemble_graph_from_shards(
+    checkpoint_dir: str,
+    journals: List,
+    output_path: str,
+    fsync: bool = False,
+    pretty: bool = False,
+) -> Dict:
+    """
+    Writes the final link graph from the journal shards, one journal at a time, with the same layout as `write_dict_to_file`.
+    The compact shards are copied as is, they are only decoded to be indented when pretty printing.
+    The graph is written atomically (and compressed depending on the extension), so the output path always holds a complete graph.
+
+    Parameters:
+        - checkpoint_dir (str): The folder of the journal shards.
+        - journals (List): The titles of the journals, in the order of the graph.
+        - output_path (str): The path of the output json file.
+        - fsync (bool): Whether the graph is flushed to the disk before returning.
+        - pretty (bool): Whether the json is indented, for humans.
+
+    Returns:
+        - Dict: The number of bytes written, the duration in seconds and the throughput in MB/s.
+    """
+    start_time = time.perf_counter()
+
+    with U.atomic_output_file(output_path, fsync=fsync) as hd:
+        if not pretty:
+            hd.write(b'{"journals":[')
+            for position, journal in enumerate(journals):
+                if position > 0:
+                    hd.write(b",")
+                with open(get_shard_path(checkpoint_dir, journal), "rb") as shard:
+                    shutil.copyfileobj(shard, hd)
+            hd.write(b"]}")
+
+        elif len(journals) == 0:
+            hd.write(b'{\n    "journals": []\n}')
+
+        else:
+            hd.write(b'{\n    "journals": [\n')
+            for position, journal in enumerate(journals):
+                hd.write(
+                    U.encode_pretty_journal(load_journal_shard(checkpoint_dir, journal))
+                )
+                hd.write(b",\n" if position < len(journals) - 1 else b"\n")
+            hd.write(b"    ]\n}")
+
+    return U.get_write_statistics(output_path, start_time)
+
+
+def remove_checkpoint_dir(checkpoint_dir: str) -> None:
+    """
+    Removes the journal shards and the fingerprint, then the folder itself only if nothing else is left in it.
+    """
+    for shard_path in list_shard_paths(checkpoint_dir):
+        os.remove(shard_path)
+
+    fingerprint_path = os.path.join(checkpoint_dir, FINGERPRINT_FILENAME)
+    if os.path.exists(fingerprint_path):
+        os.remove(fingerprint_path)
+
+    if not os.listdir(checkpoint_dir):
+        os.rmdir(checkpoint_dir)
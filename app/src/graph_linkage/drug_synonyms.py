@@ -0,0 +1,143 @@
+# Built-in packages
+import csv
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# My Custom packages
+from app.utils.my_logger import logger
+from app.src.pandas_processing.clean import clean_titles
+
+
+@dataclass
+class DrugAliasMatcher:
+    drug_ids: List
+    drug_names: List
+    alias_drugs: Dict  # Alias -> positions of its drugs, in order of appearance
+    max_alias_words: int
+
+    def find_drugs(self, article_title: str) -> List:
+        """
+        Find the drug(s) mentioned in an article title, either by their name or by one of their aliases.
+        Every sequence of up to `max_alias_words` title words is looked up in the aliases, one dictionary lookup per sequence.
+
+        Parameters:
+            - article_title (str): The cleaned title of the article to analyze.
+
+        Returns:
+            - List: A list of mentioned drugs in the format [drug_id, drug_name, matched_alias], in the order of the drugs file.
+            When a drug is matched by several aliases, the longest (then first) one is kept.
+            An alias of several drugs mentions all of them, like the drugs sharing a name without matcher.
+        """
+        title_words = article_title.split()
+        alias_drugs = self.alias_drugs
+
+        # Phrases are looked up from the longest, so the longest alias of each drug is kept
+        matched_aliases = {}
+        for nb_words in range(min(self.max_alias_words, len(title_words)), 0, -1):
+            for start in range(len(title_words) - nb_words + 1):
+                phrase = " ".join(title_words[start : start + nb_words])
+                for drug_position in alias_drugs.get(phrase, ()):
+                    matched_aliases.setdefault(drug_position, phrase)
+
+        return [
+            [
+                self.drug_ids[drug_position],
+                self.drug_names[drug_position],
+                matched_aliases[drug_position],
+            ]
+            for drug_position in sorted(matched_aliases)
+        ]
+
+
+def load_drug_synonyms(synonyms_path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Streams the (atccode, synonym) rows of a synonyms csv file, so files with millions of aliases are never fully loaded in memory.
+
+    Parameters:
+        - synonyms_path (str): The path of a csv file with the `atccode` and `synonym` columns (one row per alias).
+
+    Returns:
+        - Iterator: The (atccode, synonym) pairs.
+    """
+    if not synonyms_path.endswith(".csv"):
+        raise Exception(
+            f"The provided path {synonyms_path} has an incompatible file extension (not csv)."
+        )
+
+    with open(synonyms_path, "r", encoding="utf-8", newline="") as hd:
+        for row in csv.DictReader(hd):
+            yield row["atccode"], row["synonym"]
+
+
+def build_drug_alias_matcher(
+    drug_ids: Iterable, drug_names: Iterable, drug_synonyms: Iterable = ()
+) -> DrugAliasMatcher:
+    """
+    Compiles the drug names and their synonyms into a single matcher. The aliases are cleaned like the titles, then mapped to their drugs.
+    When an alias belongs to several drugs, all of them are kept, like the drugs sharing a name are all mentioned without matcher.
+
+    Parameters:
+        - drug_ids (Iterable): The ID (atccode) of each drug.
+        - drug_names (Iterable): The cleaned name of each drug, in the same order.
+        - drug_synonyms (Iterable): The (atccode, synonym) pairs, synonyms of unknown drugs are ignored.
+
+    Returns:
+        - DrugAliasMatcher: The matcher used to find the drugs mentioned in article titles.
+    """
+    drug_ids = list(drug_ids)
+    drug_names = list(drug_names)
+    drug_positions = {}
+    for drug_position, drug_id in enumerate(drug_ids):
+        drug_positions.setdefault(str(drug_id), drug_position)
+
+    # The drug positions of each alias, in order of appearance (drug names first, then the order of the synonyms)
+    alias_drug_positions = {}
+    max_alias_words = 1
+    nb_unknown_drugs = 0
+
+    def add_alias(alias: str, drug_position: int) -> None:
+        nonlocal max_alias_words
+        if alias == "":
+            return
+        drug_positions_of_alias = alias_drug_positions.setdefault(alias, [])
+        if drug_position not in drug_positions_of_alias:
+            drug_positions_of_alias.append(drug_position)
+        max_alias_words = max(max_alias_words, alias.count(" ") + 1)
+
+    for drug_position, drug_name in enumerate(drug_names):
+        add_alias(drug_name, drug_position)
+
+    for drug_id, synonym in drug_synonyms:
+        drug_position = drug_positions.get(str(drug_id))
+        if drug_position is None:
+            nb_unknown_drugs += 1
+            continue
+        add_alias(clean_titles(synonym), drug_position)
+
+    if nb_unknown_drugs > 0:
+        logger.warning(
+            f"{nb_unknown_drugs} synonym(s) were ignored because their atccode is not in the drugs file."
+        )
+
+    nb_conflicts = sum(
+        len(drug_positions_of_alias) > 1
+        for drug_positions_of_alias in alias_drug_positions.values()
+    )
+    if nb_conflicts > 0:
+        logger.warning(
+            f"{nb_conflicts} alias(es) belong to several drugs, all of them are mentioned by a title matching the alias."
+        )
+
+    logger.info(
+        f"[Transform] - Compiled {len(alias_drug_positions)} drug aliases (up to {max_alias_words} words) for {len(drug_ids)} drugs."
+    )
+
+    return DrugAliasMatcher(
+        drug_ids=drug_ids,
+        drug_names=drug_names,
+        alias_drugs={
+            alias: tuple(drug_positions_of_alias)
+            for alias, drug_positions_of_alias in alias_drug_positions.items()
+        },
+        max_alias_words=max_alias_words,
+    )
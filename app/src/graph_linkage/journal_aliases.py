@@ -0,0 +1,227 @@
+# Third-party packages
+import numpy as np
+
+# Built-in packages
+import hashlib
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as P
+
+# Common abbreviations found in journal names, expanded before comparing names
+JOURNAL_ABBREVIATIONS = {
+    "j": "journal",
+    "am": "american",
+    "int": "international",
+    "med": "medicine",
+    "res": "research",
+    "clin": "clinical",
+    "rev": "review",
+    "sci": "science",
+    "vet": "veterinary",
+}
+JOURNAL_STOP_WORDS = {"the", "of", "and", "&", "in", "for", "de", "la", "le"}
+
+# MinHash prime modulus (2^31 - 1), small enough for a * x + b to fit in 64 bits
+MINHASH_PRIME = np.uint64((1 << 31) - 1)
+
+
+def normalize_journal_name(journal_name: str) -> str:
+    """
+    Builds the comparison key of a journal name : no accents, lower case, abbreviations expanded, stop words (like a "The" prefix) removed.
+    Two names with the same key are always considered aliases.
+    """
+    journal_name = unicodedata.normalize("NFKD", journal_name)
+    journal_name = "".join(
+        char for char in journal_name if not unicodedata.combining(char)
+    )
+
+    words = re.findall(r"\w+|&", journal_name.lower())
+    words = [JOURNAL_ABBREVIATIONS.get(word, word) for word in words]
+
+    return " ".join(word for word in words if word not in JOURNAL_STOP_WORDS)
+
+
+def get_shingles(journal_key: str, size: int = 3) -> Set:
+    padded_key = f" {journal_key} "
+    return {padded_key[i : i + size] for i in range(max(len(padded_key) - size + 1, 1))}
+
+
+def compute_minhash_signatures(
+    list_shingles: List, nb_permutations: int = 64, seed: int = 0
+) -> np.ndarray:
+    """
+    Computes the MinHash signature of each set of shingles, so similar names get similar signatures.
+    Shingles are hashed with blake2b (stable across runs, unlike `hash()`), then permuted with random affine functions.
+
+    Returns:
+        - np.ndarray: (number of names, nb_permutations) uint64 array.
+    """
+    rng = np.random.default_rng(seed)
+    coefficients_a = rng.integers(
+        1, MINHASH_PRIME, size=nb_permutations, dtype=np.uint64
+    )
+    coefficients_b = rng.integers(
+        0, MINHASH_PRIME, size=nb_permutations, dtype=np.uint64
+    )
+
+    signatures = np.empty((len(list_shingles), nb_permutations), dtype=np.uint64)
+
+    for position, shingles in enumerate(list_shingles):
+        shingle_hashes = (
+            np.array(
+                [
+                    int.from_bytes(
+                        hashlib.blake2b(shingle.encode(), digest_size=8).digest(),
+                        "little",
+                    )
+                    for shingle in shingles
+                ],
+                dtype=np.uint64,
+            )
+            % MINHASH_PRIME
+        )
+
+        permuted_hashes = (
+            coefficients_a[:, None] * shingle_hashes[None, :] + coefficients_b[:, None]
+        ) % MINHASH_PRIME
+        signatures[position] = permuted_hashes.min(axis=1)
+
+    return signatures
+
+
+def find_candidate_pairs(signatures: np.ndarray, nb_bands: int = 16) -> Set:
+    """
+    Locality sensitive hashing : names sharing a whole band of their signature land in the same bucket and become candidates.
+    This avoids comparing all pairs of names.
+    """
+    rows_per_band = signatures.shape[1] // nb_bands
+    candidate_pairs = set()
+
+    for band in range(nb_bands):
+        buckets = defaultdict(list)
+        band_signatures = signatures[
+            :, band * rows_per_band : (band + 1) * rows_per_band
+        ]
+
+        for position, band_signature in enumerate(band_signatures):
+            buckets[band_signature.tobytes()].append(position)
+
+        for positions in buckets.values():
+            for i, first in enumerate(positions):
+                for second in positions[i + 1 :]:
+                    candidate_pairs.add((first, second))
+
+    return candidate_pairs
+
+
+def jaccard_similarity(first_set: Set, second_set: Set) -> float:
+    return len(first_set & second_set) / len(first_set | second_set)
+
+
+def build_journal_alias_map(
+    journal_names: Iterable, known_aliases: Dict = None, threshold: float = 0.7
+) -> Dict:
+    """
+    Groups near-duplicate journal names (abbreviations, "The" prefixes, typos) and maps every name to the canonical name of its group.
+    Candidates come from MinHash LSH, then only candidate pairs with at least one new name are scored with the exact shingle Jaccard similarity.
+
+    Parameters:
+        - journal_names (Iterable): Journal names of the articles, with repetitions (the most frequent, then longest, name of a group becomes canonical).
+        - known_aliases (Dict, optional): Alias map of a previous run, these names keep their canonical name.
+        - threshold (float): Minimum Jaccard similarity between two names to consider them aliases.
+
+    Returns:
+        - alias_map: Journal name -> canonical journal name, for the known and new names.
+    """
+    known_aliases = dict(known_aliases or {})
+    names_counter = Counter(name for name in journal_names if name)
+
+    new_names = [name for name in names_counter if name not in known_aliases]
+    all_names = list(known_aliases) + new_names
+    first_new_position = len(known_aliases)
+
+    keys = [normalize_journal_name(name) for name in all_names]
+    list_shingles = [get_shingles(key) for key in keys]
+
+    # Union-find over the positions of all_names
+    parents = list(range(len(all_names)))
+
+    def find(position: int) -> int:
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    def union(first: int, second: int) -> None:
+        first_root, second_root = find(first), find(second)
+        if max(first_root, second_root) < first_new_position:
+            return  # Two known groups, kept apart by a previous run
+        # Known names stay roots, so new names join their existing group
+        if first_root != second_root:
+            parents[max(first_root, second_root)] = min(first_root, second_root)
+
+    # Same key : aliases without scoring
+    positions_by_key = {}
+    for position, key in enumerate(keys):
+        if key in positions_by_key and position >= first_new_position:
+            union(positions_by_key[key], position)
+        positions_by_key.setdefault(key, position)
+
+    nb_scored_pairs = 0
+    if new_names:
+        signatures = compute_minhash_signatures(list_shingles)
+        for first, second in find_candidate_pairs(signatures):
+            if max(first, second) < first_new_position:
+                continue  # Both names were already scored in a previous run
+            nb_scored_pairs += 1
+            if (
+                jaccard_similarity(list_shingles[first], list_shingles[second])
+                >= threshold
+            ):
+                union(first, second)
+
+    groups = defaultdict(list)
+    for position in range(len(all_names)):
+        groups[find(position)].append(position)
+
+    alias_map = {}
+    for root, positions in groups.items():
+        if root < first_new_position:
+            canonical_name = known_aliases[all_names[root]]
+        else:
+            canonical_name = min(
+                (all_names[position] for position in positions),
+                key=lambda name: (-names_counter[name], -len(name), name),
+            )
+        for position in positions:
+            alias_map[all_names[position]] = canonical_name
+
+    logger.info(
+        f"[Cleaning] - Canonicalized {len(new_names)} new journal names ({nb_scored_pairs} candidate pairs scored), {len(set(alias_map.values()))} distinct journals remain."
+    )
+    return alias_map
+
+
+def canonicalize_journal_names(
+    journal_names: Iterable, journal_aliases_path: str, threshold: float = 0.7
+) -> Dict:
+    """
+    Builds the journal alias map, re-using the alias map cached at `journal_aliases_path` by previous runs, then updates the cache.
+
+    Returns:
+        - alias_map: Journal name -> canonical journal name.
+    """
+    known_aliases = {}
+    if os.path.exists(journal_aliases_path):
+        known_aliases = P.import_json_file_as_dict(journal_aliases_path)
+
+    alias_map = build_journal_alias_map(journal_names, known_aliases, threshold)
+    P.write_dict_to_file(journal_aliases_path, alias_map)
+
+    return alias_map
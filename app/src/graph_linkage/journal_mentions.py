@@ -3,74 +3,168 @@ from pandera.typing import DataFrame
 
 # Built-in packages
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 
 # My Custom packages
-from app.utils.my_logger import logger
+from app.utils.my_logger import AggregatedWarning, logger
+from app.src.graph_linkage.drug_synonyms import DrugAliasMatcher
+import app.utils.metrics as M
+
+# Logged once per linking run (see `flush_link_warnings`) instead of once per title
+NO_DRUG_WARNING = AggregatedWarning("titles had no drug mentioned")
+
+
+def add_article_information_columns(articles_df: DataFrame) -> DataFrame:
+    """
+    Computes, once for all the articles, the fields of the links derived from each article : the mention date as a string and the article type flags.
+    The journals then only slice these columns instead of formatting each article.
+
+    Parameters:
+        - articles_df (DataFrame): DataFrame of all articles, with the `date` (datetime) and `article_type` columns.
+
+    Returns:
+        - DataFrame: The articles with the `mentionDate`, `isPubMed` and `isClinical` columns.
+    """
+    return articles_df.assign(
+        mentionDate=articles_df["date"].dt.strftime("%Y-%m-%d"),
+        isPubMed=articles_df["article_type"] == "PubMed",
+        isClinical=articles_df["article_type"] == "ClinicalTrial",
+    )
+
+
+def index_drug_names(drugs_df: DataFrame) -> Dict:
+    """
+    Maps each drug name to the position and ID of the drugs of this name, computed once for all the journals.
+    A title is then matched by looking up its words, instead of comparing it to every drug.
+
+    Parameters:
+        - drugs_df (DataFrame): DataFrame of the drugs indexed by ID, with the `name` column.
+
+    Returns:
+        - Dict: The list of (position, drug ID) of each drug name, by increasing position in the drugs dataframe.
+    """
+    drug_names_index = {}
+
+    for position, (drug_id, drug_name) in enumerate(
+        zip(drugs_df.index, drugs_df["name"])
+    ):
+        drug_names_index.setdefault(drug_name, []).append((position, drug_id))
+
+    return drug_names_index
+
+
+def reset_link_warnings() -> None:
+    """
+    Drops the warnings aggregated outside of a linking run (direct calls to `JournalMentions`), before a new run starts.
+    """
+    NO_DRUG_WARNING.reset()
+
+
+def flush_link_warnings() -> None:
+    """
+    Logs the warnings aggregated while linking the articles, once the journals are linked.
+    """
+    NO_DRUG_WARNING.flush()
+
+
+def record_link_metrics(journal_graphs: List, nb_articles: int) -> None:
+    """
+    Records the metrics of the linking step in the run metrics, computed from the graphs of the journals.
+    The journals loaded from a checkpoint or linked by the polars backend are then counted like the journals linked by pandas.
+
+    Parameters:
+        - journal_graphs (List): The graph of each linked journal.
+        - nb_articles (int): The number of articles linked, including the articles mentioning no drug.
+    """
+    nb_mentions_by_type = {"PubMed": 0, "ClinicalTrial": 0}
+    linked_article_ids = set()
+
+    for journal_graph in journal_graphs:
+        referenced_by = journal_graph["referencedBy"]
+        for article_type, mentions in [
+            ("PubMed", referenced_by["pubmedArticles"]),
+            ("ClinicalTrial", referenced_by["clinicalTrials"]),
+        ]:
+            nb_mentions_by_type[article_type] += len(mentions)
+            linked_article_ids.update(mention["articleId"] for mention in mentions)
+
+    M.increment("graph_link_journals_linked_total", len(journal_graphs))
+    for article_type, nb_mentions in nb_mentions_by_type.items():
+        M.increment(
+            "graph_link_edges_emitted_total", nb_mentions, article_type=article_type
+        )
+    M.increment(
+        "graph_link_titles_without_drug_total", nb_articles - len(linked_article_ids)
+    )
 
 
 @dataclass
 class JournalMentions:
     title: str
     drugs_dataFrame: DataFrame
-    journal_articles_dataFrame: DataFrame  # Articles of the current journal only
+    journal_articles_dataFrame: (
+        DataFrame  # Articles of the current journal only, with the information columns
+    )
+    drug_matcher: Optional[DrugAliasMatcher] = None  # Also matches drug synonyms
+    # See `index_drug_names`, built from the drugs dataframe when not provided
+    drug_names_index: Optional[Dict] = None
     pubmed_publications: List = field(default_factory=list, init=False)
     clinical_trials_publications: List = field(default_factory=list, init=False)
 
     def extract_drug_from_publication_title(self, article_title: str) -> List:
         """
         Find the name(s) of the drug(s) mentioned in the any given article title.
+        When a drug matcher is provided, the drugs are also found by their synonyms (brand names...).
 
         Parameters:
             - article_title (str): The title of the article to analyze.
 
         Returns:
-            - List: A list of mentioned drugs in the format [drug_id, drug_name].
+            - List: A list of mentioned drugs in the format [drug_id, drug_name], or [drug_id, drug_name, matched_alias] with a drug matcher.
         """
-        title_words_set = set(article_title.split())
-
-        mentioned_drugs = []
-
-        for drug_id, row in self.drugs_dataFrame.iterrows():
-            if row["name"] in title_words_set:
-                mentioned_drugs.append([drug_id, row["name"]])
+        if self.drug_matcher is not None:
+            mentioned_drugs = self.drug_matcher.find_drugs(article_title)
+        else:
+            if self.drug_names_index is None:
+                self.drug_names_index = index_drug_names(self.drugs_dataFrame)
+
+            title_words_set = set(article_title.split())
+
+            # Sorted by position, the drugs keep the order of the drugs dataframe
+            mentioned_drugs = [
+                [drug_id, drug_name]
+                for _, drug_id, drug_name in sorted(
+                    (position, drug_id, word)
+                    for word in title_words_set
+                    for position, drug_id in self.drug_names_index.get(word, [])
+                )
+            ]
 
         if mentioned_drugs == []:
             # No drug found, and given our hypothesis, we skip it
-            logger.warning(
-                f"No drug was mentioned in the following title : `{article_title}`"
+            NO_DRUG_WARNING.add(article_title)
+            logger.debug(
+                "No drug was mentioned in the following title : `{}`", article_title
             )
 
         return mentioned_drugs
 
-    def get_article_information_from_id(self, article_id: str) -> Dict:
+    def get_articles_information(self) -> Iterator:
         """
-        Get all information about an article based on the provided article ID.
-
-        Parameters:
-            - article_id (str): The unique identifier of the article.
+        Get all information about the articles of the journal, sliced from the columns precomputed by `add_article_information_columns`.
 
         Returns:
-            - article_info: A dictionary containing information about the article like the title, mention date, and type of the article.
+            - Iterator: The ID, title, mention date (string) and the isPubMed and isClinical flags of each article.
         """
-        current_article_row = self.journal_articles_dataFrame.loc[article_id]
-
-        article_title = current_article_row["title"]
-        mention_date = current_article_row["date"]
-        article_type = current_article_row["article_type"]
+        articles_df = self.journal_articles_dataFrame
 
-        # Transform date to string
-        mention_date_str = datetime.strftime(mention_date, "%Y-%m-%d")
-
-        article_info = {
-            "title": article_title,
-            "date": mention_date_str,
-            "isPubMed": True if article_type == "PubMed" else False,
-            "isClinical": True if article_type == "ClinicalTrial" else False,
-        }
-
-        return article_info
+        return zip(
+            articles_df.index,
+            articles_df["title"].to_numpy(),
+            articles_df["mentionDate"].to_numpy(),
+            articles_df["isPubMed"].to_numpy(),
+            articles_df["isClinical"].to_numpy(),
+        )
 
     def build_links_articles_drug_mentions(self) -> None:
         """
@@ -82,36 +176,43 @@ class JournalMentions:
             - mentionDate: The date of the article publication / drug mention.
             - mentionedDrugID: ID of the drug mentioned in the title of the article.
             - mentionedDrugName: Name of the drug mentioned in the title of the article.
+            - matchedAlias: The name or synonym of the drug found in the title (only with a drug matcher).
 
         Raises an exception if an article is neither clinical nor from PubMed.
         """
-        for article_id in self.journal_articles_dataFrame.index:
-            # Get info about articles
-            article_info = self.get_article_information_from_id(article_id)
-
+        for (
+            article_id,
+            article_title,
+            mention_date,
+            is_pubmed,
+            is_clinical,
+        ) in self.get_articles_information():
             # Find mentioned drug(s)
             list_mentioned_drugs = self.extract_drug_from_publication_title(
-                article_info["title"]
+                article_title
             )
 
             for mentioned_drug_info in list_mentioned_drugs:
-                mentioned_drug_id, mentioned_drug_name = mentioned_drug_info
+                mentioned_drug_id, mentioned_drug_name = mentioned_drug_info[:2]
 
                 currLinkDict = {
                     "articleId": article_id,
-                    "articleTitle": article_info["title"],
-                    "mentionDate": article_info["date"],
+                    "articleTitle": article_title,
+                    "mentionDate": mention_date,
                     "mentionedDrugID": mentioned_drug_id,
                     "mentionedDrugName": mentioned_drug_name,
                 }
 
-                if article_info["isPubMed"] is True:
+                if self.drug_matcher is not None:
+                    currLinkDict["matchedAlias"] = mentioned_drug_info[2]
+
+                if is_pubmed:
                     self.pubmed_publications.append(currLinkDict)
-                elif article_info["isClinical"] is True:
+                elif is_clinical:
                     self.clinical_trials_publications.append(currLinkDict)
                 else:
                     raise Exception(
-                        f"Something went wrong, the article { article_info['title']} is neither clinical nor pubmed"
+                        f"Something went wrong, the article {article_title} is neither clinical nor pubmed"
                     )
 
     def generate_article_link_graph_dict(self) -> Dict:
@@ -0,0 +1,185 @@
+# Built-in packages
+import glob
+import hashlib
+import io
+import os
+from typing import Dict, List, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+from app.utils.json_serializers import get_json_serializer
+
+MANIFEST_FILENAME = "manifest.json"
+PARTITIONED_GRAPH_FORMAT = "journal_buckets"
+PARTITIONED_GRAPH_VERSION = 1
+BUCKET_HEADER = b'{"journals":['
+BUCKET_FOOTER = b"]}"
+
+
+def get_journal_bucket(title: str, nb_buckets: int) -> int:
+    """
+    Returns the bucket of a journal. The hash does not change between processes, so a reader finds the bucket of a journal from its title.
+    """
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big") % nb_buckets
+
+
+def get_bucket_filename(bucket: int, content_hash: str) -> str:
+    # Named after its content, a new bucket never replaces a bucket listed by the current manifest
+    return f"bucket_{bucket:04d}_{content_hash[:16]}.json"
+
+
+def get_nb_mentions(journal_graph: Dict) -> int:
+    referenced_by = journal_graph["referencedBy"]
+
+    return len(referenced_by["pubmedArticles"]) + len(referenced_by["clinicalTrials"])
+
+
+def encode_journal(journal_graph: Dict) -> bytes:
+    buffer = io.BytesIO()
+    get_json_serializer().dump(journal_graph, buffer)
+
+    return buffer.getvalue()
+
+
+def write_partitioned_graph(
+    output_graph: Dict, output_dir: str, nb_buckets: int = 16, fsync: bool = False
+) -> Dict:
+    """
+    Writes the link graph as one file per bucket of journals (by hash of their title) and a manifest, so the consumers can read
+    the buckets in parallel or fetch a single journal. Each bucket is a compact link graph of its journals, readable on its own.
+    The manifest lists the journals of each bucket with their position in the graph, number of mentions and byte range in the bucket file.
+    Each bucket file is named after its content, so the buckets of the previous manifest are never overwritten. The manifest is written last,
+    atomically, and the buckets not listed in it are then removed : a run interrupted at any point leaves a consistent graph, previous or new.
+
+    Parameters:
+        - output_graph (Dict): The link graph.
+        - output_dir (str): The folder of the buckets and manifest.
+        - nb_buckets (int): The number of buckets.
+        - fsync (bool): Whether the files are flushed to the disk before returning.
+
+    Returns:
+        - Dict: The manifest.
+    """
+    if nb_buckets < 1:
+        raise ValueError(f"nb_buckets must be a positive integer, got {nb_buckets}.")
+
+    journals_per_bucket = [[] for _ in range(nb_buckets)]
+    for position, journal_graph in enumerate(output_graph["journals"]):
+        bucket = get_journal_bucket(journal_graph["title"], nb_buckets)
+        journals_per_bucket[bucket].append((position, journal_graph))
+
+    bucket_entries = []
+    for bucket, bucket_journals in enumerate(journals_per_bucket):
+        content_hash = hashlib.blake2b(digest_size=16)
+        journal_entries = []
+        chunks = [BUCKET_HEADER]
+        offset = len(BUCKET_HEADER)
+
+        for index, (position, journal_graph) in enumerate(bucket_journals):
+            if index > 0:
+                chunks.append(b",")
+                offset += 1
+
+            journal_bytes = encode_journal(journal_graph)
+            chunks.append(journal_bytes)
+            journal_entries.append(
+                {
+                    "title": journal_graph["title"],
+                    "position": position,
+                    "nbMentions": get_nb_mentions(journal_graph),
+                    "offset": offset,
+                    "length": len(journal_bytes),
+                }
+            )
+            offset += len(journal_bytes)
+
+        chunks.append(BUCKET_FOOTER)
+        for chunk in chunks:
+            content_hash.update(chunk)
+
+        bucket_filename = get_bucket_filename(bucket, content_hash.hexdigest())
+        with U.atomic_output_file(
+            os.path.join(output_dir, bucket_filename), fsync=fsync
+        ) as hd:
+            for chunk in chunks:
+                hd.write(chunk)
+
+        bucket_entries.append(
+            {
+                "file": bucket_filename,
+                "nbJournals": len(journal_entries),
+                "nbMentions": sum(entry["nbMentions"] for entry in journal_entries),
+                "bytes": offset + len(BUCKET_FOOTER),
+                "contentHash": content_hash.hexdigest(),
+                "journals": journal_entries,
+            }
+        )
+
+    manifest = {
+        "format": PARTITIONED_GRAPH_FORMAT,
+        "version": PARTITIONED_GRAPH_VERSION,
+        "nbBuckets": nb_buckets,
+        "nbJournals": sum(entry["nbJournals"] for entry in bucket_entries),
+        "nbMentions": sum(entry["nbMentions"] for entry in bucket_entries),
+        "buckets": bucket_entries,
+    }
+    U.write_dict_to_file(get_manifest_path(output_dir), manifest, fsync=fsync)
+
+    bucket_filenames = {entry["file"] for entry in bucket_entries}
+    for bucket_path in glob.glob(os.path.join(output_dir, "bucket_*.json")):
+        if os.path.basename(bucket_path) not in bucket_filenames:
+            os.remove(bucket_path)
+
+    logger.info(
+        f"[Partitioned Graph] - Wrote {manifest['nbJournals']} journals into {nb_buckets} buckets in {output_dir}."
+    )
+    return manifest
+
+
+def get_manifest_path(graph_dir: str) -> str:
+    return os.path.join(graph_dir, MANIFEST_FILENAME)
+
+
+def load_manifest(graph_dir: str) -> Dict:
+    manifest = U.import_json_file_as_dict(get_manifest_path(graph_dir))
+
+    if manifest.get("format") != PARTITIONED_GRAPH_FORMAT:
+        raise ValueError(f"The folder {graph_dir} does not hold a partitioned graph.")
+    if manifest.get("version") != PARTITIONED_GRAPH_VERSION:
+        raise ValueError(
+            f"The partitioned graph of {graph_dir} has the unsupported version {manifest.get('version')}, regenerate it."
+        )
+
+    return manifest
+
+
+def load_bucket_journals(graph_dir: str, bucket_entry: Dict) -> List:
+    """
+    Returns the journals of a bucket, in the order of the graph (see the `position` of each journal in the manifest).
+    """
+    bucket_graph = U.import_json_file_as_dict(
+        os.path.join(graph_dir, bucket_entry["file"]), is_link_graph=True
+    )
+
+    return bucket_graph["journals"]
+
+
+def load_journal(graph_dir: str, title: str) -> Optional[Dict]:
+    """
+    Returns the graph of a single journal, reading only its byte range of its bucket file. None when the graph has no such journal.
+    """
+    manifest = load_manifest(graph_dir)
+    bucket_entry = manifest["buckets"][get_journal_bucket(title, manifest["nbBuckets"])]
+
+    for journal_entry in bucket_entry["journals"]:
+        if journal_entry["title"] == title:
+            with open(os.path.join(graph_dir, bucket_entry["file"]), "rb") as hd:
+                hd.seek(journal_entry["offset"])
+                journal_bytes = hd.read(journal_entry["length"])
+
+            return get_json_serializer().load(io.BytesIO(journal_bytes))
+
+    return None
@@ -8,6 +8,14 @@ import re
 from typing import Dict, List
 from datetime import datetime
 
+# My Custom packages
+import app.src.graph_linkage.article_ids as AI
+import app.utils.metrics as M
+
+# Ownership model : the cleaning functions never modify the dataframe they receive, they return a new one.
+# With copy-on-write (enabled by the command line, see main.py), the new dataframe shares the columns it did not change
+# with its input, so only the changed columns are new and no full copy of the dataframe is made.
+
 
 def normalize_dates_format(
     df: DataFrame, date_column_name: str, output_date_format: str = "%Y-%m-%d"
@@ -24,14 +32,11 @@ def normalize_dates_format(
     Returns:
         - df: DataFrame with the date column standardized to the output date format.
     """
-    df[date_column_name] = pd.to_datetime(
-        df[date_column_name], dayfirst=True, format="mixed"
-    )
-    df[date_column_name] = df[date_column_name].dt.strftime(output_date_format)
-    df[date_column_name] = df[date_column_name].apply(
+    dates = pd.to_datetime(df[date_column_name], dayfirst=True, format="mixed")
+    dates = dates.dt.strftime(output_date_format).apply(
         lambda x: datetime.strptime(x, output_date_format)
     )
-    return df
+    return df.assign(**{date_column_name: dates})
 
 
 def cast_id_as_string(df: DataFrame, id_column_name: str) -> DataFrame:
@@ -45,13 +50,12 @@ def cast_id_as_string(df: DataFrame, id_column_name: str) -> DataFrame:
     Returns:
         df: The DataFrame with the specified column cast as string.
     """
-    df[id_column_name] = df[id_column_name].astype(str)
-    return df
+    return df.assign(**{id_column_name: df[id_column_name].astype(str)})
 
 
 def rename_column(df: DataFrame, column_naming_mapping: Dict) -> DataFrame:
     """
-    Rename one or multiple columns in a DataFrame.
+    Rename one or multiple columns in a DataFrame. With copy-on-write, the columns are not copied.
 
     Parameters:
         - df (DataFrame): The input pandas DataFrame.
@@ -74,16 +78,51 @@ def fill_in_missing_ids_int(df: DataFrame, id_column_name: str) -> DataFrame:
     Returns:
         - df: DataFrame with missing IDs filled in
     """
-    df[id_column_name] = pd.to_numeric(df[id_column_name], errors="coerce")
+    # The numeric IDs are returned as is by to_numeric, the copy keeps the input unchanged (lazy with copy-on-write)
+    ids = pd.to_numeric(df[id_column_name], errors="coerce").copy()
 
-    max_id = int(df[id_column_name].max())
-    number_missing_rows = df[id_column_name].isna().sum()
+    max_id = int(ids.max())
+    missing_ids = ids.isna()
+    number_missing_rows = missing_ids.sum()
 
     id_range = range(int(max_id) + 1, int(max_id) + 1 + number_missing_rows)
 
-    df.loc[df[id_column_name].isna(), id_column_name] = id_range
-    df[id_column_name] = df[id_column_name].astype(int)
-    return df
+    ids[missing_ids] = id_range
+    return df.assign(**{id_column_name: ids.astype(int)})
+
+
+def fill_in_missing_ids_content_hash(
+    df: DataFrame,
+    id_column_name: str,
+    title_column_name: str = "title",
+    date_column_name: str = "date",
+) -> DataFrame:
+    """
+    Fill in missing IDs with an ID generated from the title and date of each row (see `get_content_hash_id`).
+    Unlike `fill_in_missing_ids_int`, each ID only depends on its own row : the rows can be processed by chunks or shards, in any order,
+    and an article keeps its ID across reruns and incremental updates.
+
+    Parameters:
+        - df (DataFrame): DataFrame to process, with the date column already normalized (datetime).
+        - id_column_name (str): Name of the column containing IDs. The numeric IDs are kept as integers, like `fill_in_missing_ids_int`.
+        - title_column_name (str): Name of the column containing titles.
+        - date_column_name (str): Name of the column containing dates.
+
+    Returns:
+        - df: DataFrame with missing IDs filled in, as strings.
+    """
+    ids = pd.to_numeric(df[id_column_name], errors="coerce")
+    missing_ids = ids.isna()
+
+    string_ids = ids.fillna(0).astype(int).astype(str)
+    string_ids[missing_ids] = [
+        AI.get_content_hash_id(title, date)
+        for title, date in zip(
+            df.loc[missing_ids, title_column_name],
+            df.loc[missing_ids, date_column_name].dt.strftime(AI.ID_DATE_FORMAT),
+        )
+    ]
+    return df.assign(**{id_column_name: string_ids})
 
 
 def clean_titles(current_title: str) -> str:
@@ -117,9 +156,30 @@ def clean_titles(current_title: str) -> str:
     return ""  # Will be cleaned in the next steps
 
 
+def merge_duplicate_rows(df: DataFrame, keys: List) -> DataFrame:
+    """
+    Merges the rows sharing the same `keys` into one, each column keeping the first non-null value of its group.
+    Same result as grouping by `keys` then applying `app.src.pandas_processing.transform.merge_rows`, without building one row per group.
+    Like the groupby, rows with a null key are dropped and the output is sorted by key.
+
+    Parameters:
+        - df (DataFrame): DataFrame of articles.
+        - keys (List): Columns identifying duplicate rows.
+
+    Returns:
+        - df: DataFrame with a single row per unique key, with the columns in the same order.
+    """
+    other_columns = [name for name in df.columns if name not in keys]
+    merged_df = df.groupby(keys)[other_columns].first().reset_index()
+    M.increment("graph_link_duplicate_rows_merged_total", len(df) - len(merged_df))
+
+    return merged_df[df.columns.tolist()]
+
+
 def drop_empty_titles_and_journals(df: DataFrame) -> DataFrame:
     """
     Drops rows from the input DataFrame where either the 'title' or 'journal' column is empty.
+    The rows are only copied when some of them are dropped.
 
     Parameters:
         - df (DataFrame): Input DataFrame of articles (PubMed and clinical trials)
@@ -134,6 +194,10 @@ def drop_empty_titles_and_journals(df: DataFrame) -> DataFrame:
         & (pd.notna(df["journal"]))
     )
 
+    if filter_condition.all():
+        return df
+
+    M.increment("graph_link_empty_rows_dropped_total", int((~filter_condition).sum()))
     filtered_df = df[filter_condition]
     return filtered_df
 
@@ -151,15 +215,19 @@ def drop_duplicate_ids_then_index(
     Returns:
         - A tuple containing the modified drugs DataFrame and articles DataFrame.
     """
-    drugs_df = drugs_df.drop_duplicates(
-        subset=["atccode"], keep="first", ignore_index=True
-    )
-    all_articles_df = all_articles_df.drop_duplicates(
-        subset=["id"], keep="first", ignore_index=True
-    )
+    return drop_duplicate_ids_then_index_df(
+        drugs_df, "atccode"
+    ), drop_duplicate_ids_then_index_df(all_articles_df, "id")
 
-    # Index the dataframes using IDs
-    drugs_df.set_index("atccode", inplace=True)
-    all_articles_df.set_index("id", inplace=True)
 
-    return drugs_df, all_articles_df
+def drop_duplicate_ids_then_index_df(df: DataFrame, id_column_name: str) -> DataFrame:
+    """
+    Drop duplicate IDs from a DataFrame (the first row of each ID is kept), then index it using the ID column.
+    The rows are only copied when some of them are dropped, and the indexing does not copy the other columns.
+    """
+    duplicate_ids = df.duplicated(subset=[id_column_name], keep="first")
+    if duplicate_ids.any():
+        M.increment("graph_link_duplicate_ids_dropped_total", int(duplicate_ids.sum()))
+        df = df[~duplicate_ids]
+
+    return df.set_index(id_column_name)
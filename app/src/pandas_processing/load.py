@@ -3,11 +3,13 @@ import pandas as pd
 from pandera.typing import DataFrame
 
 # Built-in packages
+import os
 from typing import Dict, List
 
 # My custom packages
 from app.utils.my_logger import logger
 import app.utils.files_processing as P
+import app.utils.metrics as M
 import app.src.pandas_processing.transform as T
 
 
@@ -55,6 +57,9 @@ def load_input_data(paths: List) -> DataFrame:
                 f"The provided path {path} has an incompatible file extension (not csv nor json)."
             )
 
+        M.increment(
+            "graph_link_rows_loaded_total", len(df), source=os.path.basename(path)
+        )
         list_dfs.append(df)
 
     df = T.merge_dataframes(list_dfs)
@@ -0,0 +1,308 @@
+# Third-party packages
+import numpy as np
+import pandas as pd
+from pandera.typing import DataFrame
+
+# Built-in packages
+import math
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.metrics as M
+
+# The link step holds a few copies of the articles (information columns, journal slices), the budget must cover them all
+ARTICLES_MEMORY_FACTOR = 4
+MAX_SPILL_PARTITIONS = 128
+# Number of articles converted to Arrow at once while spilling
+SPILL_CHUNK_ROWS = 100_000
+
+MEMORY_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+MEMORY_LIMIT_PATTERN = re.compile(
+    r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*$", re.IGNORECASE
+)
+
+
+@dataclass
+class SpilledSources:
+    spill_dir: str
+    nb_partitions: (
+        int  # The articles of all the sources are partitioned by a hash of their ID
+    )
+
+
+@dataclass
+class SpilledArticles:
+    spill_dir: str
+    nb_partitions: int  # The kept articles are partitioned by a hash of their journal
+    journals: List  # Titles of the journals, in order of first appearance
+
+
+def import_pyarrow():
+    """
+    Imports the optional pyarrow package, only required to spill the articles to the disk.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as error:
+        raise ImportError(
+            "The memory limit requires the `pyarrow` package to spill the articles to the disk, install it with `pip install pyarrow`."
+        ) from error
+
+    return pyarrow
+
+
+def parse_memory_limit(memory_limit: str) -> int:
+    """
+    Converts a memory size such as `512MB`, `2G` or `1.5GiB` (or a number of bytes) to a number of bytes.
+    """
+    match = MEMORY_LIMIT_PATTERN.match(memory_limit)
+    if match is None:
+        raise ValueError(
+            f"The memory limit {memory_limit} is not a valid size (examples: 512MB, 2GB)."
+        )
+
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2).upper()])
+
+
+def get_nb_spill_partitions(articles_dfs: List, memory_limit: int) -> int:
+    """
+    Returns the number of partitions needed for the articles of each partition to fit in the memory budget, 1 when all the articles fit.
+
+    Parameters:
+        - articles_dfs (List): The cleaned articles of each source.
+        - memory_limit (int): The memory budget of the articles, in bytes.
+
+    Returns:
+        - int: The number of partitions of the articles.
+    """
+    articles_bytes = sum(
+        int(articles_df.memory_usage(deep=True).sum()) for articles_df in articles_dfs
+    )
+    nb_partitions = math.ceil(ARTICLES_MEMORY_FACTOR * articles_bytes / memory_limit)
+
+    logger.info(
+        f"[Spill] - The articles use {articles_bytes} bytes for a memory limit of {memory_limit} bytes."
+    )
+    return min(max(nb_partitions, 1), MAX_SPILL_PARTITIONS)
+
+
+def get_kept_articles_mask(articles_df: DataFrame) -> np.ndarray:
+    """
+    Same rows as `drop_empty_titles_and_journals` then `drop_duplicates` on the ID (first one kept), as a boolean mask.
+    Only the mask is built, the articles are not copied.
+    """
+    titles = articles_df["title"]
+    journals = articles_df["journal"]
+    kept_mask = (
+        (titles != "") & titles.notna() & (journals != "") & journals.notna()
+    ).to_numpy(copy=True)
+
+    kept_ids = articles_df["id"].to_numpy()[kept_mask]
+    duplicate_ids = pd.Series(kept_ids).duplicated(keep="first").to_numpy()
+    kept_mask[kept_mask] = ~duplicate_ids
+
+    M.increment("graph_link_empty_rows_dropped_total", len(kept_mask) - len(kept_ids))
+    M.increment("graph_link_duplicate_ids_dropped_total", int(duplicate_ids.sum()))
+
+    return kept_mask
+
+
+def get_partition_path(spill_dir: str, partition: int, partition_key: str) -> str:
+    return os.path.join(spill_dir, f"articles_by_{partition_key}_{partition}.arrow")
+
+
+def get_partitions(values: pd.Series, nb_partitions: int) -> np.ndarray:
+    return pd.util.hash_array(values.to_numpy(dtype=object)) % nb_partitions
+
+
+def write_partitions(
+    writers: Dict,
+    spill_dir: str,
+    partition_key: str,
+    table,
+    partitions: np.ndarray,
+) -> None:
+    """
+    Appends the rows of an Arrow table to the stream of their partition, opened on its first rows.
+    """
+    pyarrow = import_pyarrow()
+
+    for partition in np.unique(partitions):
+        if partition not in writers:
+            writers[partition] = pyarrow.ipc.new_stream(
+                get_partition_path(spill_dir, partition, partition_key), table.schema
+            )
+        writers[partition].write_table(table.filter(partitions == partition))
+
+
+def spill_articles_by_id(
+    articles_dfs: Dict, nb_partitions: int, journal_alias_map: Optional[Dict] = None
+) -> SpilledSources:
+    """
+    Writes the cleaned articles of each source to Arrow files partitioned by a hash of their ID, instead of merging the sources in memory.
+    All the articles of an ID are in the same partition, in the order of the merged articles, so the duplicate IDs are dropped one partition at a time.
+    Each article keeps its position in the merged articles. The files are written to the temporary folder (`TMPDIR`).
+
+    Parameters:
+        - articles_dfs (Dict): Article type -> cleaned articles of the source, with the `id`, `title` and `journal` columns, in order of merge.
+        - nb_partitions (int): The number of partitions.
+        - journal_alias_map (Dict): Optional journal name -> canonical journal name.
+
+    Returns:
+        - SpilledSources: The folder and number of partitions.
+    """
+    pyarrow = import_pyarrow()
+
+    spill_dir = tempfile.mkdtemp(prefix="graph_link_spill_")
+    writers = {}
+    schema = None
+    nb_articles = 0
+
+    try:
+        try:
+            for article_type, articles_df in articles_dfs.items():
+                for chunk_start in range(0, len(articles_df), SPILL_CHUNK_ROWS):
+                    chunk_df = articles_df.iloc[
+                        chunk_start : chunk_start + SPILL_CHUNK_ROWS
+                    ]
+                    chunk_df = chunk_df.assign(
+                        article_type=article_type,
+                        position=np.arange(nb_articles, nb_articles + len(chunk_df)),
+                    )
+                    nb_articles += len(chunk_df)
+
+                    if journal_alias_map is not None:
+                        journals = chunk_df["journal"]
+                        chunk_df["journal"] = journals.map(journal_alias_map).fillna(
+                            journals
+                        )
+
+                    chunk_table = pyarrow.Table.from_pandas(
+                        chunk_df, schema=schema, preserve_index=False
+                    )
+                    schema = chunk_table.schema
+                    write_partitions(
+                        writers,
+                        spill_dir,
+                        "id",
+                        chunk_table,
+                        get_partitions(chunk_df["id"], nb_partitions),
+                    )
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    except BaseException:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        raise
+
+    logger.info(
+        f"[Spill] - Spilled {nb_articles} articles of {len(articles_dfs)} sources into {len(writers)} partitions in {spill_dir}."
+    )
+    return SpilledSources(spill_dir=spill_dir, nb_partitions=nb_partitions)
+
+
+def dedupe_spilled_articles(spilled_sources: SpilledSources) -> SpilledArticles:
+    """
+    Drops the empty and duplicate articles one ID partition at a time, then writes the kept articles to Arrow files partitioned
+    by a hash of their journal, so all the articles of a journal are in the same partition and only one partition is loaded at a time afterwards.
+    The ID partitions are removed once read.
+
+    Parameters:
+        - spilled_sources (SpilledSources): The articles spilled by `spill_articles_by_id`.
+
+    Returns:
+        - SpilledArticles: The folder and number of partitions, and the journals in order of first appearance.
+    """
+    pyarrow = import_pyarrow()
+
+    spill_dir = spilled_sources.spill_dir
+    writers = {}
+    first_positions = {}  # Journal -> position of its first kept article
+    nb_kept_articles = 0
+
+    try:
+        try:
+            for partition in range(spilled_sources.nb_partitions):
+                partition_path = get_partition_path(spill_dir, partition, "id")
+                if not os.path.exists(partition_path):
+                    continue
+
+                with pyarrow.OSFile(partition_path, "rb") as source:
+                    articles_table = pyarrow.ipc.open_stream(source).read_all()
+                os.remove(partition_path)
+
+                # Only the columns of the mask are converted to pandas, the kept articles are filtered in Arrow
+                articles_df = articles_table.select(
+                    ["id", "title", "journal", "position"]
+                ).to_pandas()
+                kept_mask = get_kept_articles_mask(articles_df)
+                kept_df = articles_df[kept_mask]
+                nb_kept_articles += len(kept_df)
+
+                for journal, position in (
+                    kept_df.groupby("journal", sort=False)["position"].min().items()
+                ):
+                    first_positions[journal] = min(
+                        position, first_positions.get(journal, position)
+                    )
+
+                write_partitions(
+                    writers,
+                    spill_dir,
+                    "journal",
+                    articles_table.filter(kept_mask),
+                    get_partitions(kept_df["journal"], spilled_sources.nb_partitions),
+                )
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    except BaseException:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        raise
+
+    logger.info(
+        f"[Spill] - Kept {nb_kept_articles} articles of {len(first_positions)} journals, spilled into {len(writers)} partitions in {spill_dir}."
+    )
+    return SpilledArticles(
+        spill_dir=spill_dir,
+        nb_partitions=spilled_sources.nb_partitions,
+        journals=sorted(first_positions, key=first_positions.get),
+    )
+
+
+def iter_spilled_partitions(spilled_articles: SpilledArticles) -> Iterator[DataFrame]:
+    """
+    Loads the partitions of spilled articles one at a time, indexed by ID like `drop_duplicate_ids_then_index`.
+    """
+    pyarrow = import_pyarrow()
+
+    for partition in range(spilled_articles.nb_partitions):
+        partition_path = get_partition_path(
+            spilled_articles.spill_dir, partition, "journal"
+        )
+        if not os.path.exists(partition_path):
+            continue
+
+        with pyarrow.OSFile(partition_path, "rb") as source:
+            articles_df = pyarrow.ipc.open_stream(source).read_all().to_pandas()
+
+        # The articles of a journal come from several ID partitions, they are put back in order of merge
+        articles_df = articles_df.sort_values("position").drop(columns="position")
+        yield articles_df.set_index("id")
+
+
+def remove_spilled_articles(spilled_articles) -> None:
+    """
+    Removes the folder of spilled articles (`SpilledSources` or `SpilledArticles`), if any.
+    """
+    if spilled_articles is not None:
+        shutil.rmtree(spilled_articles.spill_dir, ignore_errors=True)
@@ -3,11 +3,23 @@ import pandas as pd
 from pandera.typing import DataFrame
 
 # Built-in packages
-from typing import Dict, List
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # My Custom packages
 from app.utils.my_logger import logger
-from app.src.graph_linkage.journal_mentions import JournalMentions
+from app.src.graph_linkage.journal_mentions import (
+    JournalMentions,
+    add_article_information_columns,
+    flush_link_warnings,
+    index_drug_names,
+    record_link_metrics,
+    reset_link_warnings,
+)
+from app.src.graph_linkage.drug_synonyms import DrugAliasMatcher
+import app.src.graph_linkage.checkpoints as CK
+import app.src.pandas_processing.spill as SP
+import app.utils.streaming_pipeline as SPL
 
 
 def merge_dataframes(list_dataframes: List) -> DataFrame:
@@ -22,8 +34,92 @@ def merge_rows(group):
     return group.ffill().bfill().iloc[0]
 
 
+def build_journal_graph(
+    journal_group: Tuple,
+    df_drugs_cleaned: DataFrame,
+    drug_matcher: Optional[DrugAliasMatcher] = None,
+    checkpoint_dir: Optional[str] = None,
+    drug_names_index: Optional[Dict] = None,
+) -> Dict:
+    """
+    Builds the graph of a journal from its name and articles, or loads it when a previous run already checkpointed it.
+    """
+    journal, df_articles_of_journal = journal_group
+
+    if checkpoint_dir is not None:
+        current_graph_dict = CK.load_journal_shard(checkpoint_dir, journal)
+        if current_graph_dict is not None:
+            logger.debug("Skipping {}, already written by a previous run", journal)
+            return current_graph_dict
+
+    logger.debug("Currently generating graph for {}", journal)
+
+    journal_instance = JournalMentions(
+        title=journal,
+        drugs_dataFrame=df_drugs_cleaned,
+        journal_articles_dataFrame=df_articles_of_journal,
+        drug_matcher=drug_matcher,
+        drug_names_index=drug_names_index,
+    )
+
+    current_graph_dict = journal_instance.generate_article_link_graph_dict()
+    if checkpoint_dir is not None:
+        CK.write_journal_shard(checkpoint_dir, current_graph_dict)
+    return current_graph_dict
+
+
+def iter_journal_graphs(
+    df_articles_cleaned: DataFrame,
+    df_drugs_cleaned: DataFrame,
+    drug_matcher: Optional[DrugAliasMatcher] = None,
+    checkpoint_dir: Optional[str] = None,
+    nb_workers: int = 0,
+) -> Iterator[Dict]:
+    """
+    Builds the graph of each journal of the articles, in order of first appearance. See `build_link_graph_from_df` for the arguments.
+    """
+    # Format the mention dates and article types once, instead of once per article
+    df_articles_cleaned = add_article_information_columns(df_articles_cleaned)
+    # Index the drug names once, instead of once per journal
+    drug_names_index = (
+        index_drug_names(df_drugs_cleaned) if drug_matcher is None else None
+    )
+
+    # Journals are grouped in order of first appearance, each group only slices the precomputed columns
+    journal_groups = df_articles_cleaned.groupby("journal", sort=False)
+    build_graph = partial(
+        build_journal_graph,
+        df_drugs_cleaned=df_drugs_cleaned,
+        drug_matcher=drug_matcher,
+        checkpoint_dir=checkpoint_dir,
+        drug_names_index=drug_names_index,
+    )
+
+    if nb_workers == 0:
+        yield from map(build_graph, journal_groups)
+    else:
+        # The journals are sliced, linked and consumed (written...) at the same time
+        yield from SPL.iter_pipeline(journal_groups, build_graph, nb_workers)
+
+
+def log_link_summary(journal_graphs: List, nb_articles: int) -> None:
+    """
+    Logs a single summary of the linking step, the messages of each journal and article are only logged at the DEBUG level.
+    """
+    logger.info(
+        f"[Link] - Linked {nb_articles} articles of {len(journal_graphs)} journals."
+    )
+    record_link_metrics(journal_graphs, nb_articles)
+    flush_link_warnings()
+
+
 def build_link_graph_from_df(
-    df_articles_cleaned: DataFrame, df_drugs_cleaned: DataFrame
+    df_articles_cleaned: DataFrame,
+    df_drugs_cleaned: DataFrame,
+    drug_matcher: Optional[DrugAliasMatcher] = None,
+    checkpoint_dir: Optional[str] = None,
+    nb_workers: int = 0,
+    journal_sink: Optional[Callable] = None,
 ) -> Dict:
     """
     Builds a link graph from cleaned article and drug DataFrames. Check the class functions' docstring for more details.
@@ -31,28 +127,48 @@ def build_link_graph_from_df(
     Args:
         - df_articles_cleaned (DataFrame): DataFrame containing cleaned article data.
         - df_drugs_cleaned (DataFrame): DataFrame containing cleaned drug data.
+        - drug_matcher (DrugAliasMatcher): Optional matcher of the drug names and synonyms, each mention then records the matched alias.
+        - checkpoint_dir (str): Optional folder where each completed journal is written. The journals already written there are loaded instead of being linked again.
+        - nb_workers (int): The number of threads linking the journals, in a streaming pipeline with a reader thread slicing the journals. By default (0), the journals are linked one after the other.
+        - journal_sink (Callable): Optional function called on the graph of each journal as soon as it is built, in the order of the graph (e.g. to write it).
 
     Returns:
         - Dict: A dictionary representing the link graph with journals and their related articles and drug mentions.
     """
-    # Get the list of all journals
-    list_distinct_journals = df_articles_cleaned["journal"].unique()
-
-    output_dict = {"journals": []}
-
-    for journal in list_distinct_journals:
-        logger.info(f"Currently generating graph for {journal}")
-        articles_of_journal_condition = df_articles_cleaned["journal"] == journal
-
-        df_articles_of_journal = df_articles_cleaned[articles_of_journal_condition]
-
-        journal_instance = JournalMentions(
-            title=journal,
-            drugs_dataFrame=df_drugs_cleaned,
-            journal_articles_dataFrame=df_articles_of_journal,
-        )
-
-        current_graph_dict = journal_instance.generate_article_link_graph_dict()
-        output_dict["journals"].append(current_graph_dict)
-
-    return output_dict
+    reset_link_warnings()
+    journal_graphs = []
+    for journal_graph in iter_journal_graphs(
+        df_articles_cleaned, df_drugs_cleaned, drug_matcher, checkpoint_dir, nb_workers
+    ):
+        if journal_sink is not None:
+            journal_sink(journal_graph)
+        journal_graphs.append(journal_graph)
+    log_link_summary(journal_graphs, len(df_articles_cleaned))
+
+    return {"journals": journal_graphs}
+
+
+def build_link_graph_from_spilled_articles(
+    spilled_articles: SP.SpilledArticles,
+    df_drugs_cleaned: DataFrame,
+    drug_matcher: Optional[DrugAliasMatcher] = None,
+    checkpoint_dir: Optional[str] = None,
+) -> Dict:
+    """
+    Same link graph as `build_link_graph_from_df`, built from the articles spilled to the disk by journal partitions.
+    Only one partition of articles is in memory at a time, the journals are then put back in order of first appearance.
+    """
+    reset_link_warnings()
+    journal_graphs = {}
+    nb_articles = 0
+
+    for df_articles_cleaned in SP.iter_spilled_partitions(spilled_articles):
+        nb_articles += len(df_articles_cleaned)
+        for journal_graph in iter_journal_graphs(
+            df_articles_cleaned, df_drugs_cleaned, drug_matcher, checkpoint_dir
+        ):
+            journal_graphs[journal_graph["title"]] = journal_graph
+    journal_graphs = [journal_graphs[journal] for journal in spilled_articles.journals]
+    log_link_summary(journal_graphs, nb_articles)
+
+    return {"journals": journal_graphs}
@@ -0,0 +1,162 @@
+# Third-party packages
+import polars as pl
+
+# Built-in packages
+from typing import Dict, List
+
+# My Custom packages
+import app.src.graph_linkage.article_ids as AI
+
+# Date formats found in the input files, tried in order (same day-first reading as the pandas backend)
+INPUT_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d %B %Y", "%d-%m-%Y"]
+
+
+def rename_column(lf: pl.LazyFrame, column_naming_mapping: Dict) -> pl.LazyFrame:
+    return lf.rename(column_naming_mapping)
+
+
+def normalize_dates_format(lf: pl.LazyFrame, date_column_name: str) -> pl.LazyFrame:
+    """
+    Parses the specified string column into a Date column. Each row is parsed with the first matching format of `INPUT_DATE_FORMATS`.
+
+    Parameters:
+        - lf (LazyFrame): LazyFrame containing the date column to be normalized.
+        - date_column_name (str): Name of the column containing dates to be standardized.
+
+    Returns:
+        - lf: LazyFrame with the date column cast as Date.
+    """
+    parsed_dates = [
+        pl.col(date_column_name).str.strptime(pl.Date, date_format, strict=False)
+        for date_format in INPUT_DATE_FORMATS
+    ]
+    return lf.with_columns(pl.coalesce(parsed_dates).alias(date_column_name))
+
+
+def merge_duplicate_rows(lf: pl.LazyFrame, keys: List) -> pl.LazyFrame:
+    """
+    Polars equivalent of grouping by `keys` then applying `app.src.pandas_processing.transform.merge_rows`.
+    Each column keeps the first non-null value of its group. Like pandas, rows with a null key are dropped and the output is sorted by key.
+
+    Parameters:
+        - lf (LazyFrame): LazyFrame of articles.
+        - keys (List): Columns identifying duplicate rows.
+
+    Returns:
+        - lf: LazyFrame with a single row per unique key.
+    """
+    other_columns = [name for name in lf.collect_schema().names() if name not in keys]
+
+    return (
+        lf.drop_nulls(subset=keys)
+        .group_by(keys)
+        .agg(pl.col(name).drop_nulls().first() for name in other_columns)
+        .sort(keys)
+    )
+
+
+def fill_in_missing_ids_int(lf: pl.LazyFrame, id_column_name: str) -> pl.LazyFrame:
+    """
+    Fill in missing integer IDs, numbering them after the current maximum ID in row order.
+
+    Parameters:
+        - lf (LazyFrame): LazyFrame to process
+        - id_column_name (str): Name of the column containing IDs. Should be numeric
+
+    Returns:
+        - lf: LazyFrame with missing IDs filled in
+    """
+    ids = pl.col(id_column_name).cast(pl.Int64, strict=False)
+
+    return lf.with_columns(
+        pl.when(ids.is_null())
+        .then(ids.max() + ids.is_null().cum_sum())
+        .otherwise(ids)
+        .alias(id_column_name)
+    )
+
+
+def fill_in_missing_ids_content_hash(
+    lf: pl.LazyFrame,
+    id_column_name: str,
+    title_column_name: str = "title",
+    date_column_name: str = "date",
+) -> pl.LazyFrame:
+    """
+    Polars equivalent of `app.src.pandas_processing.clean.fill_in_missing_ids_content_hash` : each missing ID is generated
+    from the title and date of its row only, so the IDs do not depend on the order of the rows nor on how they are streamed.
+
+    Returns:
+        - lf: LazyFrame with missing IDs filled in, as strings.
+    """
+    ids = pl.col(id_column_name).cast(pl.Int64, strict=False)
+    generated_ids = pl.struct(
+        pl.col(title_column_name),
+        pl.col(date_column_name).dt.strftime(AI.ID_DATE_FORMAT),
+    ).map_elements(
+        lambda article: AI.get_content_hash_id(
+            article[title_column_name], article[date_column_name]
+        ),
+        return_dtype=pl.String,
+    )
+
+    return lf.with_columns(
+        pl.when(ids.is_null())
+        .then(generated_ids)
+        .otherwise(ids.cast(pl.String))
+        .alias(id_column_name)
+    )
+
+
+def clean_titles(column_name: str) -> pl.Expr:
+    """
+    Expression equivalent of `app.src.pandas_processing.clean.clean_titles`, evaluated by polars on the whole column.
+
+    Args:
+        - column_name (str): The name of the article or journal title column.
+
+    Returns:
+        - Expr: The cleaned title column, null titles are replaced by empty strings.
+    """
+    return (
+        pl.col(column_name)
+        .str.replace_all(r"\\x[0-9a-fA-F]{2}", "")
+        .str.replace_all(r"[^\w\s&ÀàÀ-ÿ-]", "")
+        .str.to_titlecase()
+        .str.replace_all(r"\s+", " ")
+        .str.strip_chars()
+        .fill_null("")
+        .alias(column_name)
+    )
+
+
+def cast_id_as_string(lf: pl.LazyFrame, id_column_name: str) -> pl.LazyFrame:
+    return lf.with_columns(pl.col(id_column_name).cast(pl.String))
+
+
+def drop_empty_titles_and_journals(lf: pl.LazyFrame) -> pl.LazyFrame:
+    return lf.filter(
+        (pl.col("title") != "")
+        & pl.col("title").is_not_null()
+        & (pl.col("journal") != "")
+        & pl.col("journal").is_not_null()
+    )
+
+
+def drop_duplicate_ids(drugs_lf: pl.LazyFrame, all_articles_lf: pl.LazyFrame) -> List:
+    """
+    Drop duplicate IDs from the projects' LazyFrames, keeping the first occurrence and the row order.
+
+    Parameters:
+        - drugs_lf: LazyFrame containing drug data.
+        - all_articles_lf: LazyFrame containing all articles data.
+
+    Returns:
+        - A tuple containing the deduplicated drugs LazyFrame and articles LazyFrame.
+    """
+    drugs_lf = drugs_lf.unique(subset=["atccode"], keep="first", maintain_order=True)
+    all_articles_lf = all_articles_lf.unique(
+        subset=["id"], keep="first", maintain_order=True
+    )
+
+    return drugs_lf, all_articles_lf
@@ -0,0 +1,89 @@
+# Third-party packages
+import polars as pl
+
+# Built-in packages
+from typing import Dict, List
+
+# My custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as P
+import app.src.polars_processing.transform as T
+
+# Same default missing markers as `pd.read_csv()`, so both backends agree on what is null
+CSV_NULL_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+def load_lf_from_csv(filepath: str, delimiter: str = ",") -> pl.LazyFrame:
+    # Every column is read as a string, types are fixed later by the cleaning steps
+    return pl.scan_csv(
+        filepath,
+        separator=delimiter,
+        infer_schema=False,
+        null_values=CSV_NULL_VALUES,
+    )
+
+
+def load_lf_from_dict(records: List[Dict]) -> pl.LazyFrame:
+    # JSON records can mix types in the same column (ex: "id": 9 and "id": "11")
+    records_as_strings = [
+        {key: None if value is None else str(value) for key, value in record.items()}
+        for record in records
+    ]
+    return pl.LazyFrame(records_as_strings, infer_schema_length=None)
+
+
+def load_lf_from_json(filepath: str) -> pl.LazyFrame:
+    return load_lf_from_dict(P.import_json_file_as_dict(filepath))
+
+
+def load_input_data(paths: List) -> pl.LazyFrame:
+    """
+    Polars equivalent of `app.src.pandas_processing.load.load_input_data`.
+    Loads the project's input data from a list of file paths, merging multiple input files into a single LazyFrame.
+
+    Parameters:
+        - paths (List): A list of file paths containing data in CSV or JSON format.
+
+    Returns:
+        - lf: LazyFrame containing data from one or multiple input files, all columns typed as strings.
+    """
+    list_lfs = []
+
+    for path in paths:
+        if path.endswith(".csv"):
+            lf = load_lf_from_csv(path)
+
+        elif path.endswith(".json"):
+            lf = load_lf_from_json(path)
+
+        else:
+            raise Exception(
+                f"The provided path {path} has an incompatible file extension (not csv nor json)."
+            )
+
+        list_lfs.append(lf)
+
+    lf = T.merge_lazyframes(list_lfs)
+
+    logger.info(f"[Loading] - Successfully loaded and merged lazyframes from {paths}.")
+    return lf
@@ -0,0 +1,107 @@
+# Third-party packages
+import polars as pl
+
+# Built-in packages
+from typing import Dict, List, Optional
+
+# My Custom modules
+from app.utils.my_logger import logger
+import app.src.polars_processing.load as L
+import app.src.polars_processing.clean as C
+import app.src.polars_processing.transform as T
+import app.src.graph_linkage.journal_aliases as J
+import app.src.graph_linkage.drug_synonyms as DS
+
+
+def clean_lazyframes(
+    clinical_lf: pl.LazyFrame,
+    pubmed_lf: pl.LazyFrame,
+    drugs_lf: pl.LazyFrame,
+    missing_id_strategy: str = "sequential",
+) -> List:
+    """
+    Polars equivalent of `main.clean_dataframes`, the steps are applied in the same order.
+    Nothing is computed here, the steps are only added to the lazy query plans.
+    """
+    clinical_lf = C.rename_column(clinical_lf, {"scientific_title": "title"})
+    drugs_lf = C.rename_column(drugs_lf, {"drug": "name"})
+
+    clinical_lf = C.normalize_dates_format(clinical_lf, "date")
+    pubmed_lf = C.normalize_dates_format(pubmed_lf, "date")
+
+    clinical_lf = C.merge_duplicate_rows(clinical_lf, ["title", "date"])
+    pubmed_lf = C.merge_duplicate_rows(pubmed_lf, ["title", "date"])
+
+    if missing_id_strategy == "content_hash":
+        pubmed_lf = C.fill_in_missing_ids_content_hash(pubmed_lf, "id")
+    else:
+        pubmed_lf = C.fill_in_missing_ids_int(pubmed_lf, "id")
+
+    pubmed_lf = pubmed_lf.with_columns(
+        C.clean_titles("title"), C.clean_titles("journal")
+    )
+    clinical_lf = clinical_lf.with_columns(
+        C.clean_titles("title"), C.clean_titles("journal")
+    )
+    drugs_lf = drugs_lf.with_columns(C.clean_titles("name"))
+
+    pubmed_lf = C.cast_id_as_string(pubmed_lf, "id")
+    clinical_lf = C.cast_id_as_string(clinical_lf, "id")
+
+    return clinical_lf, pubmed_lf, drugs_lf
+
+
+def build_graph_link(
+    clinical_trials_path: List,
+    pubmed_paths: List,
+    drugs_paths: List,
+    journal_aliases_path: Optional[str] = None,
+    drug_synonyms_path: Optional[str] = None,
+    missing_id_strategy: str = "sequential",
+) -> Dict:
+    """
+    Runs the load -> clean -> dedup -> link steps with polars and returns the link graph.
+    The query plans stay lazy until the link step, so polars can optimize and parallelize them as a whole.
+    When a journal aliases path is provided, near-duplicate journal names are merged like in the pandas backend.
+    When a drug synonyms path is provided, the drugs are also matched by their synonyms like in the pandas backend.
+    The missing pubmed IDs are numbered after the maximum ID (`sequential`) or generated from each article (`content_hash`).
+    """
+    clinical_lf = L.load_input_data(clinical_trials_path)
+    pubmed_lf = L.load_input_data(pubmed_paths)
+    drugs_lf = L.load_input_data(drugs_paths)
+
+    clinical_lf, pubmed_lf, drugs_lf = clean_lazyframes(
+        clinical_lf, pubmed_lf, drugs_lf, missing_id_strategy
+    )
+
+    pubmed_lf = pubmed_lf.with_columns(pl.lit("PubMed").alias("article_type"))
+    clinical_lf = clinical_lf.with_columns(
+        pl.lit("ClinicalTrial").alias("article_type")
+    )
+
+    all_articles_lf = T.merge_lazyframes([pubmed_lf, clinical_lf])
+
+    if journal_aliases_path is not None:
+        # Only the journal column is computed here, the alias map is then applied lazily
+        journal_names = all_articles_lf.select("journal").collect()["journal"]
+        journal_alias_map = J.canonicalize_journal_names(
+            journal_names, journal_aliases_path
+        )
+        all_articles_lf = all_articles_lf.with_columns(
+            pl.col("journal").replace(journal_alias_map)
+        )
+    all_articles_lf = C.drop_empty_titles_and_journals(all_articles_lf)
+    drugs_lf, all_articles_lf = C.drop_duplicate_ids(drugs_lf, all_articles_lf)
+    logger.info("[Cleaning] - Successfully planned the polars cleaning steps.")
+
+    drug_matcher = None
+    if drug_synonyms_path is not None:
+        drugs_df = drugs_lf.collect()
+        drugs_lf = drugs_df.lazy()
+        drug_matcher = DS.build_drug_alias_matcher(
+            drugs_df["atccode"],
+            drugs_df["name"],
+            DS.load_drug_synonyms(drug_synonyms_path),
+        )
+
+    return T.build_link_graph_from_lf(all_articles_lf, drugs_lf, drug_matcher)
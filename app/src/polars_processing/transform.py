@@ -0,0 +1,124 @@
+# Third-party packages
+import polars as pl
+
+# Built-in packages
+from typing import Dict, List, Optional
+
+# My Custom packages
+from app.utils.my_logger import logger
+from app.src.graph_linkage.drug_synonyms import DrugAliasMatcher
+from app.src.graph_linkage.journal_mentions import record_link_metrics
+
+
+def merge_lazyframes(list_lazyframes: List) -> pl.LazyFrame:
+    return pl.concat(list_lazyframes, how="diagonal")
+
+
+def find_mentions_with_matcher(
+    articles_lf: pl.LazyFrame, drug_matcher: DrugAliasMatcher
+) -> pl.LazyFrame:
+    """
+    Replaces the words join when drug synonyms are provided, since an alias can span several words.
+    Each title is matched with the drug matcher, then exploded into one row per mentioned drug.
+    """
+    mention = pl.col("mention")
+
+    return (
+        articles_lf.with_columns(
+            pl.col("title")
+            .map_elements(
+                drug_matcher.find_drugs, return_dtype=pl.List(pl.List(pl.String))
+            )
+            .alias("mention")
+        )
+        .explode("mention")
+        .drop_nulls("mention")
+        .select(
+            pl.col("journal"),
+            pl.col("article_type"),
+            pl.col("id").alias("articleId"),
+            pl.col("title").alias("articleTitle"),
+            pl.col("date").dt.strftime("%Y-%m-%d").alias("mentionDate"),
+            mention.list.get(0).alias("mentionedDrugID"),
+            mention.list.get(1).alias("mentionedDrugName"),
+            mention.list.get(2).alias("matchedAlias"),
+        )
+    )
+
+
+def build_link_graph_from_lf(
+    lf_articles_cleaned: pl.LazyFrame,
+    lf_drugs_cleaned: pl.LazyFrame,
+    drug_matcher: Optional[DrugAliasMatcher] = None,
+) -> Dict:
+    """
+    Polars equivalent of `app.src.pandas_processing.transform.build_link_graph_from_df`.
+    Instead of looping over journals and drugs, the titles are split into words and joined with the drug names in a single query.
+    Journals, articles and drugs keep the same order as the pandas backend, so both outputs are identical.
+
+    Args:
+        - lf_articles_cleaned (LazyFrame): LazyFrame containing cleaned and deduplicated article data.
+        - lf_drugs_cleaned (LazyFrame): LazyFrame containing cleaned and deduplicated drug data.
+        - drug_matcher (DrugAliasMatcher): Optional matcher of the drug names and synonyms, each mention then records the matched alias.
+
+    Returns:
+        - Dict: A dictionary representing the link graph with journals and their related articles and drug mentions.
+    """
+    articles_lf = lf_articles_cleaned.with_row_index("article_position")
+    drugs_lf = lf_drugs_cleaned.with_row_index("drug_position")
+
+    if drug_matcher is not None:
+        mentions_lf = find_mentions_with_matcher(articles_lf, drug_matcher)
+    else:
+        mentions_lf = (
+            articles_lf.with_columns(pl.col("title").str.split(" ").alias("word"))
+            .explode("word")
+            .join(drugs_lf, left_on="word", right_on="name")
+            .unique(subset=["article_position", "drug_position"])
+            .sort(["article_position", "drug_position"])
+            .select(
+                pl.col("journal"),
+                pl.col("article_type"),
+                pl.col("id").alias("articleId"),
+                pl.col("title").alias("articleTitle"),
+                pl.col("date").dt.strftime("%Y-%m-%d").alias("mentionDate"),
+                pl.col("atccode").alias("mentionedDrugID"),
+                pl.col("word").alias("mentionedDrugName"),
+            )
+        )
+
+    # Journals without any drug mention are still part of the graph
+    journals_lf = articles_lf.select(pl.col("journal").unique(maintain_order=True))
+    nb_articles_lf = articles_lf.select(pl.len())
+    list_distinct_journals, mentions_df, nb_articles_df = pl.collect_all(
+        [journals_lf, mentions_lf, nb_articles_lf]
+    )
+
+    journals_mapping = {
+        journal: {
+            "title": journal,
+            "referencedBy": {"pubmedArticles": [], "clinicalTrials": []},
+        }
+        for journal in list_distinct_journals["journal"]
+    }
+
+    for mention in mentions_df.iter_rows(named=True):
+        journal = mention.pop("journal")
+        article_type = mention.pop("article_type")
+
+        if article_type == "PubMed":
+            journals_mapping[journal]["referencedBy"]["pubmedArticles"].append(mention)
+        elif article_type == "ClinicalTrial":
+            journals_mapping[journal]["referencedBy"]["clinicalTrials"].append(mention)
+        else:
+            raise Exception(
+                f"Something went wrong, the article {mention['articleTitle']} is neither clinical nor pubmed"
+            )
+
+    logger.info(
+        f"[Transform] - Generated graph for {len(journals_mapping)} journals and {mentions_df.height} drug mentions."
+    )
+    journal_graphs = list(journals_mapping.values())
+    record_link_metrics(journal_graphs, nb_articles_df.item())
+
+    return {"journals": journal_graphs}
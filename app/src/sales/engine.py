@@ -0,0 +1,188 @@
+# Built-in packages
+import os
+import shutil
+import sqlite3
+from typing import Any, Dict
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.src.sales.generate as G
+
+SALES_ENGINES = ["sqlite", "duckdb"]
+TABLE_LAYOUTS = ["unsorted", "sorted_by_date", "indexed", "partitioned_parquet"]
+
+TRANSACTIONS_COLUMNS = {
+    "date": "DATE",
+    "order_id": "BIGINT",
+    "client_id": "BIGINT",
+    "prod_id": "BIGINT",
+    "prod_price": "DOUBLE",
+    "prod_qty": "BIGINT",
+}
+
+PRODUCT_NOMENCLATURE_COLUMNS = {
+    "product_id": "BIGINT",
+    "product_type": "VARCHAR",
+    "product_name": "VARCHAR",
+}
+
+
+def connect(engine: str, db_path: str = ":memory:") -> Any:
+    """
+    Opens a connection to the embedded SQL engine used to run the sales queries locally.
+    DuckDB is optional and only imported when selected.
+
+    Parameters:
+        - engine (str): Either sqlite or duckdb.
+        - db_path (str): Path of the database file, ":memory:" keeps everything in RAM.
+
+    Returns:
+        - connection: A DB-API connection to the engine.
+    """
+    if engine == "sqlite":
+        return sqlite3.connect(db_path)
+
+    elif engine == "duckdb":
+        try:
+            import duckdb
+        except ImportError as error:
+            raise ImportError(
+                "The duckdb engine requires the `duckdb` package, install it with `pip install duckdb`."
+            ) from error
+
+        return duckdb.connect(db_path)
+
+    raise ValueError(
+        f"The engine {engine} is not supported (allowed values: {', '.join(SALES_ENGINES)})."
+    )
+
+
+def create_table(connection: Any, table_name: str, columns: Dict) -> None:
+    columns_definition = ", ".join(
+        f"{name} {column_type}" for name, column_type in columns.items()
+    )
+    connection.execute(f"DROP TABLE IF EXISTS {table_name}")
+    connection.execute(f"CREATE TABLE {table_name} ({columns_definition})")
+
+
+def insert_rows(connection: Any, engine: str, table_name: str, df) -> None:
+    """
+    Appends the rows of a DataFrame to a table, using the fastest bulk path of each engine.
+    """
+    if engine == "duckdb":
+        connection.register("rows_to_insert", df)
+        connection.execute(f"INSERT INTO {table_name} SELECT * FROM rows_to_insert")
+        connection.unregister("rows_to_insert")
+    else:
+        placeholders = ", ".join("?" for _ in df.columns)
+        connection.executemany(
+            f"INSERT INTO {table_name} VALUES ({placeholders})",
+            df.itertuples(index=False, name=None),
+        )
+
+
+def apply_table_layout(
+    connection: Any, engine: str, layout: str, work_dir: str = "output/sales"
+) -> None:
+    """
+    Changes the physical layout of the TRANSACTIONS table, so the same queries can be benchmarked on each layout.
+
+    Layouts:
+        - unsorted: rows are kept in generation order (random dates).
+        - sorted_by_date: the table is rewritten sorted by date, so date filters read contiguous blocks.
+        - indexed: indexes on TRANSACTIONS(date), TRANSACTIONS(prod_id) and PRODUCT_NOMENCLATURE(product_id).
+        - partitioned_parquet: (duckdb only) the table is exported as Parquet files partitioned by year and month, then read back through a view.
+    """
+    if layout == "unsorted":
+        return
+
+    elif layout == "sorted_by_date":
+        connection.execute(
+            "CREATE TABLE TRANSACTIONS_SORTED AS SELECT * FROM TRANSACTIONS ORDER BY date"
+        )
+        connection.execute("DROP TABLE TRANSACTIONS")
+        connection.execute("ALTER TABLE TRANSACTIONS_SORTED RENAME TO TRANSACTIONS")
+
+    elif layout == "indexed":
+        connection.execute("CREATE INDEX idx_transactions_date ON TRANSACTIONS (date)")
+        connection.execute(
+            "CREATE INDEX idx_transactions_prod_id ON TRANSACTIONS (prod_id)"
+        )
+        connection.execute(
+            "CREATE INDEX idx_product_nomenclature_product_id ON PRODUCT_NOMENCLATURE (product_id)"
+        )
+
+    elif layout == "partitioned_parquet":
+        if engine != "duckdb":
+            raise ValueError(
+                "The partitioned_parquet layout requires the duckdb engine."
+            )
+
+        parquet_dir = os.path.join(work_dir, "transactions_parquet")
+        shutil.rmtree(parquet_dir, ignore_errors=True)
+        os.makedirs(work_dir, exist_ok=True)
+
+        connection.execute(f"""
+            COPY (
+                SELECT *, year(date) AS year, month(date) AS month
+                FROM TRANSACTIONS
+                ORDER BY date
+            ) TO '{parquet_dir}' (FORMAT PARQUET, PARTITION_BY (year, month))
+            """)
+        connection.execute("DROP TABLE TRANSACTIONS")
+        connection.execute(f"""
+            CREATE VIEW TRANSACTIONS AS
+            SELECT {', '.join(TRANSACTIONS_COLUMNS)}
+            FROM read_parquet('{parquet_dir}/**/*.parquet', hive_partitioning = true)
+            """)
+
+    else:
+        raise ValueError(
+            f"The layout {layout} is not supported (allowed values: {', '.join(TABLE_LAYOUTS)})."
+        )
+
+    logger.info(f"[Sales] - Applied the {layout} layout to TRANSACTIONS.")
+
+
+def create_sales_tables(
+    connection: Any,
+    engine: str,
+    nb_transactions: int,
+    nb_clients: int = 10_000,
+    nb_products: int = 1_000,
+    layout: str = "unsorted",
+    seed: int = 0,
+) -> None:
+    """
+    Creates and fills the TRANSACTIONS and PRODUCT_NOMENCLATURE tables with synthetic data, then applies the requested layout.
+
+    Parameters:
+        - connection: Connection returned by `connect`.
+        - engine (str): Either sqlite or duckdb.
+        - nb_transactions (int): Number of transactions to generate (tested up to 100M with duckdb).
+        - nb_clients (int): Number of distinct clients.
+        - nb_products (int): Number of distinct products.
+        - layout (str): Physical layout of TRANSACTIONS, see `apply_table_layout`.
+        - seed (int): Seed of the random generator.
+    """
+    create_table(connection, "PRODUCT_NOMENCLATURE", PRODUCT_NOMENCLATURE_COLUMNS)
+    insert_rows(
+        connection,
+        engine,
+        "PRODUCT_NOMENCLATURE",
+        G.generate_product_nomenclature(nb_products, seed=seed),
+    )
+
+    create_table(connection, "TRANSACTIONS", TRANSACTIONS_COLUMNS)
+    for transactions_chunk in G.generate_transactions(
+        nb_transactions, nb_clients, nb_products, seed=seed
+    ):
+        insert_rows(connection, engine, "TRANSACTIONS", transactions_chunk)
+
+    connection.commit()
+    logger.info(
+        f"[Sales] - Generated {nb_transactions} transactions for {nb_clients} clients and {nb_products} products."
+    )
+
+    apply_table_layout(connection, engine, layout)
+    connection.commit()
@@ -0,0 +1,79 @@
+# Third-party packages
+import numpy as np
+import pandas as pd
+from pandera.typing import DataFrame
+
+# Built-in packages
+from typing import Iterator
+
+PRODUCT_TYPES = ["MEUBLE", "DECO"]
+
+
+def generate_product_nomenclature(nb_products: int, seed: int = 0) -> DataFrame:
+    """
+    Generates a synthetic PRODUCT_NOMENCLATURE table (product_id, product_type, product_name).
+
+    Parameters:
+        - nb_products (int): Number of products in the catalogue.
+        - seed (int): Seed of the random generator, the same seed always gives the same table.
+
+    Returns:
+        - df: DataFrame of products.
+    """
+    rng = np.random.default_rng(seed)
+    product_ids = np.arange(1, nb_products + 1)
+
+    return pd.DataFrame(
+        {
+            "product_id": product_ids,
+            "product_type": rng.choice(PRODUCT_TYPES, size=nb_products),
+            "product_name": [f"Product {product_id}" for product_id in product_ids],
+        }
+    )
+
+
+def generate_transactions(
+    nb_transactions: int,
+    nb_clients: int,
+    nb_products: int,
+    start_date: str = "2018-07-01",
+    end_date: str = "2020-06-30",
+    chunk_size: int = 1_000_000,
+    seed: int = 0,
+) -> Iterator[DataFrame]:
+    """
+    Generates a synthetic TRANSACTIONS table (date, order_id, client_id, prod_id, prod_price, prod_qty) in chunks.
+    The dates are drawn uniformly around 2019 so the `BETWEEN` filters of the sales queries keep only part of the rows.
+    Chunks are generated one at a time so tables of 100M rows never need to fit in memory.
+
+    Parameters:
+        - nb_transactions (int): Total number of transactions to generate.
+        - nb_clients (int): Number of distinct clients.
+        - nb_products (int): Number of distinct products (must match the nomenclature).
+        - start_date (str): First possible transaction date (%Y-%m-%d).
+        - end_date (str): Last possible transaction date (%Y-%m-%d).
+        - chunk_size (int): Maximum number of rows per yielded chunk.
+        - seed (int): Seed of the random generator.
+
+    Returns:
+        - Iterator: DataFrames of at most `chunk_size` transactions, dates formatted as %Y-%m-%d strings.
+    """
+    rng = np.random.default_rng(seed)
+    first_day = np.datetime64(start_date, "D")
+    nb_days = (np.datetime64(end_date, "D") - first_day).astype(int) + 1
+
+    for chunk_start in range(0, nb_transactions, chunk_size):
+        current_size = min(chunk_size, nb_transactions - chunk_start)
+
+        dates = first_day + rng.integers(0, nb_days, size=current_size)
+
+        yield pd.DataFrame(
+            {
+                "date": np.datetime_as_string(dates, unit="D"),
+                "order_id": np.arange(chunk_start + 1, chunk_start + 1 + current_size),
+                "client_id": rng.integers(1, nb_clients + 1, size=current_size),
+                "prod_id": rng.integers(1, nb_products + 1, size=current_size),
+                "prod_price": np.round(rng.uniform(1, 500, size=current_size), 2),
+                "prod_qty": rng.integers(1, 10, size=current_size),
+            }
+        )
@@ -0,0 +1,80 @@
+# Built-in packages
+import os
+import re
+import statistics
+import time
+from typing import Any, Dict, List
+
+# My Custom packages
+from app.utils.my_logger import logger
+
+SQL_FOLDER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "sql"
+)
+SALES_QUERIES = ["query_1_sales_by_day", "query_2_sales_by_product_type"]
+
+
+def rewrite_bigquery_sql(query: str) -> str:
+    """
+    Rewrites the BigQuery notation of the `sql/` queries so they run on SQLite and DuckDB.
+        - `dataset.TABLE` backtick references become plain table names.
+        - "double quoted" string literals become 'single quoted' ones (double quotes are identifiers in standard SQL).
+    """
+    query = re.sub(r"`(?:[\w-]+\.)*(\w+)`", r"\1", query)
+    query = re.sub(r'"([^"]*)"', r"'\1'", query)
+    return query
+
+
+def load_sales_query(query_name: str, sql_folder: str = SQL_FOLDER) -> str:
+    with open(
+        os.path.join(sql_folder, f"{query_name}.sql"), "r", encoding="utf-8"
+    ) as hd:
+        return rewrite_bigquery_sql(hd.read())
+
+
+def time_query(connection: Any, query: str, nb_runs: int = 3) -> Dict:
+    """
+    Runs a query multiple times and measures its latency (fetching all rows is included).
+
+    Parameters:
+        - connection: Connection to the engine holding the sales tables.
+        - query (str): The query to run.
+        - nb_runs (int): Number of timed runs.
+
+    Returns:
+        - Dict: Number of rows returned, min and median latency in seconds.
+    """
+    latencies = []
+
+    for _ in range(nb_runs):
+        start = time.perf_counter()
+        rows = connection.execute(query).fetchall()
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "nb_rows": len(rows),
+        "min_seconds": min(latencies),
+        "median_seconds": statistics.median(latencies),
+    }
+
+
+def benchmark_sales_queries(
+    connection: Any, query_names: List = SALES_QUERIES, nb_runs: int = 3
+) -> Dict:
+    """
+    Times every sales query of the `sql/` folder against the given connection.
+
+    Returns:
+        - Dict: Query name -> timings, see `time_query`.
+    """
+    results = {}
+
+    for query_name in query_names:
+        results[query_name] = time_query(
+            connection, load_sales_query(query_name), nb_runs
+        )
+        logger.info(
+            f"[Sales] - {query_name} returned {results[query_name]['nb_rows']} rows, min {results[query_name]['min_seconds']:.4f}s, median {results[query_name]['median_seconds']:.4f}s over {nb_runs} runs."
+        )
+
+    return results
@@ -0,0 +1,142 @@
+# Built-in packages
+import math
+from typing import Any, Dict
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.src.sales.engine as E
+import app.src.sales.queries as Q
+
+SALES_BY_DATE_COLUMNS = {"date": "DATE", "ventes": "DOUBLE"}
+
+SALES_BY_CLIENT_PRODUCT_TYPE_COLUMNS = {
+    "date": "DATE",
+    "client_id": "BIGINT",
+    "product_type": "VARCHAR",
+    "ventes": "DOUBLE",
+}
+
+# Rollup tables and the transactions query each of them aggregates, for a range of days
+ROLLUP_TABLES = {
+    "SALES_BY_DATE": (
+        SALES_BY_DATE_COLUMNS,
+        """
+        SELECT
+            date,
+            SUM(prod_price * prod_qty) AS ventes
+        FROM
+            TRANSACTIONS
+        WHERE
+            date BETWEEN ? AND ?
+        GROUP BY
+            date
+        """,
+    ),
+    "SALES_BY_CLIENT_PRODUCT_TYPE": (
+        SALES_BY_CLIENT_PRODUCT_TYPE_COLUMNS,
+        """
+        SELECT
+            t.date,
+            t.client_id,
+            pn.product_type,
+            SUM(t.prod_price * t.prod_qty) AS ventes
+        FROM
+            TRANSACTIONS AS t
+        LEFT JOIN PRODUCT_NOMENCLATURE AS pn ON t.prod_id = pn.product_id
+        WHERE
+            t.date BETWEEN ? AND ?
+        GROUP BY
+            t.date,
+            t.client_id,
+            pn.product_type
+        """,
+    ),
+}
+
+# Sales queries of the `sql/` folder and their equivalent reading the rollups
+ROLLUP_QUERIES = {
+    "query_1_sales_by_day": "query_1_sales_by_day_from_rollup",
+    "query_2_sales_by_product_type": "query_2_sales_by_product_type_from_rollup",
+}
+
+
+def create_rollup_tables(connection: Any) -> None:
+    """
+    Creates the empty daily rollup tables. Existing rollups are dropped.
+    """
+    for table_name, (columns, _) in ROLLUP_TABLES.items():
+        E.create_table(connection, table_name, columns)
+
+    connection.commit()
+
+
+def update_rollups(connection: Any, start_date: str, end_date: str) -> Dict:
+    """
+    Aggregates the transactions of the given days into the rollup tables. Meant to be run once a day on the new day.
+    The days are first removed from the rollups, so re-running the job on the same days does not count sales twice.
+    Note that the product type is frozen in the rollup when the day is aggregated, re-run the job on past days if the nomenclature changes.
+
+    Parameters:
+        - connection: Connection holding the TRANSACTIONS, PRODUCT_NOMENCLATURE and rollup tables.
+        - start_date (str): First day to aggregate (%Y-%m-%d).
+        - end_date (str): Last day to aggregate (%Y-%m-%d), use the same value as start_date for a single day.
+
+    Returns:
+        - Dict: Rollup table name -> number of rows it contains for the given days.
+    """
+    nb_rows_mapping = {}
+
+    for table_name, (columns, aggregation_query) in ROLLUP_TABLES.items():
+        connection.execute(
+            f"DELETE FROM {table_name} WHERE date BETWEEN ? AND ?",
+            [start_date, end_date],
+        )
+        connection.execute(
+            f"INSERT INTO {table_name} ({', '.join(columns)}) {aggregation_query}",
+            [start_date, end_date],
+        )
+        nb_rows_mapping[table_name] = connection.execute(
+            f"SELECT COUNT(*) FROM {table_name} WHERE date BETWEEN ? AND ?",
+            [start_date, end_date],
+        ).fetchone()[0]
+
+    connection.commit()
+
+    logger.info(
+        f"[Sales] - Updated the rollups from {start_date} to {end_date} : {nb_rows_mapping}."
+    )
+    return nb_rows_mapping
+
+
+def check_rollup_queries(connection: Any, rel_tol: float = 1e-9) -> Dict:
+    """
+    Checks that every rollup query returns the same rows as the raw query it replaces.
+    Sales are compared with a relative tolerance, since summing daily rollups changes the order of the float additions.
+
+    Returns:
+        - Dict: Raw query name -> True if both queries return the same rows.
+    """
+    checks_mapping = {}
+
+    for query_name, rollup_query_name in ROLLUP_QUERIES.items():
+        raw_rows = sorted(connection.execute(Q.load_sales_query(query_name)).fetchall())
+        rollup_rows = sorted(
+            connection.execute(Q.load_sales_query(rollup_query_name)).fetchall()
+        )
+
+        checks_mapping[query_name] = len(raw_rows) == len(rollup_rows) and all(
+            raw_value == rollup_value
+            or (
+                isinstance(raw_value, float)
+                and math.isclose(raw_value, rollup_value, rel_tol=rel_tol)
+            )
+            for raw_row, rollup_row in zip(raw_rows, rollup_rows)
+            for raw_value, rollup_value in zip(raw_row, rollup_row)
+        )
+
+        if not checks_mapping[query_name]:
+            logger.warning(
+                f"[Sales] - {rollup_query_name} does not return the same rows as {query_name}."
+            )
+
+    return checks_mapping
@@ -0,0 +1,67 @@
+# Built-in packages
+import importlib.util
+import unittest
+
+# My Custom packages
+from app.main import GRAPH_LINK_BACKENDS, get_graph_link_builder
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+    OUTPUT_PATH,
+)
+from app.utils.files_processing import import_json_file_as_dict
+
+
+class TestBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The committed output is the golden graph every backend must reproduce
+        cls.expected_graph = import_json_file_as_dict(OUTPUT_PATH)
+
+    def assert_backend_matches_golden_output(self, backend: str):
+        build_graph_link = get_graph_link_builder(backend)
+
+        result_graph = build_graph_link(
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        )
+
+        self.assertEqual(result_graph, self.expected_graph)
+
+    def test_pandas_backend_matches_golden_output(self):
+        self.assert_backend_matches_golden_output("pandas")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"), "The polars package is not installed"
+    )
+    def test_polars_backend_matches_golden_output(self):
+        self.assert_backend_matches_golden_output("polars")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"), "The polars package is not installed"
+    )
+    def test_content_hash_ids_match_across_backends(self):
+        graphs = [
+            get_graph_link_builder(backend)(
+                CLINICAL_TRIALS_PATHS.split(";"),
+                PUBMED_PATHS.split(";"),
+                DRUGS_PATHS.split(";"),
+                missing_id_strategy="content_hash",
+            )
+            for backend in GRAPH_LINK_BACKENDS
+        ]
+
+        self.assertEqual(graphs[0], graphs[1])
+        self.assertNotEqual(graphs[0], self.expected_graph)
+
+    def test_unknown_backend_raises(self):
+        self.assertNotIn("spark", GRAPH_LINK_BACKENDS)
+
+        with self.assertRaises(ValueError):
+            get_graph_link_builder("spark")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# Built-in packages
+import filecmp
+import os
+import shutil
+import unittest
+
+# My Custom packages
+from app.main import build_graph_link_with_pandas, generate_graph_link
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+    OUTPUT_PATH,
+)
+import app.src.graph_linkage.checkpoints as CK
+from app.utils.files_processing import import_json_file_as_dict
+
+TEST_FOLDER = "output/test_checkpoints"
+
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+        self.checkpoint_dir = os.path.join(TEST_FOLDER, "checkpoints")
+        self.output_path = os.path.join(TEST_FOLDER, "graph_link.json")
+        # Same fingerprint as generate_graph_link with its default options
+        self.fingerprint = CK.get_inputs_fingerprint(
+            sum(self.input_paths, []),
+            {
+                "journal_aliases_path": None,
+                "drug_synonyms_path": None,
+                "missing_id_strategy": "sequential",
+            },
+        )
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def interrupt_run_then_edit_shard(self) -> str:
+        """
+        Writes the shards of every journal like an interrupted run, then edits the shard of the first journal.
+        """
+        CK.open_checkpoint_dir(self.checkpoint_dir, self.fingerprint, resume=False)
+        graph = build_graph_link_with_pandas(
+            *self.input_paths, checkpoint_dir=self.checkpoint_dir
+        )
+
+        journal_graph = graph["journals"][0]
+        journal_graph["referencedBy"]["pubmedArticles"] = []
+        CK.write_journal_shard(self.checkpoint_dir, journal_graph)
+
+        return journal_graph["title"]
+
+    def test_assembled_graph_matches_golden_output(self):
+        # The committed graph is pretty printed
+        generate_graph_link(
+            *self.input_paths,
+            output_path=self.output_path,
+            temporal_index_path=None,
+            checkpoint_dir=self.checkpoint_dir,
+            pretty=True,
+        )
+
+        self.assertTrue(filecmp.cmp(self.output_path, OUTPUT_PATH, shallow=False))
+        self.assertFalse(os.path.exists(self.checkpoint_dir))
+
+    def test_compact_assembled_graph_matches_written_graph(self):
+        compact_output_path = os.path.join(TEST_FOLDER, "compact_graph_link.json")
+        generate_graph_link(
+            *self.input_paths, output_path=compact_output_path, temporal_index_path=None
+        )
+        generate_graph_link(
+            *self.input_paths,
+            output_path=self.output_path,
+            temporal_index_path=None,
+            checkpoint_dir=self.checkpoint_dir,
+        )
+
+        self.assertTrue(
+            filecmp.cmp(self.output_path, compact_output_path, shallow=False)
+        )
+
+    def test_resume_skips_written_journals(self):
+        journal = self.interrupt_run_then_edit_shard()
+
+        generate_graph_link(
+            *self.input_paths,
+            output_path=self.output_path,
+            temporal_index_path=None,
+            checkpoint_dir=self.checkpoint_dir,
+            resume=True,
+        )
+
+        graph = import_json_file_as_dict(self.output_path)
+        self.assertEqual(graph["journals"][0]["title"], journal)
+        self.assertEqual(graph["journals"][0]["referencedBy"]["pubmedArticles"], [])
+
+    def test_shards_of_other_inputs_are_not_reused(self):
+        self.interrupt_run_then_edit_shard()
+        CK.open_checkpoint_dir(self.checkpoint_dir, "other inputs", resume=True)
+
+        self.assertEqual(os.listdir(self.checkpoint_dir), [CK.FINGERPRINT_FILENAME])
+
+    def test_refuses_folder_that_is_not_a_checkpoint_folder(self):
+        os.makedirs(self.checkpoint_dir)
+        user_file_path = os.path.join(self.checkpoint_dir, "notes.txt")
+        with open(user_file_path, "w", encoding="utf-8") as hd:
+            hd.write("not a shard")
+
+        with self.assertRaises(ValueError):
+            CK.open_checkpoint_dir(self.checkpoint_dir, self.fingerprint, resume=False)
+        self.assertTrue(os.path.exists(user_file_path))
+
+    def test_remove_only_deletes_the_checkpoint_files(self):
+        self.interrupt_run_then_edit_shard()
+        user_file_path = os.path.join(self.checkpoint_dir, "notes.txt")
+        with open(user_file_path, "w", encoding="utf-8") as hd:
+            hd.write("added after the run started")
+
+        CK.remove_checkpoint_dir(self.checkpoint_dir)
+
+        self.assertEqual(os.listdir(self.checkpoint_dir), ["notes.txt"])
+
+    def test_empty_graph(self):
+        os.makedirs(self.checkpoint_dir)
+        CK.assemble_graph_from_shards(self.checkpoint_dir, [], self.output_path)
+
+        self.assertEqual(import_json_file_as_dict(self.output_path), {"journals": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
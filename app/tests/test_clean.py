@@ -4,17 +4,26 @@ import pandas as pd
 from pandas.testing import assert_frame_equal, assert_series_equal
 
 # Built-in packages
+import tracemalloc
 import unittest
 from datetime import datetime
 
 # My Custom packages
+from app.main import clean_dataframes
 from app.src.pandas_processing.clean import (
     normalize_dates_format,
     clean_titles,
     fill_in_missing_ids_int,
     drop_empty_titles_and_journals,
+    cast_id_as_string,
+    drop_duplicate_ids_then_index_df,
+    fill_in_missing_ids_content_hash,
 )
 
+# Memory allocated by clean_dataframes at its peak, in number of copies of its input dataframes.
+# The cleaned titles and journals are new strings, so a bit less than one copy is expected.
+MAX_CLEANING_COPIES = 1.5
+
 
 class TestClean(unittest.TestCase):
     @classmethod
@@ -123,6 +132,25 @@ class TestClean(unittest.TestCase):
         # Assertions
         assert_series_equal(result_df["id"], self.expected_df["id"])
 
+    def test_content_hash_ids_do_not_depend_on_order_or_chunks(self):
+        input_df = normalize_dates_format(self.input_df, "date", "%Y-%m-%d")
+
+        result_df = fill_in_missing_ids_content_hash(input_df, "id")
+        shuffled_df = fill_in_missing_ids_content_hash(input_df.iloc[::-1], "id")
+        chunked_df = pd.concat(
+            [
+                fill_in_missing_ids_content_hash(input_df.iloc[:4], "id"),
+                fill_in_missing_ids_content_hash(input_df.iloc[4:], "id"),
+            ]
+        )
+
+        # The existing IDs are kept, the missing ones are generated
+        self.assertEqual(result_df["id"].tolist()[:3], ["1", "2", "3"])
+        self.assertRegex(result_df["id"][3], r"^H[0-9a-f]{16}$")
+        self.assertNotEqual(result_df["id"][3], result_df["id"][5])
+        assert_series_equal(shuffled_df["id"].sort_index(), result_df["id"])
+        assert_series_equal(chunked_df["id"], result_df["id"])
+
     def test_dropping_empty_titles_journals_only(self):
         # Expected output
         expected_data = {
@@ -154,6 +182,62 @@ class TestClean(unittest.TestCase):
         # Assertions
         assert_frame_equal(result_df, expected_df)
 
+    def test_cleaning_functions_do_not_modify_their_input(self):
+        cleaning_functions = [
+            lambda df: normalize_dates_format(df, "date", "%Y-%m-%d"),
+            lambda df: fill_in_missing_ids_int(df, "id"),
+            lambda df: cast_id_as_string(df, "id"),
+            drop_empty_titles_and_journals,
+            lambda df: drop_duplicate_ids_then_index_df(df, "journal"),
+        ]
+
+        for cleaning_function in cleaning_functions:
+            with self.subTest(cleaning_function=cleaning_function):
+                input_df = pd.DataFrame(self.input_data)
+                cleaning_function(input_df)
+
+                assert_frame_equal(input_df, pd.DataFrame(self.input_data))
+
+    def test_clean_dataframes_copies_are_bounded(self):
+        nb_rows = 5000
+        ids = np.arange(nb_rows, dtype=float)
+        ids[::10] = np.nan
+        clinical_df = pd.DataFrame(
+            {
+                "id": [f"NCT{number}" for number in range(nb_rows)],
+                "scientific_title": [
+                    f"Tetracycline trial {number}" for number in range(nb_rows)
+                ],
+                "date": ["1 January 2020", "25/05/2020"] * (nb_rows // 2),
+                "journal": [f"Journal {number % 50}" for number in range(nb_rows)],
+            }
+        )
+        pubmed_df = pd.DataFrame(
+            {
+                "id": ids,
+                "title": [f"Betamethasone study {number}" for number in range(nb_rows)],
+                "date": ["01/01/2019"] * nb_rows,
+                "journal": [f"Journal {number % 50}" for number in range(nb_rows)],
+            }
+        )
+        drugs_df = pd.DataFrame({"atccode": ["S03AA"], "drug": ["TETRACYCLINE"]})
+        input_bytes = sum(
+            df.memory_usage(deep=True).sum()
+            for df in [clinical_df, pubmed_df, drugs_df]
+        )
+
+        # As enabled by the command line
+        with pd.option_context("mode.copy_on_write", True):
+            tracemalloc.start()
+            try:
+                start_bytes, _ = tracemalloc.get_traced_memory()
+                clean_dataframes(clinical_df, pubmed_df, drugs_df)
+                _, peak_bytes = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess((peak_bytes - start_bytes) / input_bytes, MAX_CLEANING_COPIES)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+# Third-party packages
+import pandas as pd
+
+# Built-in packages
+import importlib.util
+import unittest
+
+# My Custom packages
+from app.main import get_graph_link_builder
+from app.src.constants import CLINICAL_TRIALS_PATHS, PUBMED_PATHS, DRUGS_PATHS
+from app.src.graph_linkage.drug_synonyms import (
+    build_drug_alias_matcher,
+    load_drug_synonyms,
+)
+from app.src.graph_linkage.journal_mentions import JournalMentions
+
+DRUG_SYNONYMS_PATH = "data/drug_synonyms.csv"
+
+
+class TestDrugSynonyms(unittest.TestCase):
+    def setUp(self):
+        self.matcher = build_drug_alias_matcher(
+            ["A04AD", "A01AD", "S03AA"],
+            ["Diphenhydramine", "Epinephrine", "Tetracycline"],
+            [
+                ("A04AD", "benadryl"),
+                ("A01AD", "adrenaline"),
+                ("A04AD", "diphenhydramine hydrochloride"),
+                ("S03AA", "Adrenaline"),  # Conflict, both drugs are mentioned
+                ("UNKNOWN", "aspirin"),  # Unknown drug, ignored
+            ],
+        )
+
+    def test_names_and_synonyms_are_matched(self):
+        self.assertEqual(
+            self.matcher.find_drugs("Adrenaline And Benadryl In Allergy"),
+            [
+                ["A04AD", "Diphenhydramine", "Benadryl"],
+                ["A01AD", "Epinephrine", "Adrenaline"],
+                ["S03AA", "Tetracycline", "Adrenaline"],
+            ],
+        )
+        self.assertEqual(
+            self.matcher.find_drugs("Tetracycline Resistance Patterns"),
+            [["S03AA", "Tetracycline", "Tetracycline"]],
+        )
+        self.assertEqual(self.matcher.find_drugs("Aspirin And Nothing Else"), [])
+        self.assertEqual(self.matcher.find_drugs(""), [])
+
+    def test_longest_alias_is_recorded(self):
+        self.assertEqual(self.matcher.max_alias_words, 2)
+        self.assertEqual(
+            self.matcher.find_drugs("Diphenhydramine Hydrochloride Helps"),
+            [["A04AD", "Diphenhydramine", "Diphenhydramine Hydrochloride"]],
+        )
+
+    def test_alias_must_cover_whole_words(self):
+        matcher = build_drug_alias_matcher(["B01AC"], ["Aspirin"], [("B01AC", "Asa")])
+
+        self.assertEqual(matcher.find_drugs("Asap Aspirins Trial"), [])
+        self.assertEqual(matcher.find_drugs("Asa Trial"), [["B01AC", "Aspirin", "Asa"]])
+
+    def test_drugs_sharing_a_name_match_with_and_without_matcher(self):
+        drugs_df = pd.DataFrame(
+            {"name": ["Ethanol", "Aspirin", "Ethanol"]},
+            index=pd.Index(["V03AB", "B01AC", "D08AX"], name="atccode"),
+        )
+        title = "Aspirin And Ethanol"
+        journal_mentions = JournalMentions(
+            title="Test Journal",
+            drugs_dataFrame=drugs_df,
+            journal_articles_dataFrame=pd.DataFrame(),
+        )
+        matcher = build_drug_alias_matcher(drugs_df.index, drugs_df["name"])
+
+        self.assertEqual(
+            [mention[:2] for mention in matcher.find_drugs(title)],
+            journal_mentions.extract_drug_from_publication_title(title),
+        )
+
+    def test_only_whole_words_are_matched(self):
+        self.assertEqual(self.matcher.find_drugs("Benadryls And Epinephrines"), [])
+
+    def test_graph_link_records_matched_alias(self):
+        build_graph_link = get_graph_link_builder("pandas")
+        graph = build_graph_link(
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+            drug_synonyms_path=DRUG_SYNONYMS_PATH,
+        )
+
+        mentions = [
+            mention
+            for journal in graph["journals"]
+            for mentions in journal["referencedBy"].values()
+            for mention in mentions
+        ]
+        self.assertTrue(all("matchedAlias" in mention for mention in mentions))
+        self.assertIn(
+            ("2", "A04AD", "Benadryl"),
+            {
+                (
+                    mention["articleId"],
+                    mention["mentionedDrugID"],
+                    mention["matchedAlias"],
+                )
+                for mention in mentions
+            },
+        )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("polars"), "The polars package is not installed"
+    )
+    def test_backends_match_with_synonyms(self):
+        graphs = [
+            get_graph_link_builder(backend)(
+                CLINICAL_TRIALS_PATHS.split(";"),
+                PUBMED_PATHS.split(";"),
+                DRUGS_PATHS.split(";"),
+                drug_synonyms_path=DRUG_SYNONYMS_PATH,
+            )
+            for backend in ["pandas", "polars"]
+        ]
+
+        self.assertEqual(graphs[0], graphs[1])
+
+    def test_synonyms_file_is_streamed(self):
+        synonyms = load_drug_synonyms(DRUG_SYNONYMS_PATH)
+
+        self.assertEqual(next(synonyms), ("A04AD", "benadryl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,33 +2,41 @@
 import os
 import tempfile
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import patch
 
 # My Custom packages
-from app.utils.files_processing import create_folders_if_not_exist, fix_broken_json
+from app.utils.files_processing import (
+    create_folders_if_not_exist,
+    fix_broken_json,
+    import_json_file_as_dict,
+    open_journals_writer,
+    write_dict_to_file,
+)
 
 
 class TestFilesProcessing(unittest.TestCase):
     def test_create_folders_for_valid_nested_output_file_path(self):
         output_filepath = "test_outputs/folder2/folder3/file.txt"
 
-        with patch("os.makedirs") as mock_makedirs, patch(
-            "os.path.exists", return_value=False
-        ) as mock_exists:
+        with patch("os.makedirs") as mock_makedirs:
             create_folders_if_not_exist(output_filepath)
-            expected_calls = [
-                call("test_outputs/"),
-                call("test_outputs/folder2/"),
-                call("test_outputs/folder2/folder3/"),
-            ]
-            mock_makedirs.assert_has_calls(expected_calls, any_order=True)
+            mock_makedirs.assert_called_once_with(
+                "test_outputs/folder2/folder3", exist_ok=True
+            )
+
+    def test_create_folders_for_absolute_output_file_path(self):
+        with tempfile.TemporaryDirectory() as temp_folder:
+            output_filepath = os.path.join(temp_folder, "folder2", "file.json")
+
+            create_folders_if_not_exist(output_filepath)
+            create_folders_if_not_exist(output_filepath)  # Already existing folders
+
+            self.assertTrue(os.path.isdir(os.path.join(temp_folder, "folder2")))
 
     def test_handle_no_folders_in_output_file_path(self):
         """Handles the case where only a file name is provided."""
         output_filepath = "test.json"
-        with patch("os.makedirs") as mock_makedirs, patch(
-            "os.path.exists", return_value=False
-        ) as mock_exists:
+        with patch("os.makedirs") as mock_makedirs:
             create_folders_if_not_exist(output_filepath)
             mock_makedirs.assert_not_called()
 
@@ -50,6 +58,77 @@ class TestFilesProcessing(unittest.TestCase):
         finally:
             os.remove(temp_filepath)
 
+    def test_write_dict_to_file_round_trip(self):
+        dictionary = {"journals": [{"title": "Journal Of Emergency Nursing"}]}
+
+        with tempfile.TemporaryDirectory() as temp_folder:
+            for filename in ["graph.json", "graph.json.gz"]:
+                output_filepath = os.path.join(temp_folder, filename)
+
+                statistics = write_dict_to_file(output_filepath, dictionary, fsync=True)
+
+                self.assertEqual(import_json_file_as_dict(output_filepath), dictionary)
+                self.assertEqual(
+                    statistics["bytes_written"], os.path.getsize(output_filepath)
+                )
+
+            # Only the output files are left, no temporary file
+            self.assertEqual(
+                sorted(os.listdir(temp_folder)), ["graph.json", "graph.json.gz"]
+            )
+
+    def test_interrupted_write_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as temp_folder:
+            output_filepath = os.path.join(temp_folder, "graph.json")
+            write_dict_to_file(output_filepath, {"journals": []})
+
+            with self.assertRaises(TypeError):
+                # Sets are not serializable, the write fails midway
+                write_dict_to_file(output_filepath, {"journals": [1, {2}]})
+
+            self.assertEqual(
+                import_json_file_as_dict(output_filepath), {"journals": []}
+            )
+            self.assertEqual(os.listdir(temp_folder), ["graph.json"])
+
+    def test_journals_writer_matches_write_dict_to_file(self):
+        journals = [
+            {
+                "title": "Journal A",
+                "referencedBy": {"pubmedArticles": [], "clinicalTrials": []},
+            },
+            {
+                "title": "Journal É",
+                "referencedBy": {
+                    "pubmedArticles": [{"articleId": "1"}],
+                    "clinicalTrials": [],
+                },
+            },
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_folder:
+            for pretty in [False, True]:
+                for nb_journals in [0, 1, 2]:
+                    with self.subTest(pretty=pretty, nb_journals=nb_journals):
+                        expected_path = os.path.join(temp_folder, "expected.json")
+                        streamed_path = os.path.join(temp_folder, "streamed.json")
+
+                        write_dict_to_file(
+                            expected_path,
+                            {"journals": journals[:nb_journals]},
+                            pretty=pretty,
+                        )
+                        with open_journals_writer(
+                            streamed_path, pretty=pretty
+                        ) as write_journal:
+                            for journal in journals[:nb_journals]:
+                                write_journal(journal)
+
+                        with open(expected_path, "rb") as expected, open(
+                            streamed_path, "rb"
+                        ) as streamed:
+                            self.assertEqual(streamed.read(), expected.read())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+# Built-in packages
+import copy
+import os
+import shutil
+import unittest
+
+# My Custom packages
+from app.src.adhoc.graph_diff import diff_graphs, iter_graph_journals
+from app.src.constants import OUTPUT_PATH
+from app.utils.files_processing import import_json_file_as_dict, write_dict_to_file
+
+TEST_FOLDER = "output/test_graph_diff"
+
+
+class TestGraphDiff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.graph = import_json_file_as_dict(OUTPUT_PATH)
+
+    def setUp(self):
+        self.new_graph_path = os.path.join(TEST_FOLDER, "new_graph_link.json.gz")
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def test_iter_graph_journals_with_small_chunks(self):
+        for chunk_size in [7, 1024]:
+            with self.subTest(chunk_size=chunk_size):
+                journals = list(iter_graph_journals(OUTPUT_PATH, chunk_size))
+
+                self.assertEqual(journals, self.graph["journals"])
+
+    def test_reordered_graph_is_identical(self):
+        new_graph = copy.deepcopy(self.graph)
+        new_graph["journals"].reverse()
+        for journal in new_graph["journals"]:
+            journal["referencedBy"]["pubmedArticles"].reverse()
+        write_dict_to_file(self.new_graph_path, new_graph)
+
+        diff = diff_graphs(OUTPUT_PATH, self.new_graph_path, nb_partitions=3)
+
+        self.assertTrue(diff["identical"])
+        self.assertEqual(diff["journals"]["unchanged"], len(self.graph["journals"]))
+
+    def test_differences_are_reported(self):
+        new_graph = copy.deepcopy(self.graph)
+        removed_journal = new_graph["journals"].pop(0)
+        changed_journal = new_graph["journals"][0]
+        changed_journal["referencedBy"]["pubmedArticles"][0][
+            "mentionDate"
+        ] = "2000-01-01"
+        changed_journal["referencedBy"]["clinicalTrials"].append(
+            {
+                "articleId": "NEW",
+                "articleTitle": "New Trial",
+                "mentionDate": "2021-01-01",
+                "mentionedDrugID": "A04AD",
+                "mentionedDrugName": "Diphenhydramine",
+            }
+        )
+        new_graph["journals"].append(
+            {
+                "title": "New Journal",
+                "referencedBy": {"pubmedArticles": [], "clinicalTrials": []},
+            }
+        )
+        write_dict_to_file(self.new_graph_path, new_graph)
+
+        diff = diff_graphs(OUTPUT_PATH, self.new_graph_path)
+
+        self.assertFalse(diff["identical"])
+        self.assertEqual(diff["samples"]["added_journals"], ["New Journal"])
+        self.assertEqual(
+            diff["samples"]["removed_journals"], [removed_journal["title"]]
+        )
+        self.assertEqual(
+            diff["samples"]["changed_journals"], [changed_journal["title"]]
+        )
+        self.assertEqual(
+            diff["samples"]["added_mentions"],
+            [[changed_journal["title"], "clinicalTrials", "NEW", "A04AD"]],
+        )
+        self.assertEqual(diff["mentions"]["changed"], 1)
+        self.assertEqual(
+            diff["mentions"]["removed"],
+            sum(len(mentions) for mentions in removed_journal["referencedBy"].values()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
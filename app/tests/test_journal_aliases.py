@@ -0,0 +1,134 @@
+# Third-party packages
+import pandas as pd
+
+# Built-in packages
+import os
+import tempfile
+import unittest
+
+# My Custom packages
+from app.main import merge_articles_dfs
+from app.src.graph_linkage.journal_aliases import (
+    normalize_journal_name,
+    build_journal_alias_map,
+)
+
+
+class TestJournalAliases(unittest.TestCase):
+    def setUp(self):
+        self.journal_names = [
+            "Journal Of Emergency Nursing",
+            "Journal Of Emergency Nursing",
+            "The Journal Of Emergency Nursing",
+            "J Emergency Nursing",
+            "Journal Of Emergancy Nursing",
+            "Journal Of Emergency Medicine",
+            "Journal Of Food Protection",
+            "Journal Of Food Science",
+            "Hôpitaux Universitaires De Genève",
+            "Hopitaux Universitaires Geneve",
+            "",
+        ]
+
+    def test_normalize_journal_name(self):
+        self.assertEqual(
+            normalize_journal_name("The Journal Of Emergency Nursing"),
+            "journal emergency nursing",
+        )
+        self.assertEqual(
+            normalize_journal_name("J Emergency Nursing"), "journal emergency nursing"
+        )
+        self.assertEqual(
+            normalize_journal_name("Hôpitaux Universitaires De Genève"),
+            "hopitaux universitaires geneve",
+        )
+
+    def test_near_duplicates_are_merged(self):
+        alias_map = build_journal_alias_map(self.journal_names)
+
+        # The most frequent name of each group becomes canonical
+        for alias in [
+            "The Journal Of Emergency Nursing",
+            "J Emergency Nursing",
+            "Journal Of Emergancy Nursing",
+        ]:
+            self.assertEqual(alias_map[alias], "Journal Of Emergency Nursing")
+
+        self.assertEqual(
+            alias_map["Hopitaux Universitaires Geneve"],
+            alias_map["Hôpitaux Universitaires De Genève"],
+        )
+        self.assertNotIn("", alias_map)
+
+    def test_different_journals_are_not_merged(self):
+        alias_map = build_journal_alias_map(self.journal_names)
+
+        for journal_name in [
+            "Journal Of Emergency Medicine",
+            "Journal Of Food Protection",
+            "Journal Of Food Science",
+        ]:
+            self.assertEqual(alias_map[journal_name], journal_name)
+
+    def test_known_aliases_are_kept(self):
+        known_aliases = {
+            "J Emergency Nursing": "J Emergency Nursing",
+            "Journal Of Food Protection": "Journal Of Food Protection",
+        }
+
+        alias_map = build_journal_alias_map(self.journal_names, known_aliases)
+
+        # New names join the group of a cached name, whose canonical name does not change
+        self.assertEqual(alias_map["J Emergency Nursing"], "J Emergency Nursing")
+        self.assertEqual(
+            alias_map["Journal Of Emergency Nursing"], "J Emergency Nursing"
+        )
+        self.assertEqual(
+            alias_map["Journal Of Food Science"], "Journal Of Food Science"
+        )
+
+    def test_known_groups_are_never_merged(self):
+        # Both names were kept apart by a previous run
+        known_aliases = {
+            "Journal Of Emergency Nursing": "Journal Of Emergency Nursing",
+            "The Journal Of Emergency Nursing": "The Journal Of Emergency Nursing",
+        }
+
+        alias_map = build_journal_alias_map(
+            ["J Emergency Nursing", "Journal Of Emergancy Nursing"], known_aliases
+        )
+
+        # The new names, close to both known names, join a single known group
+        for journal_name, canonical_name in known_aliases.items():
+            self.assertEqual(alias_map[journal_name], canonical_name)
+        self.assertIn(alias_map["J Emergency Nursing"], known_aliases)
+        self.assertIn(alias_map["Journal Of Emergancy Nursing"], known_aliases)
+
+    def test_merged_articles_use_the_canonical_journal_names(self):
+        pubmed_df = pd.DataFrame(
+            {"title": ["A", "B"], "journal": ["Journal Of Emergency Nursing", None]}
+        )
+        clinical_df = pd.DataFrame(
+            {"title": ["C"], "journal": ["The Journal Of Emergency Nursing"]}
+        )
+
+        with tempfile.TemporaryDirectory() as temp_folder:
+            all_articles_df = merge_articles_dfs(
+                clinical_df,
+                pubmed_df,
+                os.path.join(temp_folder, "journal_aliases.json"),
+            )
+
+        # Journals without an alias, even missing ones, are kept as they are
+        self.assertEqual(
+            all_articles_df["journal"].tolist(),
+            [
+                "The Journal Of Emergency Nursing",
+                None,
+                "The Journal Of Emergency Nursing",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
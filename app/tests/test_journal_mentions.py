@@ -58,6 +58,22 @@ class TestJournalMentions(unittest.TestCase):
 
             self.assertEqual(current_article_mentions, expected_article_mentions)
 
+    def test_drug_mentions_keep_the_order_of_the_drugs(self):
+        drugs_df = pd.DataFrame(
+            {"name": ["Ethanol", "Aspirin", "Ethanol"]},
+            index=pd.Index(["V03AB", "B01AC", "D08AX"], name="atccode"),
+        )
+        jm = JournalMentions(
+            title="Test Journal",
+            drugs_dataFrame=drugs_df,
+            journal_articles_dataFrame=pd.DataFrame(),
+        )
+
+        self.assertEqual(
+            jm.extract_drug_from_publication_title("Aspirin And Ethanol Aspirin"),
+            [["V03AB", "Ethanol"], ["B01AC", "Aspirin"], ["D08AX", "Ethanol"]],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
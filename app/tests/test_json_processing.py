@@ -5,6 +5,7 @@ import unittest
 from app.src.adhoc.json_processing import (
     get_drugs_mentioned_by_journal,
     get_all_articles_from_journal,
+    rank_top_journals,
 )
 
 
@@ -162,6 +163,50 @@ class TestJsonProcessing(unittest.TestCase):
         get_all_articles_from_journal(self.journal_dict_clinical_only)
         get_all_articles_from_journal(self.journal_dict_empty)
 
+    def test_rank_top_journals_returns_ties(self):
+        list_journals = [
+            dict(self.journal_dict_empty, title="Empty"),
+            dict(self.journal_dict_pubmed_only, title="PubMed Only"),
+            dict(self.journal_dict_complete, title="Complete"),
+            dict(self.journal_dict_clinical_only, title="Clinical Only"),
+            dict(self.journal_dict_complete, title="Complete Bis"),
+        ]
+
+        # 4 unique drugs for both complete journals, 3 for the clinical only one and 2 for the pubmed only one
+        self.assertEqual(
+            rank_top_journals(list_journals, metric="unique_drugs", top_n=1),
+            [["Complete", 4], ["Complete Bis", 4]],
+        )
+        self.assertEqual(
+            rank_top_journals(list_journals, metric="unique_drugs", top_n=3),
+            [["Complete", 4], ["Complete Bis", 4], ["Clinical Only", 3]],
+        )
+        self.assertEqual(
+            rank_top_journals(list_journals, metric="total_mentions", top_n=2),
+            [["Complete", 5], ["Complete Bis", 5]],
+        )
+        self.assertEqual(
+            rank_top_journals(iter(list_journals), metric="pubmed_mentions", top_n=1),
+            [["PubMed Only", 2], ["Complete", 2], ["Complete Bis", 2]],
+        )
+        self.assertEqual(
+            rank_top_journals(list_journals, metric="clinical_mentions", top_n=10),
+            [
+                ["Complete", 3],
+                ["Clinical Only", 3],
+                ["Complete Bis", 3],
+                ["Empty", 0],
+                ["PubMed Only", 0],
+            ],
+        )
+
+    def test_rank_top_journals_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            rank_top_journals([self.journal_dict_complete], top_n=0)
+
+        with self.assertRaises(ValueError):
+            rank_top_journals([self.journal_dict_complete], metric="unknown")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+# Built-in packages
+import importlib.util
+import io
+import json
+import os
+import shutil
+import unittest
+
+# My Custom packages
+from app.src.constants import OUTPUT_PATH
+import app.utils.files_processing as U
+import app.utils.json_serializers as J
+from app.utils.json_serializers import get_json_serializer
+
+TEST_FOLDER = "output/test_json_serializers"
+
+INSTALLED_SERIALIZERS = [
+    name
+    for name in ["orjson", "msgspec", "json"]
+    if name == "json" or importlib.util.find_spec(name) is not None
+]
+
+
+class TestJsonSerializers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(OUTPUT_PATH, "rb") as hd:
+            cls.graph_bytes = hd.read()
+        cls.graph = json.loads(cls.graph_bytes)
+
+    def dump(self, serializer_name: str, pretty: bool) -> bytes:
+        binary_file = io.BytesIO()
+        get_json_serializer(serializer_name).dump(self.graph, binary_file, pretty)
+        return binary_file.getvalue()
+
+    def test_round_trip(self):
+        for name in INSTALLED_SERIALIZERS:
+            with self.subTest(serializer=name):
+                serializer = get_json_serializer(name)
+
+                loaded_graph = serializer.load(
+                    io.BytesIO(self.dump(name, pretty=False)), is_link_graph=True
+                )
+
+                self.assertEqual(loaded_graph, self.graph)
+
+    def test_all_serializers_write_the_same_json(self):
+        for name in INSTALLED_SERIALIZERS:
+            with self.subTest(serializer=name):
+                self.assertEqual(
+                    self.dump(name, pretty=False), self.dump("json", False)
+                )
+                # The committed graph is pretty printed
+                self.assertEqual(self.dump(name, pretty=True), self.graph_bytes)
+
+    def test_compact_output_is_smaller(self):
+        self.assertLess(
+            len(self.dump("json", pretty=False)), len(self.dump("json", pretty=True))
+        )
+
+    def test_auto_uses_an_installed_serializer(self):
+        self.assertIn(get_json_serializer("auto").name, INSTALLED_SERIALIZERS)
+
+        with self.assertRaises(ValueError):
+            get_json_serializer("ujson")
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("msgspec"), "The msgspec package is not installed"
+)
+class TestMsgspecSerializer(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(TEST_FOLDER, exist_ok=True)
+        J.set_default_json_serializer("msgspec")
+
+    def tearDown(self):
+        J.set_default_json_serializer("auto")
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def test_write_and_import_the_link_graph(self):
+        with open(OUTPUT_PATH, "rb") as hd:
+            graph = json.load(hd)
+        graph_path = os.path.join(TEST_FOLDER, "graph.json")
+
+        U.write_dict_to_file(graph_path, graph)
+
+        self.assertEqual(
+            U.import_json_file_as_dict(graph_path, is_link_graph=True), graph
+        )
+        self.assertEqual(U.import_json_file_as_dict(graph_path), graph)
+
+    def test_validates_the_graph_schema(self):
+        serializer = get_json_serializer("msgspec")
+        invalid_graph = b'{"journals": [{"title": "Journal", "referencedBy": {}}]}'
+
+        with self.assertRaises(serializer.schema_errors):
+            serializer.load(io.BytesIO(invalid_graph), is_link_graph=True)
+
+    def test_schema_mismatch_is_not_fixed_as_a_broken_json(self):
+        serializer = get_json_serializer("msgspec")
+        graph_path = os.path.join(TEST_FOLDER, "invalid_graph.json")
+        with open(graph_path, "wb") as hd:
+            hd.write(b'{"journals": [{"title": "Journal", "referencedBy": {}}]}')
+
+        with self.assertRaises(serializer.schema_errors):
+            U.import_json_file_as_dict(graph_path, is_link_graph=True)
+
+    def test_broken_json_is_still_fixed(self):
+        broken_path = os.path.join(TEST_FOLDER, "broken.json")
+        with open(broken_path, "wb") as hd:
+            hd.write(b'{"journals": [1, 2,]}')
+
+        self.assertEqual(U.import_json_file_as_dict(broken_path), {"journals": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
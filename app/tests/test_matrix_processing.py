@@ -0,0 +1,128 @@
+# Built-in packages
+import importlib.util
+import os
+import tempfile
+import unittest
+
+# My Custom packages
+from app.main import generate_graph_link
+from app.src.adhoc.json_processing import get_drugs_mentioned_by_similar_journals
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    OUTPUT_PATH,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+)
+from app.utils.files_processing import import_json_file_as_dict
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("scipy"), "The scipy package is not installed"
+)
+class TestMatrixProcessing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.list_journals = import_json_file_as_dict(OUTPUT_PATH)["journals"]
+
+    def test_batch_matches_single_drug_queries(self):
+        from app.src.adhoc.matrix_processing import (
+            get_all_drugs_mentioned_by_similar_journals,
+        )
+
+        for skip_clinical_trials in [True, False]:
+            adjacency = get_all_drugs_mentioned_by_similar_journals(
+                self.list_journals, skip_clinical_trials=skip_clinical_trials
+            )
+
+            for drug_name, co_mentioned_drugs in adjacency.items():
+                expected_result = get_drugs_mentioned_by_similar_journals(
+                    list_journals=self.list_journals,
+                    drug_name=drug_name,
+                    skip_clinical_trials=skip_clinical_trials,
+                )
+                self.assertEqual(set(co_mentioned_drugs), expected_result)
+
+    def test_incidence_matrix_shape(self):
+        from app.src.adhoc.matrix_processing import build_drug_journal_matrix
+
+        incidence_matrix, drug_names, journal_titles = build_drug_journal_matrix(
+            self.list_journals, skip_clinical_trials=True
+        )
+
+        # Journals referenced by clinical trials are left out, their drugs are kept
+        self.assertEqual(len(journal_titles), 8)
+        self.assertNotIn("Journal Of Emergency Nursing", journal_titles)
+        self.assertIn("Diphenhydramine", drug_names)
+        self.assertEqual(incidence_matrix.shape, (len(drug_names), len(journal_titles)))
+
+    def test_top_similar_drugs_scores(self):
+        from app.src.adhoc.matrix_processing import get_top_similar_drugs
+
+        # Atropine is mentioned by 1 article, also mentioning Betamethasone which is mentioned by 4 articles
+        article_jaccard = get_top_similar_drugs(
+            self.list_journals, level="article", metric="jaccard", top_k=5
+        )
+        self.assertEqual(article_jaccard["Atropine"], [["Betamethasone", 0.25]])
+        self.assertEqual(article_jaccard["Isoprenaline"], [])
+
+        # Tetracycline is mentioned by 3 journals, one of them also mentions Ethanol
+        journal_cosine = get_top_similar_drugs(
+            self.list_journals, level="journal", metric="cosine", top_k=1
+        )
+        self.assertEqual(journal_cosine["Ethanol"], [["Tetracycline", 0.57735]])
+
+        # A drug is never returned as similar to itself, and the top k is respected
+        for drug_name, similar_drugs in journal_cosine.items():
+            self.assertLessEqual(len(similar_drugs), 1)
+            self.assertNotIn(drug_name, [name for name, _ in similar_drugs])
+
+    def test_top_similar_drugs_time_window(self):
+        from app.src.adhoc.matrix_processing import get_top_similar_drugs
+
+        similar_drugs = get_top_similar_drugs(
+            self.list_journals,
+            level="journal",
+            start_date="2020-01-01",
+            end_date="2020-01-31",
+        )
+
+        # Mentions from 2019 (ex: Diphenhydramine in The Journal Of Pediatrics) are left out
+        self.assertNotIn("Epinephrine", similar_drugs)
+        self.assertEqual(similar_drugs["Diphenhydramine"], [])
+        self.assertEqual(similar_drugs["Ethanol"], [["Tetracycline", 0.333333]])
+
+    def test_invalid_similarity_arguments(self):
+        from app.src.adhoc.matrix_processing import get_top_similar_drugs
+
+        with self.assertRaises(ValueError):
+            get_top_similar_drugs(self.list_journals, level="sentence")
+
+        with self.assertRaises(ValueError):
+            get_top_similar_drugs(self.list_journals, metric="euclidean")
+
+        with self.assertRaises(ValueError):
+            get_top_similar_drugs(self.list_journals, top_k=0)
+
+    def test_similarity_stage_writes_the_top_similar_drugs(self):
+        from app.src.adhoc.matrix_processing import get_top_similar_drugs
+
+        with tempfile.TemporaryDirectory() as test_folder:
+            similarities_path = os.path.join(test_folder, "drug_similarities.json")
+            timings = generate_graph_link(
+                CLINICAL_TRIALS_PATHS.split(";"),
+                PUBMED_PATHS.split(";"),
+                DRUGS_PATHS.split(";"),
+                output_path=os.path.join(test_folder, "graph_link.json"),
+                similarities_output_path=similarities_path,
+                similarity_options={"metric": "cosine", "top_k": 2},
+            )
+
+            self.assertIn("write_drug_similarities", timings)
+            self.assertEqual(
+                import_json_file_as_dict(similarities_path),
+                get_top_similar_drugs(self.list_journals, metric="cosine", top_k=2),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+# Built-in packages
+import importlib.util
+import os
+import shutil
+import unittest
+import urllib.error
+import urllib.request
+
+# My custom packages
+from app.main import build_graph_link_with_pandas, generate_graph_link
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+)
+import app.src.graph_linkage.checkpoints as CK
+import app.utils.metrics as M
+
+TEST_FOLDER = "output/test_metrics"
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = M.MetricsRegistry()
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def test_prometheus_text_format(self):
+        self.registry.increment("graph_link_rows_loaded_total", 3, source='a "b".csv')
+        self.registry.increment("graph_link_rows_loaded_total", 2, source='a "b".csv')
+        self.registry.set("graph_link_last_run_success", 1)
+        self.registry.observe("graph_link_stage_duration_seconds", 0.2, stage="load")
+        self.registry.observe("graph_link_stage_duration_seconds", 20, stage="load")
+
+        lines = self.registry.to_prometheus_text().splitlines()
+
+        self.assertEqual(
+            lines[:3],
+            [
+                "# HELP graph_link_rows_loaded_total Rows loaded from each input file.",
+                "# TYPE graph_link_rows_loaded_total counter",
+                'graph_link_rows_loaded_total{source="a \\"b\\".csv"} 5',
+            ],
+        )
+        self.assertIn(
+            'graph_link_stage_duration_seconds_bucket{stage="load",le="0.1"} 0', lines
+        )
+        self.assertIn(
+            'graph_link_stage_duration_seconds_bucket{stage="load",le="0.5"} 1', lines
+        )
+        self.assertIn(
+            'graph_link_stage_duration_seconds_bucket{stage="load",le="+Inf"} 2', lines
+        )
+        self.assertIn('graph_link_stage_duration_seconds_sum{stage="load"} 20.2', lines)
+        self.assertIn('graph_link_stage_duration_seconds_count{stage="load"} 2', lines)
+        self.assertIn("graph_link_last_run_success 1", lines)
+
+    def test_undeclared_metrics_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.registry.increment("graph_link_unknown_total")
+        # A gauge can not be incremented like a counter
+        with self.assertRaises(ValueError):
+            self.registry.increment("graph_link_last_run_success")
+
+    def test_run_metrics_are_written_at_the_end_of_the_run(self):
+        metrics_path = os.path.join(TEST_FOLDER, "graph_link.prom")
+        output_path = os.path.join(TEST_FOLDER, "graph_link.json")
+
+        generate_graph_link(
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+            output_path=output_path,
+            metrics_path=metrics_path,
+        )
+
+        with open(metrics_path, "r", encoding="utf-8") as hd:
+            lines = hd.read().splitlines()
+
+        for expected_line in [
+            'graph_link_rows_loaded_total{source="clinical_trials.csv"} 8',
+            'graph_link_rows_loaded_total{source="pubmed.json"} 5',
+            "graph_link_duplicate_rows_merged_total 1",
+            "graph_link_empty_rows_dropped_total 1",
+            "graph_link_titles_without_drug_total 2",
+            "graph_link_journals_linked_total 10",
+            'graph_link_edges_emitted_total{article_type="PubMed"} 14',
+            'graph_link_edges_emitted_total{article_type="ClinicalTrial"} 5',
+            f'graph_link_output_size_bytes{{path="{output_path}"}} {os.path.getsize(output_path)}',
+            'graph_link_stage_duration_seconds_count{stage="link_graph"} 1',
+            "graph_link_last_run_success 1",
+        ]:
+            with self.subTest(expected_line=expected_line):
+                self.assertIn(expected_line, lines)
+
+    def test_link_metrics_are_recorded_by_every_backend(self):
+        input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+        output_path = os.path.join(TEST_FOLDER, "graph_link.json")
+        checkpoint_dir = os.path.join(TEST_FOLDER, "checkpoints")
+
+        def get_link_metrics(**options) -> list:
+            metrics_path = os.path.join(TEST_FOLDER, "graph_link.prom")
+            generate_graph_link(
+                *input_paths,
+                output_path=output_path,
+                metrics_path=metrics_path,
+                **options,
+            )
+            with open(metrics_path, "r", encoding="utf-8") as hd:
+                return [
+                    line
+                    for line in hd.read().splitlines()
+                    if line.startswith(
+                        (
+                            "graph_link_titles_without_drug_total",
+                            "graph_link_journals_linked_total",
+                            "graph_link_edges_emitted_total",
+                        )
+                    )
+                ]
+
+        expected_metrics = get_link_metrics()
+        self.assertEqual(len(expected_metrics), 4)
+
+        # Every journal written by a previous run, the resumed run only loads them
+        fingerprint = CK.get_inputs_fingerprint(
+            sum(input_paths, []),
+            {
+                "journal_aliases_path": None,
+                "drug_synonyms_path": None,
+                "missing_id_strategy": "sequential",
+            },
+        )
+        CK.open_checkpoint_dir(checkpoint_dir, fingerprint, resume=False)
+        build_graph_link_with_pandas(*input_paths, checkpoint_dir=checkpoint_dir)
+        self.assertEqual(
+            get_link_metrics(checkpoint_dir=checkpoint_dir, resume=True),
+            expected_metrics,
+        )
+
+        if importlib.util.find_spec("polars") is not None:
+            self.assertEqual(get_link_metrics(backend="polars"), expected_metrics)
+
+    def test_failed_runs_write_their_metrics(self):
+        metrics_path = os.path.join(TEST_FOLDER, "graph_link.prom")
+
+        with self.assertRaises(FileNotFoundError):
+            generate_graph_link(
+                ["missing.csv"],
+                PUBMED_PATHS.split(";"),
+                DRUGS_PATHS.split(";"),
+                output_path=os.path.join(TEST_FOLDER, "graph_link.json"),
+                metrics_path=metrics_path,
+            )
+
+        with open(metrics_path, "r", encoding="utf-8") as hd:
+            self.assertIn("graph_link_last_run_success 0", hd.read().splitlines())
+
+    def test_metrics_server(self):
+        M.METRICS.reset()
+        M.set_gauge("graph_link_last_run_success", 1)
+        server = M.start_metrics_server(port=0)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            with urllib.request.urlopen(f"{url}/metrics", timeout=10) as response:
+                self.assertEqual(
+                    response.headers["Content-Type"], M.PROMETHEUS_CONTENT_TYPE
+                )
+                self.assertIn(
+                    "graph_link_last_run_success 1",
+                    response.read().decode("utf-8").splitlines(),
+                )
+
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other", timeout=10)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# Third-party packages
+import pandas as pd
+
+# Built-in packages
+import io
+import json
+import os
+import unittest
+from unittest import mock
+
+# My custom packages
+from app.utils.my_logger import AggregatedWarning, configure_logger, logger
+import app.src.pandas_processing.transform as T
+
+
+class TestMyLogger(unittest.TestCase):
+    def setUp(self):
+        self.messages = []
+        self.sink_id = logger.add(self.messages.append, level="INFO", serialize=True)
+
+    def tearDown(self):
+        logger.remove(self.sink_id)
+
+    def get_records(self) -> list:
+        return [json.loads(message)["record"] for message in self.messages]
+
+    def test_aggregated_warning_is_logged_once_with_samples(self):
+        warning = AggregatedWarning("titles had no drug mentioned", nb_samples=2)
+        for title in ["A", "B", "C"]:
+            warning.add(title)
+
+        self.assertEqual(self.messages, [])
+        self.assertEqual(warning.flush(), 3)
+        # The warning is reset once logged
+        self.assertEqual(warning.flush(), 0)
+
+        records = self.get_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["level"]["name"], "WARNING")
+        self.assertEqual(
+            records[0]["message"], "3 titles had no drug mentioned, e.g. : `A`, `B`"
+        )
+
+    def test_link_step_logs_a_summary_instead_of_each_title(self):
+        articles_df = pd.DataFrame(
+            {
+                "title": ["Use of Ethanol", "Nothing here", "Still nothing"],
+                "date": pd.to_datetime(["2020-01-01", "2020-01-02", "2020-01-03"]),
+                "journal": ["J1", "J2", "J1"],
+                "article_type": ["PubMed", "PubMed", "ClinicalTrial"],
+            },
+            index=pd.Index(["1", "2", "3"], name="id"),
+        )
+        drugs_df = pd.DataFrame(
+            {"name": ["Ethanol"]}, index=pd.Index(["V03AB"], name="atccode")
+        )
+
+        T.build_link_graph_from_df(articles_df, drugs_df)
+
+        # The samples follow the order of the journals
+        self.assertEqual(
+            [record["message"] for record in self.get_records()],
+            [
+                "[Link] - Linked 3 articles of 2 journals.",
+                "2 titles had no drug mentioned, e.g. : `Still nothing`, `Nothing here`",
+            ],
+        )
+
+
+class TestConfigureLogger(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.stderr_patch = mock.patch("app.utils.my_logger.stderr", self.output)
+        self.stderr_patch.start()
+
+    def tearDown(self):
+        self.stderr_patch.stop()
+        configure_logger()
+
+    def test_log_level_is_read_from_the_environment(self):
+        with mock.patch.dict(os.environ, {"LogLevel": "warning"}):
+            configure_logger()
+        logger.info("Hidden")
+        logger.warning("Shown")
+
+        self.assertNotIn("Hidden", self.output.getvalue())
+        self.assertIn("WARNING - Shown", self.output.getvalue())
+
+        with self.assertRaises(ValueError):
+            configure_logger(level="verbose")
+
+    def test_json_output_writes_one_object_per_line(self):
+        configure_logger(level="INFO", json_output=True, enqueue=True)
+        logger.info("First")
+        logger.warning("Second")
+        logger.complete()
+
+        records = [
+            json.loads(line)["record"] for line in self.output.getvalue().splitlines()
+        ]
+        self.assertEqual([record["message"] for record in records], ["First", "Second"])
+        self.assertEqual(records[1]["level"]["name"], "WARNING")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+# Built-in packages
+import hashlib
+import os
+import shutil
+import unittest
+from unittest import mock
+
+# My Custom packages
+import app.src.adhoc.json_processing as A
+import app.src.graph_linkage.partitioned_graph as PG
+import app.utils.files_processing as U
+
+TEST_FOLDER = "output/test_partitioned_graph"
+
+
+def build_journal(title: str, pubmed_drugs: list, clinical_drugs: list) -> dict:
+    def build_mentions(drug_names):
+        return [
+            {
+                "articleId": f"{title}-{index}",
+                "articleTitle": f"Article {index} of {title}",
+                "mentionDate": "2020-01-01",
+                "mentionedDrugID": f"ID-{drug_name}",
+                "mentionedDrugName": drug_name,
+            }
+            for index, drug_name in enumerate(drug_names)
+        ]
+
+    return {
+        "title": title,
+        "referencedBy": {
+            "pubmedArticles": build_mentions(pubmed_drugs),
+            "clinicalTrials": build_mentions(clinical_drugs),
+        },
+    }
+
+
+class TestPartitionedGraph(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(TEST_FOLDER, exist_ok=True)
+        drug_names = ["Aspirin", "Atropine", "Betamethasone", "Diphenhydramine"]
+        self.output_graph = {
+            "journals": [
+                build_journal(
+                    f"Journal {index}",
+                    drug_names[: index % 4 + 1],
+                    drug_names[index % 3 : index % 3 + 1] if index % 5 == 0 else [],
+                )
+                for index in range(40)
+            ]
+        }
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def test_buckets_hold_all_journals_with_their_positions(self):
+        manifest = PG.write_partitioned_graph(
+            self.output_graph, TEST_FOLDER, nb_buckets=4
+        )
+
+        self.assertEqual(manifest["nbJournals"], 40)
+        self.assertEqual(len(manifest["buckets"]), 4)
+
+        journals = [None] * 40
+        for bucket_entry in PG.load_manifest(TEST_FOLDER)["buckets"]:
+            bucket_journals = PG.load_bucket_journals(TEST_FOLDER, bucket_entry)
+            self.assertEqual(len(bucket_journals), bucket_entry["nbJournals"])
+            self.assertEqual(
+                bucket_entry["bytes"],
+                os.path.getsize(os.path.join(TEST_FOLDER, bucket_entry["file"])),
+            )
+            for journal, journal_entry in zip(
+                bucket_journals, bucket_entry["journals"]
+            ):
+                journals[journal_entry["position"]] = journal
+
+        self.assertEqual(journals, self.output_graph["journals"])
+
+    def test_load_journal_reads_its_byte_range(self):
+        PG.write_partitioned_graph(self.output_graph, TEST_FOLDER, nb_buckets=4)
+
+        self.assertEqual(
+            PG.load_journal(TEST_FOLDER, "Journal 7"), self.output_graph["journals"][7]
+        )
+        self.assertIsNone(PG.load_journal(TEST_FOLDER, "Unknown Journal"))
+
+    def test_rewrite_removes_stale_buckets(self):
+        PG.write_partitioned_graph(self.output_graph, TEST_FOLDER, nb_buckets=8)
+        PG.write_partitioned_graph(self.output_graph, TEST_FOLDER, nb_buckets=2)
+
+        self.assertEqual(
+            sorted(name for name in os.listdir(TEST_FOLDER) if name != "manifest.json"),
+            sorted(
+                bucket_entry["file"]
+                for bucket_entry in PG.load_manifest(TEST_FOLDER)["buckets"]
+            ),
+        )
+        self.assertEqual(len(os.listdir(TEST_FOLDER)), 3)
+
+    def test_interrupted_rewrite_keeps_the_previous_graph(self):
+        PG.write_partitioned_graph(self.output_graph, TEST_FOLDER, nb_buckets=4)
+        new_graph = {"journals": self.output_graph["journals"][:20]}
+
+        # The run fails once the new buckets are written, before the manifest
+        with mock.patch.object(
+            PG.U, "write_dict_to_file", side_effect=RuntimeError("Interrupted")
+        ):
+            with self.assertRaises(RuntimeError):
+                PG.write_partitioned_graph(new_graph, TEST_FOLDER, nb_buckets=4)
+
+        journals = [None] * 40
+        for bucket_entry in PG.load_manifest(TEST_FOLDER)["buckets"]:
+            with open(os.path.join(TEST_FOLDER, bucket_entry["file"]), "rb") as hd:
+                self.assertEqual(
+                    hashlib.blake2b(hd.read(), digest_size=16).hexdigest(),
+                    bucket_entry["contentHash"],
+                )
+            for journal, journal_entry in zip(
+                PG.load_bucket_journals(TEST_FOLDER, bucket_entry),
+                bucket_entry["journals"],
+            ):
+                journals[journal_entry["position"]] = journal
+
+        self.assertEqual(journals, self.output_graph["journals"])
+
+    def test_adhoc_queries_match_the_json_graph(self):
+        PG.write_partitioned_graph(self.output_graph, TEST_FOLDER, nb_buckets=5)
+        journals = self.output_graph["journals"]
+
+        for metric in A.RANKING_METRICS:
+            for top_n in [1, 3, 10]:
+                for max_workers in [1, 2]:
+                    self.assertEqual(
+                        A.rank_top_journals_of_partitioned_graph(
+                            TEST_FOLDER, metric, top_n, max_workers
+                        ),
+                        A.rank_top_journals(journals, metric, top_n),
+                    )
+
+        for drug_name in ["Aspirin", "Diphenhydramine", "Unknown"]:
+            self.assertEqual(
+                A.get_drugs_mentioned_by_similar_journals_of_partitioned_graph(
+                    TEST_FOLDER, drug_name, skip_clinical_trials=True, max_workers=2
+                ),
+                A.get_drugs_mentioned_by_similar_journals(
+                    journals, drug_name, skip_clinical_trials=True
+                ),
+            )
+
+    def test_bucket_is_a_valid_link_graph(self):
+        PG.write_partitioned_graph({"journals": []}, TEST_FOLDER, nb_buckets=2)
+
+        bucket_entry = PG.load_manifest(TEST_FOLDER)["buckets"][0]
+        self.assertEqual(
+            U.import_json_file_as_dict(
+                os.path.join(TEST_FOLDER, bucket_entry["file"]), is_link_graph=True
+            ),
+            {"journals": []},
+        )
+        with self.assertRaises(ValueError):
+            PG.write_partitioned_graph({"journals": []}, TEST_FOLDER, nb_buckets=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Built-in packages
+import os
+import shutil
+import sqlite3
+import unittest
+from contextlib import closing
+
+# My Custom packages
+from app.main import fetch_drugs_mentioned_by_pubmed_journals, fetch_top_journals
+import app.src.adhoc.query_cache as QC
+
+TEST_FOLDER = "output/test_query_cache"
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(TEST_FOLDER, exist_ok=True)
+        self.graph_path = os.path.join(TEST_FOLDER, "graph.json")
+        self.query_cache = QC.QueryCache(os.path.join(TEST_FOLDER, "query_cache.db"))
+        self.write_graph('{"journals":[]}')
+        self.nb_computations = 0
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def write_graph(self, content: str, mtime_ns: int = None) -> None:
+        with open(self.graph_path, "w", encoding="utf-8") as hd:
+            hd.write(content)
+        if mtime_ns is not None:
+            os.utime(self.graph_path, ns=(mtime_ns, mtime_ns))
+
+    def query(self, parameter: str, max_bytes: int = QC.DEFAULT_QUERY_CACHE_MAX_BYTES):
+        def compute():
+            self.nb_computations += 1
+            return [parameter, self.nb_computations]
+
+        return QC.get_or_compute(
+            QC.QueryCache(self.query_cache.path, max_bytes),
+            self.graph_path,
+            "test_query",
+            {"parameter": parameter},
+            compute,
+        )
+
+    def get_statistics(self) -> dict:
+        with closing(sqlite3.connect(self.query_cache.path)) as connection:
+            return dict(connection.execute("SELECT name, value FROM statistics"))
+
+    def test_results_are_reused_for_the_same_parameters(self):
+        self.assertEqual(self.query("a"), ["a", 1])
+        self.assertEqual(self.query("a"), ["a", 1])
+        self.assertEqual(self.query("b"), ["b", 2])
+
+        self.assertEqual(self.get_statistics(), {"hits": 1, "misses": 2})
+
+    def test_a_new_graph_invalidates_the_results(self):
+        self.write_graph('{"journals":[]}', mtime_ns=1_000_000_000)
+        self.assertEqual(self.query("a"), ["a", 1])
+
+        # Regenerated with the same content : the results stay valid
+        self.write_graph('{"journals":[]}', mtime_ns=2_000_000_000)
+        self.assertEqual(self.query("a"), ["a", 1])
+
+        # Regenerated with another content
+        self.write_graph('{"journals":[1]}', mtime_ns=3_000_000_000)
+        self.assertEqual(self.query("a"), ["a", 2])
+
+    def test_least_recently_used_results_are_evicted(self):
+        result_size = len(b'["a", 1]')
+        max_bytes = 2 * result_size
+
+        self.query("a", max_bytes)
+        self.query("b", max_bytes)
+        self.query("a", max_bytes)  # `b` is now the least recently used
+        self.query("c", max_bytes)
+
+        self.assertEqual(self.query("a", max_bytes), ["a", 1])
+        self.assertEqual(self.query("b", max_bytes), ["b", 4])
+
+    def test_cached_adhoc_queries_match_the_uncached_ones(self):
+        for _ in range(2):
+            self.assertEqual(
+                fetch_top_journals(
+                    metric="total_mentions", top_n=3, query_cache=self.query_cache
+                ),
+                fetch_top_journals(metric="total_mentions", top_n=3),
+            )
+            self.assertEqual(
+                sorted(
+                    fetch_drugs_mentioned_by_pubmed_journals(
+                        "Tetracycline", query_cache=self.query_cache
+                    )
+                ),
+                sorted(fetch_drugs_mentioned_by_pubmed_journals("Tetracycline")),
+            )
+
+        self.assertEqual(self.get_statistics(), {"hits": 2, "misses": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
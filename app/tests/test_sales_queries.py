@@ -0,0 +1,97 @@
+# Third-party packages
+import pandas as pd
+
+# Built-in packages
+import importlib.util
+import unittest
+from contextlib import closing
+
+# My Custom packages
+import app.src.sales.engine as E
+import app.src.sales.generate as G
+from app.src.sales.queries import (
+    rewrite_bigquery_sql,
+    load_sales_query,
+    benchmark_sales_queries,
+)
+
+
+class TestSalesQueries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nb_transactions = 5_000
+        cls.nb_clients = 50
+        cls.nb_products = 20
+
+        # Expected results computed with pandas on the same generated data
+        transactions_df = pd.concat(
+            G.generate_transactions(
+                cls.nb_transactions, cls.nb_clients, cls.nb_products
+            )
+        )
+        products_df = G.generate_product_nomenclature(cls.nb_products)
+
+        transactions_df = transactions_df[
+            transactions_df["date"].between("2019-01-01", "2019-12-31")
+        ]
+        transactions_df = transactions_df.assign(
+            ventes=transactions_df["prod_price"] * transactions_df["prod_qty"]
+        )
+
+        cls.expected_sales_by_day = (
+            transactions_df.groupby("date")["ventes"].sum().sort_index()
+        )
+        cls.expected_nb_clients = transactions_df["client_id"].nunique()
+
+    def test_rewrite_bigquery_sql(self):
+        query = 'SELECT * FROM `test_sevrier.TRANSACTIONS` AS t WHERE t.date BETWEEN "2019-01-01" AND "2019-12-31" AND x = \'DECO\''
+        expected_query = "SELECT * FROM TRANSACTIONS AS t WHERE t.date BETWEEN '2019-01-01' AND '2019-12-31' AND x = 'DECO'"
+
+        self.assertEqual(rewrite_bigquery_sql(query), expected_query)
+
+    def assert_engine_matches_pandas(self, engine: str):
+        with closing(E.connect(engine)) as connection:
+            E.create_sales_tables(
+                connection,
+                engine,
+                nb_transactions=self.nb_transactions,
+                nb_clients=self.nb_clients,
+                nb_products=self.nb_products,
+            )
+
+            sales_by_day = pd.DataFrame(
+                connection.execute(load_sales_query("query_1_sales_by_day")).fetchall(),
+                columns=["date", "ventes"],
+            )
+            results = benchmark_sales_queries(connection, nb_runs=1)
+
+        self.assertEqual(
+            sales_by_day["date"].astype(str).tolist(),
+            self.expected_sales_by_day.index.tolist(),
+        )
+        self.assertEqual(
+            sales_by_day["ventes"].round(6).tolist(),
+            self.expected_sales_by_day.round(6).tolist(),
+        )
+        self.assertEqual(
+            results["query_2_sales_by_product_type"]["nb_rows"],
+            self.expected_nb_clients,
+        )
+
+    def test_sqlite_engine_matches_pandas(self):
+        self.assert_engine_matches_pandas("sqlite")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("duckdb"), "The duckdb package is not installed"
+    )
+    def test_duckdb_engine_matches_pandas(self):
+        self.assert_engine_matches_pandas("duckdb")
+
+    def test_parquet_layout_requires_duckdb(self):
+        with closing(E.connect("sqlite")) as connection:
+            with self.assertRaises(ValueError):
+                E.apply_table_layout(connection, "sqlite", "partitioned_parquet")
+
+
+if __name__ == "__main__":
+    unittest.main()
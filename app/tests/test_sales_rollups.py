@@ -0,0 +1,65 @@
+# Built-in packages
+import importlib.util
+import unittest
+
+# My Custom packages
+import app.src.sales.engine as E
+from app.src.sales.rollups import (
+    create_rollup_tables,
+    update_rollups,
+    check_rollup_queries,
+)
+
+
+class TestSalesRollups(unittest.TestCase):
+    def create_connection(self, engine: str):
+        connection = E.connect(engine)
+        E.create_sales_tables(
+            connection, engine, nb_transactions=5_000, nb_clients=50, nb_products=20
+        )
+        create_rollup_tables(connection)
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_rollup_queries_match_raw_queries(self):
+        connection = self.create_connection("sqlite")
+        update_rollups(connection, "2018-07-01", "2020-06-30")
+
+        self.assertEqual(
+            check_rollup_queries(connection),
+            {"query_1_sales_by_day": True, "query_2_sales_by_product_type": True},
+        )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("duckdb"), "The duckdb package is not installed"
+    )
+    def test_rollup_queries_match_raw_queries_duckdb(self):
+        connection = self.create_connection("duckdb")
+        update_rollups(connection, "2018-07-01", "2020-06-30")
+
+        self.assertEqual(
+            check_rollup_queries(connection),
+            {"query_1_sales_by_day": True, "query_2_sales_by_product_type": True},
+        )
+
+    def test_daily_updates_are_idempotent(self):
+        connection = self.create_connection("sqlite")
+
+        # Append January day by day, running the first days twice
+        for day in range(1, 32):
+            update_rollups(connection, f"2019-01-{day:02d}", f"2019-01-{day:02d}")
+        for day in range(1, 4):
+            update_rollups(connection, f"2019-01-{day:02d}", f"2019-01-{day:02d}")
+
+        rollup_total = connection.execute(
+            "SELECT SUM(ventes) FROM SALES_BY_CLIENT_PRODUCT_TYPE"
+        ).fetchone()[0]
+        raw_total = connection.execute(
+            "SELECT SUM(prod_price * prod_qty) FROM TRANSACTIONS WHERE date BETWEEN '2019-01-01' AND '2019-01-31'"
+        ).fetchone()[0]
+
+        self.assertAlmostEqual(rollup_total, raw_total, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
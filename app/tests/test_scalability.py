@@ -0,0 +1,278 @@
+# Third-party packages
+import numpy as np
+import pandas as pd
+from pandera.typing import DataFrame
+
+# Built-in packages
+import os
+import tempfile
+import time
+import unittest
+from contextlib import closing
+from typing import Callable, Dict, List
+
+# My Custom packages
+from app.main import clean_dataframes
+from app.utils.my_logger import is_enabled_env_flag
+import app.src.adhoc.json_processing as A
+import app.src.adhoc.sql_processing as S
+import app.src.pandas_processing.load as L
+import app.src.pandas_processing.transform as T
+
+# Linear growth, plus a tolerance for the fixed costs and the noise of the timings
+MAX_GROWTH_EXPONENT = float(os.environ.get("ScalabilityMaxExponent", "1.3"))
+# Each input size is about 1.4 times the previous one, from the base size to 8 times the base size
+SCALE_FACTORS = [2 ** (step / 2) for step in range(7)]
+NB_RUNS = 5
+# Shorter timings are mostly noise, the entry point is called as many times as needed to run for at least this duration (in seconds)
+MIN_TIMING_DURATION = 0.1
+WORDS = ["Study", "Of", "Patients", "Treated", "With", "Acute", "Chronic"]
+
+
+def fit_growth_exponent(sizes: List, durations: List) -> float:
+    """
+    Returns the exponent k of the growth of the durations with the input sizes (duration ~ size^k), fitted on a log-log scale.
+    It is about 1 for a linear growth and 2 for a quadratic one.
+    """
+    slope, _ = np.polyfit(np.log(sizes), np.log(durations), 1)
+
+    return float(slope)
+
+
+def time_calls(function: Callable, nb_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(nb_calls):
+        function()
+
+    return time.perf_counter() - start
+
+
+def measure_duration(function: Callable, nb_runs: int = NB_RUNS) -> float:
+    """
+    Returns the duration of a call of the function, from the shortest of its runs (the least disturbed by the other processes).
+    Each run calls the function as many times as needed to last at least MIN_TIMING_DURATION, like `timeit`.
+    """
+    nb_calls = 1
+    duration = time_calls(function, nb_calls)
+    while duration < MIN_TIMING_DURATION:
+        nb_calls *= 2
+        duration = time_calls(function, nb_calls)
+
+    durations = [duration] + [
+        time_calls(function, nb_calls) for _ in range(nb_runs - 1)
+    ]
+
+    return min(durations) / nb_calls
+
+
+def generate_drugs(nb_drugs: int) -> DataFrame:
+    return pd.DataFrame(
+        {"name": [f"Drug{number}" for number in range(nb_drugs)]},
+        index=pd.Index(
+            [f"A{number:05d}" for number in range(nb_drugs)], name="atccode"
+        ),
+    )
+
+
+def generate_titles(rng: np.random.Generator, nb_titles: int, nb_drugs: int) -> List:
+    # Half of the titles mention a drug, the other half an unknown drug name
+    return [
+        " ".join(rng.choice(WORDS, size=4)) + f" Drug{number}"
+        for number in rng.integers(0, 2 * nb_drugs, nb_titles)
+    ]
+
+
+def generate_articles(
+    nb_articles: int, nb_journals: int, nb_drugs: int, seed: int = 0
+) -> DataFrame:
+    """
+    Generates articles shaped like the cleaned articles of the pipeline (indexed by ID).
+    """
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(
+        {
+            "title": generate_titles(rng, nb_articles, nb_drugs),
+            "date": pd.Timestamp("2019-01-01")
+            + pd.to_timedelta(rng.integers(0, 1000, nb_articles), unit="D"),
+            "journal": [
+                f"Journal {number}"
+                for number in rng.integers(0, nb_journals, nb_articles)
+            ],
+            "article_type": rng.choice(["PubMed", "ClinicalTrial"], size=nb_articles),
+        },
+        index=pd.Index([str(number) for number in range(nb_articles)], name="id"),
+    )
+
+
+def generate_raw_inputs(nb_rows: int, seed: int = 0) -> List:
+    """
+    Generates the clinical trials, pubmed articles and drugs as loaded from the input files, with duplicate rows and missing IDs.
+    """
+    rng = np.random.default_rng(seed)
+    nb_drugs = max(nb_rows // 100, 1)
+    dates = pd.Timestamp("2019-01-01") + pd.to_timedelta(
+        rng.integers(0, 1000, nb_rows), unit="D"
+    )
+    journals = [
+        f"journal of {number}" for number in rng.integers(0, nb_rows // 20, nb_rows)
+    ]
+    titles = generate_titles(rng, nb_rows, nb_drugs)
+    # One row in ten duplicates the previous one
+    duplicated = np.arange(nb_rows) - (np.arange(nb_rows) % 10 == 9)
+
+    clinical_df = pd.DataFrame(
+        {
+            "id": [f"NCT{number:08d}" for number in duplicated],
+            "scientific_title": [titles[number] for number in duplicated],
+            "date": [
+                f"{dates[number].day} {dates[number]:%B %Y}" for number in duplicated
+            ],
+            "journal": [journals[number] for number in duplicated],
+        }
+    )
+    pubmed_df = pd.DataFrame(
+        {
+            "id": [
+                None if number % 7 == 0 else number + 1 for number in range(nb_rows)
+            ],
+            "title": titles,
+            "date": dates.strftime("%d/%m/%Y"),
+            "journal": journals,
+        }
+    )
+    drugs_df = generate_drugs(nb_drugs).reset_index().rename(columns={"name": "drug"})
+
+    return clinical_df, pubmed_df, drugs_df
+
+
+def generate_graph(nb_journals: int, nb_drugs: int = 50, seed: int = 0) -> Dict:
+    """
+    Generates a link graph of 20 mentions per journal on average.
+    """
+    articles_df = generate_articles(20 * nb_journals, nb_journals, nb_drugs, seed)
+
+    return T.build_link_graph_from_df(articles_df, generate_drugs(nb_drugs))
+
+
+class TestGrowthExponent(unittest.TestCase):
+    def test_fit_growth_exponent(self):
+        sizes = [1000, 2000, 4000, 8000]
+
+        self.assertAlmostEqual(
+            fit_growth_exponent(sizes, [size * 1e-6 + 1e-9 for size in sizes]), 1, 2
+        )
+        self.assertAlmostEqual(
+            fit_growth_exponent(sizes, [size**2 * 1e-9 for size in sizes]), 2, 2
+        )
+
+
+@unittest.skipUnless(
+    is_enabled_env_flag("RunScalabilityTests"),
+    "The scalability tests only run with the RunScalabilityTests=1 environment variable",
+)
+class TestScalability(unittest.TestCase):
+    """
+    Runs the entry points of the pipeline and of the adhoc queries at several input sizes, each twice the previous one,
+    and fails when their duration grows faster than linearly (beyond MAX_GROWTH_EXPONENT).
+    """
+
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.test_folder = self.temp_folder.name
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def assert_scales_linearly(
+        self, base_size: int, build_inputs: Callable, run: Callable
+    ) -> None:
+        """
+        Times `run(*build_inputs(size))` at each size (the inputs are built outside the timings), then checks the growth exponent.
+        The duration of each size is the best of NB_RUNS runs.
+        """
+        sizes = [round(base_size * scale_factor) for scale_factor in SCALE_FACTORS]
+        durations = []
+
+        for size in sizes:
+            inputs = build_inputs(size)
+            durations.append(measure_duration(lambda: run(*inputs)))
+
+        growth_exponent = fit_growth_exponent(sizes, durations)
+        self.assertLessEqual(
+            growth_exponent,
+            MAX_GROWTH_EXPONENT,
+            f"Superlinear growth (exponent {growth_exponent:.2f}), durations "
+            + ", ".join(
+                f"{duration:.3f}s for {size}"
+                for size, duration in zip(sizes, durations)
+            ),
+        )
+
+    def test_link_graph_scales_with_articles_and_journals(self):
+        # 20 articles per journal, catches a cost in journals x articles
+        self.assert_scales_linearly(
+            2000,
+            lambda size: (generate_articles(size, size // 20, 20), generate_drugs(20)),
+            T.build_link_graph_from_df,
+        )
+
+    def test_link_graph_scales_with_articles_and_drugs(self):
+        # 1 drug per 100 articles, catches a cost in articles x drugs
+        self.assert_scales_linearly(
+            2000,
+            lambda size: (
+                generate_articles(size, 50, size // 100),
+                generate_drugs(size // 100),
+            ),
+            T.build_link_graph_from_df,
+        )
+
+    def test_clean_dataframes_scales_with_rows(self):
+        self.assert_scales_linearly(1000, generate_raw_inputs, clean_dataframes)
+
+    def test_load_input_data_scales_with_rows(self):
+        def write_input_files(size: int) -> List:
+            _, pubmed_df, _ = generate_raw_inputs(size)
+            csv_path = os.path.join(self.test_folder, f"pubmed_{size}.csv")
+            json_path = os.path.join(self.test_folder, f"pubmed_{size}.json")
+            pubmed_df.to_csv(csv_path, index=False)
+            pubmed_df.to_json(json_path, orient="records")
+
+            return [[csv_path, json_path]]
+
+        self.assert_scales_linearly(10000, write_input_files, L.load_input_data)
+
+    def test_json_adhoc_queries_scale_with_journals(self):
+        def run_queries(journals: List) -> None:
+            A.rank_top_journals(journals, metric="unique_drugs", top_n=10)
+            A.get_drugs_mentioned_by_similar_journals(
+                journals, drug_name="Drug1", skip_clinical_trials=True
+            )
+
+        self.assert_scales_linearly(
+            250, lambda size: (generate_graph(size)["journals"],), run_queries
+        )
+
+    def test_sql_adhoc_queries_scale_with_journals(self):
+        def build_graph_store(size: int) -> List:
+            graph_store_path = os.path.join(self.test_folder, f"graph_{size}.db")
+            with closing(S.open_graph_store(graph_store_path)) as connection:
+                S.write_graph_to_store(connection, generate_graph(size))
+
+            return [graph_store_path]
+
+        def run_queries(graph_store_path: str) -> None:
+            with closing(
+                S.open_graph_store(graph_store_path, create_if_missing=False)
+            ) as connection:
+                S.get_top_journals(connection, metric="unique_drugs", top_n=10)
+                S.get_drugs_mentioned_by_similar_journals(
+                    connection, drug_name="Drug1", skip_clinical_trials=True
+                )
+
+        self.assert_scales_linearly(250, build_graph_store, run_queries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# Third-party packages
+import pandas as pd
+
+# Built-in packages
+import importlib.util
+import os
+import unittest
+
+# My Custom packages
+from app.main import (
+    build_graph_link_with_pandas,
+    drop_duplicate_ids,
+    merge_articles_dfs,
+)
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+    OUTPUT_PATH,
+)
+import app.src.pandas_processing.clean as C
+import app.src.pandas_processing.spill as SP
+from app.utils.files_processing import import_json_file_as_dict
+
+
+class TestSpill(unittest.TestCase):
+    def test_parse_memory_limit(self):
+        self.assertEqual(SP.parse_memory_limit("512"), 512)
+        self.assertEqual(SP.parse_memory_limit("2KB"), 2048)
+        self.assertEqual(SP.parse_memory_limit("1.5 GiB"), 1.5 * 1024**3)
+        self.assertEqual(SP.parse_memory_limit("3m"), 3 * 1024**2)
+
+        with self.assertRaises(ValueError):
+            SP.parse_memory_limit("a lot")
+
+    def test_kept_articles_mask_matches_the_cleaning_steps(self):
+        # The duplicate IDs are spread over several journals, and an empty title comes before the first valid row of an ID
+        articles_df = pd.DataFrame(
+            {
+                "id": ["1", "2", "1", "3", "2", "4", "4"],
+                "title": ["A", "", "B", "C", "D", "E", "F"],
+                "journal": ["J1", "J2", "J2", "", "J1", "J3", None],
+            },
+            index=[0, 1, 0, 1, 0, 1, 0],  # Concatenated dataframes keep their index
+        )
+
+        expected_df = C.drop_duplicate_ids_then_index_df(
+            C.drop_empty_titles_and_journals(articles_df), "id"
+        )
+        kept_df = articles_df[SP.get_kept_articles_mask(articles_df)].set_index("id")
+
+        pd.testing.assert_frame_equal(kept_df, expected_df)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "The pyarrow package is not installed"
+    )
+    def test_spilled_graph_matches_golden_output(self):
+        expected_graph = import_json_file_as_dict(OUTPUT_PATH)
+        input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+
+        # A budget of a few bytes spills the articles into the maximum number of partitions
+        for memory_limit in [1, 4096]:
+            with self.subTest(memory_limit=memory_limit):
+                result_graph = build_graph_link_with_pandas(
+                    *input_paths, memory_limit=memory_limit
+                )
+
+                self.assertEqual(result_graph, expected_graph)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "The pyarrow package is not installed"
+    )
+    def test_spilled_partitions_group_the_journals(self):
+        # The IDs are duplicated within and across the sources, and a few titles and journals are empty
+        pubmed_df = pd.DataFrame(
+            {
+                "id": [str(article_id % 60) for article_id in range(100)],
+                "title": [f"Title {article_id}" for article_id in range(100)],
+                "journal": [
+                    "" if article_id % 13 == 0 else f"Journal {article_id % 7}"
+                    for article_id in range(100)
+                ],
+            }
+        )
+        clinical_df = pd.DataFrame(
+            {
+                "id": [f"NCT{article_id % 10}" for article_id in range(20)] + ["5"],
+                "title": [f"Trial {article_id}" for article_id in range(21)],
+                "journal": [f"Journal {article_id % 9}" for article_id in range(21)],
+            }
+        )
+        journal_alias_map = {"Journal 8": "Journal 1"}
+
+        expected_df = merge_articles_dfs(clinical_df, pubmed_df)
+        expected_df["journal"] = expected_df["journal"].replace(journal_alias_map)
+        expected_df, _ = drop_duplicate_ids(expected_df, pd.DataFrame({"atccode": []}))
+
+        spilled_sources = SP.spill_articles_by_id(
+            {"PubMed": pubmed_df, "ClinicalTrial": clinical_df},
+            nb_partitions=3,
+            journal_alias_map=journal_alias_map,
+        )
+        try:
+            spilled_articles = SP.dedupe_spilled_articles(spilled_sources)
+            # The ID partitions are removed once deduped
+            self.assertEqual(
+                sorted(os.listdir(spilled_articles.spill_dir)),
+                [f"articles_by_journal_{partition}.arrow" for partition in range(3)],
+            )
+            partitions = list(SP.iter_spilled_partitions(spilled_articles))
+        finally:
+            SP.remove_spilled_articles(spilled_sources)
+
+        self.assertFalse(os.path.exists(spilled_articles.spill_dir))
+        self.assertEqual(
+            spilled_articles.journals, list(expected_df["journal"].unique())
+        )
+        # Each journal is in a single partition, and the articles keep their order
+        journals_per_partition = [set(df["journal"]) for df in partitions]
+        self.assertEqual(
+            sum(len(journals) for journals in journals_per_partition),
+            len(spilled_articles.journals),
+        )
+        result_df = pd.concat(partitions)
+        for journal in spilled_articles.journals:
+            pd.testing.assert_frame_equal(
+                result_df[result_df["journal"] == journal],
+                expected_df[expected_df["journal"] == journal],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
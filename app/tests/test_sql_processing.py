@@ -0,0 +1,159 @@
+# Built-in packages
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+
+# My Custom packages
+import app.src.adhoc.json_processing as A
+from app.src.adhoc.sql_processing import (
+    open_graph_store,
+    write_graph_to_store,
+    get_top_journals,
+    get_drugs_mentioned_by_similar_journals,
+    run_query,
+)
+from app.main import fetch_top_journals
+from app.src.constants import OUTPUT_PATH
+from app.utils.files_processing import import_json_file_as_dict
+
+
+class TestSqlProcessing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.graph_link_dict = import_json_file_as_dict(OUTPUT_PATH)
+
+    def setUp(self):
+        self.connection = open_graph_store(":memory:")
+        write_graph_to_store(self.connection, self.graph_link_dict)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_tables_are_populated(self):
+        result_df = run_query(
+            self.connection,
+            "SELECT (SELECT COUNT(*) FROM journals) AS nb_journals, (SELECT COUNT(*) FROM mentions) AS nb_mentions",
+        )
+
+        nb_mentions = sum(
+            len(journal["referencedBy"]["pubmedArticles"])
+            + len(journal["referencedBy"]["clinicalTrials"])
+            for journal in self.graph_link_dict["journals"]
+        )
+
+        self.assertEqual(
+            result_df.iloc[0]["nb_journals"], len(self.graph_link_dict["journals"])
+        )
+        self.assertEqual(result_df.iloc[0]["nb_mentions"], nb_mentions)
+
+    def test_writing_twice_replaces_the_graph(self):
+        write_graph_to_store(self.connection, self.graph_link_dict)
+
+        result_df = run_query(self.connection, "SELECT COUNT(*) AS n FROM journals")
+        self.assertEqual(result_df.iloc[0]["n"], len(self.graph_link_dict["journals"]))
+
+    def test_top_journals_match_json_processing(self):
+        self.assertEqual(
+            [title for title, _ in get_top_journals(self.connection)],
+            fetch_top_journals(),
+        )
+
+        for metric in A.RANKING_METRICS:
+            for top_n in [1, 2, 3, 100]:
+                expected_result = A.rank_top_journals(
+                    self.graph_link_dict["journals"], metric=metric, top_n=top_n
+                )
+                result = get_top_journals(self.connection, metric=metric, top_n=top_n)
+
+                self.assertEqual(result, expected_result)
+
+    def test_drug_mentions_match_json_processing(self):
+        drug_names = run_query(self.connection, "SELECT name FROM drugs")["name"]
+
+        for drug_name in drug_names:
+            for skip_clinical_trials in [True, False]:
+                expected_result = A.get_drugs_mentioned_by_similar_journals(
+                    list_journals=self.graph_link_dict["journals"],
+                    drug_name=drug_name,
+                    skip_clinical_trials=skip_clinical_trials,
+                )
+
+                result = get_drugs_mentioned_by_similar_journals(
+                    self.connection,
+                    drug_name=drug_name,
+                    skip_clinical_trials=skip_clinical_trials,
+                )
+
+                self.assertEqual(result, expected_result)
+
+    def test_unknown_drug_returns_empty_set(self):
+        result = get_drugs_mentioned_by_similar_journals(
+            self.connection, drug_name="Unknown", skip_clinical_trials=True
+        )
+        self.assertEqual(result, set())
+
+    def test_drug_matched_by_two_aliases_counts_twice(self):
+        def build_mention(article_id: str, matched_alias: str) -> dict:
+            return {
+                "articleId": article_id,
+                "articleTitle": "Aspirin Versus Asa",
+                "mentionDate": "2020-01-01",
+                "mentionedDrugID": "B01AC",
+                "mentionedDrugName": "Aspirin",
+                "matchedAlias": matched_alias,
+            }
+
+        journals = [
+            {
+                "title": "Journal Of Aliases",
+                "referencedBy": {
+                    "pubmedArticles": [
+                        build_mention("1", "Aspirin"),
+                        build_mention("1", "Asa"),
+                    ],
+                    "clinicalTrials": [],
+                },
+            },
+            {
+                "title": "Journal Of Names",
+                "referencedBy": {
+                    "pubmedArticles": [build_mention("2", "Aspirin")],
+                    "clinicalTrials": [build_mention("3", "Aspirin")],
+                },
+            },
+        ]
+        write_graph_to_store(self.connection, {"journals": journals})
+
+        for metric in A.RANKING_METRICS:
+            with self.subTest(metric=metric):
+                self.assertEqual(
+                    get_top_journals(self.connection, metric=metric, top_n=2),
+                    A.rank_top_journals(journals, metric=metric, top_n=2),
+                )
+
+    def test_store_of_another_version_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as temp_folder:
+            db_path = os.path.join(temp_folder, "graph_link.db")
+            with closing(sqlite3.connect(db_path)) as connection:
+                connection.execute(
+                    "CREATE TABLE mentions (article_id TEXT, drug_id TEXT, mention_date TEXT)"
+                )
+
+            with self.assertRaises(ValueError):
+                open_graph_store(db_path, create_if_missing=False)
+
+            with closing(open_graph_store(db_path)) as connection:
+                write_graph_to_store(connection, self.graph_link_dict)
+
+            with closing(
+                open_graph_store(db_path, create_if_missing=False)
+            ) as connection:
+                self.assertEqual(
+                    get_top_journals(connection), get_top_journals(self.connection)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# Built-in packages
+import filecmp
+import os
+import shutil
+import threading
+import unittest
+
+# My Custom packages
+from app.main import generate_graph_link
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+)
+from app.utils.stage_scheduler import (
+    Stage,
+    open_stage_cache,
+    run_stages,
+    sort_stages,
+)
+
+TEST_FOLDER = "output/test_stage_scheduler"
+
+
+class TestStageScheduler(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = os.path.join(TEST_FOLDER, "stages")
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+
+    def get_stages(self) -> list:
+        def record(name, value):
+            self.calls.append(name)
+            return value
+
+        return [
+            Stage(
+                "total",
+                lambda left, right: record("total", left + right),
+                ["left", "right"],
+            ),
+            Stage("left", lambda: record("left", 1)),
+            Stage("right", lambda: record("right", 2)),
+        ]
+
+    def test_stages_are_sorted_after_their_inputs(self):
+        names = [stage.name for stage in sort_stages(self.get_stages())]
+
+        self.assertEqual(names, ["left", "right", "total"])
+
+    def test_invalid_dags_are_rejected(self):
+        cyclic_stages = [
+            Stage("a", lambda b: b, ["b"]),
+            Stage("b", lambda a: a, ["a"]),
+        ]
+        unknown_input_stages = [Stage("a", lambda c: c, ["c"])]
+
+        for stages in [cyclic_stages, unknown_input_stages]:
+            with self.subTest(stages=stages):
+                with self.assertRaises(ValueError):
+                    run_stages(stages)
+
+    def test_independent_stages_run_concurrently(self):
+        # Each branch waits for the other one : the run only completes when both run at the same time
+        barrier = threading.Barrier(2, timeout=10)
+
+        def wait_for_other_branch(value):
+            barrier.wait()
+            return value
+
+        stages = [
+            Stage("left", lambda: wait_for_other_branch(1)),
+            Stage("right", lambda: wait_for_other_branch(2)),
+            Stage("total", lambda left, right: left + right, ["left", "right"]),
+        ]
+
+        outputs, timings = run_stages(stages, max_workers=2, output_stages=["total"])
+
+        self.assertEqual(outputs, {"total": 3})
+        self.assertEqual(set(timings), {"left", "right", "total"})
+
+    def test_cached_stages_are_reused_unless_rerun(self):
+        run_stages(self.get_stages(), cache_dir=self.cache_dir)
+        self.assertEqual(sorted(self.calls), ["left", "right", "total"])
+
+        self.calls.clear()
+        outputs, _ = run_stages(
+            self.get_stages(), cache_dir=self.cache_dir, output_stages=["total"]
+        )
+        self.assertEqual(outputs, {"total": 3})
+        self.assertEqual(self.calls, [])
+
+        # Rerunning a stage also reruns the stages depending on it
+        outputs, _ = run_stages(
+            self.get_stages(),
+            cache_dir=self.cache_dir,
+            rerun_stages=["left"],
+            output_stages=["total"],
+        )
+        self.assertEqual(outputs, {"total": 3})
+        self.assertEqual(self.calls, ["left", "total"])
+
+    def test_changed_inputs_only_clear_the_cached_stages(self):
+        open_stage_cache(self.cache_dir, "first run")
+        run_stages(self.get_stages(), cache_dir=self.cache_dir)
+        os.makedirs(os.path.join(self.cache_dir, "graphs"))
+        with open(os.path.join(self.cache_dir, "graph_link.json"), "w") as hd:
+            hd.write("{}")
+
+        open_stage_cache(self.cache_dir, "second run")
+
+        self.assertEqual(
+            sorted(os.listdir(self.cache_dir)),
+            ["fingerprint.txt", "graph_link.json", "graphs"],
+        )
+
+    def test_refuses_folder_that_is_not_a_stage_cache(self):
+        os.makedirs(self.cache_dir)
+        user_file_path = os.path.join(self.cache_dir, "graph_link.json")
+        with open(user_file_path, "w") as hd:
+            hd.write("{}")
+
+        with self.assertRaises(ValueError):
+            open_stage_cache(self.cache_dir, "fingerprint")
+        self.assertTrue(os.path.exists(user_file_path))
+
+    def test_skipped_stages_need_a_cached_output(self):
+        with self.assertRaises(ValueError):
+            run_stages(self.get_stages(), skip_stages=["left"])
+
+        outputs, _ = run_stages(
+            self.get_stages(), skip_stages=["total"], output_stages=["left"]
+        )
+        self.assertEqual(outputs, {"left": 1})
+        self.assertNotIn("total", self.calls)
+
+    def test_concurrent_and_cached_runs_write_the_same_graph(self):
+        input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+        sequential_path = os.path.join(TEST_FOLDER, "sequential.json")
+        concurrent_path = os.path.join(TEST_FOLDER, "concurrent.json")
+        cached_path = os.path.join(TEST_FOLDER, "cached.json")
+
+        generate_graph_link(*input_paths, output_path=sequential_path)
+        generate_graph_link(
+            *input_paths,
+            output_path=concurrent_path,
+            max_workers=3,
+            stage_cache_dir=self.cache_dir,
+        )
+        timings = generate_graph_link(
+            *input_paths, output_path=cached_path, stage_cache_dir=self.cache_dir
+        )
+
+        self.assertTrue(filecmp.cmp(sequential_path, concurrent_path, shallow=False))
+        self.assertTrue(filecmp.cmp(sequential_path, cached_path, shallow=False))
+        # Only the output stage runs again, the link graph is read from the cache
+        self.assertEqual(list(timings), ["write_graph"])
+
+
+if __name__ == "__main__":
+    unittest.main()
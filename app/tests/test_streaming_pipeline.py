@@ -0,0 +1,110 @@
+# Built-in packages
+import filecmp
+import os
+import shutil
+import threading
+import time
+import unittest
+
+# My Custom packages
+from app.main import generate_graph_link
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+)
+from app.utils.streaming_pipeline import iter_pipeline
+
+TEST_FOLDER = "output/test_streaming_pipeline"
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.nb_threads = threading.active_count()
+
+    def tearDown(self):
+        shutil.rmtree(TEST_FOLDER, ignore_errors=True)
+        # The reader and worker threads never outlive the pipeline
+        self.assertEqual(threading.active_count(), self.nb_threads)
+
+    def test_results_keep_the_order_of_the_items(self):
+        def process(item):
+            # The first items are the slowest, so they complete last
+            time.sleep((10 - item) / 1000)
+            return item * 2
+
+        results = list(iter_pipeline(range(10), process, nb_workers=4))
+
+        self.assertEqual(results, [item * 2 for item in range(10)])
+
+    def test_slow_consumer_pauses_the_reader(self):
+        nb_read_items = 0
+        max_items_ahead = 0
+
+        def read_items():
+            nonlocal nb_read_items
+            for item in range(50):
+                nb_read_items += 1
+                yield item
+
+        for nb_consumed_items, _ in enumerate(
+            iter_pipeline(read_items(), lambda item: item, nb_workers=2, queue_size=3),
+            start=1,
+        ):
+            time.sleep(0.001)
+            max_items_ahead = max(max_items_ahead, nb_read_items - nb_consumed_items)
+
+        # The items in flight, plus the one the reader waits to put
+        self.assertLessEqual(max_items_ahead, 3 + 1)
+
+    def test_errors_are_raised_to_the_consumer(self):
+        def failing_items():
+            yield 1
+            raise OSError("Unreadable input")
+
+        def failing_process(item):
+            if item == 3:
+                raise ValueError("Invalid item")
+            return item
+
+        with self.assertRaises(OSError):
+            list(iter_pipeline(failing_items(), lambda item: item))
+
+        with self.assertRaises(ValueError):
+            list(iter_pipeline(range(10), failing_process, nb_workers=2))
+
+    def test_early_stop_stops_the_threads(self):
+        results = iter_pipeline(range(1000), lambda item: item, nb_workers=2)
+
+        self.assertEqual(next(results), 0)
+        results.close()
+
+    def test_streaming_mode_writes_the_same_graph(self):
+        input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+        expected_path = os.path.join(TEST_FOLDER, "expected.json")
+        streamed_path = os.path.join(TEST_FOLDER, "streamed.json")
+
+        generate_graph_link(*input_paths, output_path=expected_path, pretty=True)
+        timings = generate_graph_link(
+            *input_paths, output_path=streamed_path, pretty=True, link_workers=2
+        )
+
+        self.assertTrue(filecmp.cmp(expected_path, streamed_path, shallow=False))
+        # The graph is written by the link stage
+        self.assertNotIn("write_graph", timings)
+
+        with self.assertRaises(ValueError):
+            generate_graph_link(
+                *input_paths,
+                output_path=streamed_path,
+                link_workers=2,
+                memory_limit=1,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
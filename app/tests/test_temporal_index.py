@@ -0,0 +1,163 @@
+# Built-in packages
+import os
+import tempfile
+import unittest
+
+# My Custom packages
+from app.main import fetch_mention_statistics, generate_graph_link
+from app.src.constants import (
+    CLINICAL_TRIALS_PATHS,
+    PUBMED_PATHS,
+    DRUGS_PATHS,
+)
+from app.src.adhoc.temporal_index import (
+    build_temporal_index,
+    write_temporal_index,
+    load_temporal_index,
+    count_mentions_between,
+    rollup_mentions,
+)
+
+
+class TestTemporalIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        articles = [
+            ("1", "2019-12-30", "DrugA"),
+            ("2", "2020-01-05", "DrugA"),
+            ("3", "2020-01-06", "DrugA"),
+            ("4", "2020-02-15", "DrugB"),
+            ("5", "2021-03-01", "DrugA"),
+        ]
+
+        cls.graph_link_dict = {
+            "journals": [
+                {
+                    "title": "Journal One",
+                    "referencedBy": {
+                        "pubmedArticles": [
+                            {
+                                "articleId": article_id,
+                                "mentionDate": mention_date,
+                                "mentionedDrugName": drug_name,
+                            }
+                            for article_id, mention_date, drug_name in articles[:3]
+                        ],
+                        "clinicalTrials": [],
+                    },
+                },
+                {
+                    "title": "Journal Two",
+                    "referencedBy": {
+                        "pubmedArticles": [],
+                        "clinicalTrials": [
+                            {
+                                "articleId": article_id,
+                                "mentionDate": mention_date,
+                                "mentionedDrugName": drug_name,
+                            }
+                            for article_id, mention_date, drug_name in articles[3:]
+                        ],
+                    },
+                },
+            ]
+        }
+
+    def setUp(self):
+        self.temporal_index = build_temporal_index(self.graph_link_dict)
+
+    def test_count_mentions_between_dates(self):
+        self.assertEqual(
+            count_mentions_between(self.temporal_index, "drug", "DrugA"), 4
+        )
+        self.assertEqual(
+            count_mentions_between(
+                self.temporal_index, "drug", "DrugA", "2020-01-01", "2020-12-31"
+            ),
+            2,
+        )
+        # Both bounds are included
+        self.assertEqual(
+            count_mentions_between(
+                self.temporal_index, "drug", "DrugA", "2019-12-30", "2020-01-06"
+            ),
+            3,
+        )
+        self.assertEqual(
+            count_mentions_between(self.temporal_index, "journal", "Journal Two"), 2
+        )
+        self.assertEqual(
+            count_mentions_between(self.temporal_index, "drug", "DrugZ"), 0
+        )
+
+    def test_rollup_mentions(self):
+        self.assertEqual(
+            rollup_mentions(self.temporal_index, "drug", "DrugA", "year"),
+            {"2019": 1, "2020": 2, "2021": 1},
+        )
+        self.assertEqual(
+            rollup_mentions(self.temporal_index, "drug", "DrugA", "month"),
+            {"2019-12": 1, "2020-01": 2, "2021-03": 1},
+        )
+        # Weeks start on monday : 2019-12-30 and 2020-01-05 are in the same week
+        self.assertEqual(
+            rollup_mentions(
+                self.temporal_index,
+                "journal",
+                "Journal One",
+                "week",
+                end_date="2020-12-31",
+            ),
+            {"2019-12-30": 2, "2020-01-06": 1},
+        )
+        self.assertEqual(
+            rollup_mentions(
+                self.temporal_index, "drug", "DrugB", "day", start_date="2020-01-01"
+            ),
+            {"2020-02-15": 1},
+        )
+
+        with self.assertRaises(ValueError):
+            rollup_mentions(self.temporal_index, "drug", "DrugA", "hour")
+
+    def test_write_then_load_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temporal_index_path = os.path.join(temp_dir, "graph_link_dates.npz")
+
+            write_temporal_index(temporal_index_path, self.temporal_index)
+            loaded_index = load_temporal_index(temporal_index_path)
+
+        self.assertEqual(
+            rollup_mentions(loaded_index, "drug", "DrugA", "year"),
+            rollup_mentions(self.temporal_index, "drug", "DrugA", "year"),
+        )
+
+    def test_index_is_only_built_when_its_path_is_set(self):
+        input_paths = [
+            CLINICAL_TRIALS_PATHS.split(";"),
+            PUBMED_PATHS.split(";"),
+            DRUGS_PATHS.split(";"),
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "graph_link.json")
+            temporal_index_path = os.path.join(temp_dir, "graph_link_dates.npz")
+
+            timings = generate_graph_link(*input_paths, output_path=output_path)
+            self.assertNotIn("write_temporal_index", timings)
+            self.assertFalse(os.path.exists(temporal_index_path))
+
+            timings = generate_graph_link(
+                *input_paths,
+                output_path=output_path,
+                temporal_index_path=temporal_index_path,
+            )
+            self.assertIn("write_temporal_index", timings)
+            self.assertTrue(os.path.exists(temporal_index_path))
+
+        with self.assertRaises(ValueError):
+            fetch_mention_statistics("drug", "Atropine", temporal_index_path=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ import unittest
 
 # My custom packages
 from app.src.pandas_processing.transform import merge_rows
+from app.src.pandas_processing.clean import merge_duplicate_rows
 
 
 class TestTransform(unittest.TestCase):
@@ -94,6 +95,17 @@ class TestTransform(unittest.TestCase):
         # Assertions
         assert_frame_equal(result_df, self.expected_df)
 
+    def test_merge_duplicate_rows_matches_merge_rows(self):
+        articles_group = self.input_df.groupby(["title", "date"], group_keys=False)[
+            self.input_df.columns.tolist()
+        ]
+        expected_df = articles_group.apply(merge_rows).reset_index(drop=True)
+
+        result_df = merge_duplicate_rows(self.input_df, ["title", "date"])
+
+        # Same rows in the same order, only the dtypes inferred by the row by row apply may differ
+        assert_frame_equal(result_df, expected_df, check_dtype=False)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,17 @@
 # Built-in packages
 import os
+import gzip
 import json
-from typing import Dict
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Iterator
 
 # My Custom packages
 from app.utils.my_logger import logger
+from app.utils.json_serializers import get_json_serializer
+
+# Size of the buffer of the output files, much larger than the default 8 KB to reduce the number of system calls
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 
 def create_folders_if_not_exist(output_filepath: str) -> None:
@@ -14,27 +21,199 @@ def create_folders_if_not_exist(output_filepath: str) -> None:
     Parameters:
         - output_filepath (str): The path to the output file.
     """
-    path_split = output_filepath.split("/")
-    current_path = ""
+    output_folder = os.path.dirname(output_filepath)
+
+    if output_folder != "":
+        os.makedirs(output_folder, exist_ok=True)
+
+
+def import_zstandard():
+    """
+    Imports the optional zstandard package, only required to read and write `.zst` files.
+    """
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError(
+            "Reading or writing `.zst` files requires the `zstandard` package, install it with `pip install zstandard`."
+        ) from error
+
+    return zstandard
+
+
+def open_compressed_writer(raw_file: BinaryIO, output_filepath: str) -> BinaryIO:
+    """
+    Wraps the raw output file with the compression matching the file extension (`.gz` or `.zst`), if any.
+    Closing the returned stream never closes the raw file.
+    """
+    if output_filepath.endswith(".gz"):
+        # A fixed modification time keeps the compressed output reproducible
+        return gzip.GzipFile(fileobj=raw_file, mode="wb", filename="", mtime=0)
 
-    for folder in path_split:
-        if "." not in folder and not os.path.exists(folder):
-            current_path += folder + "/"
-            os.makedirs(current_path)
+    elif output_filepath.endswith(".zst"):
+        zstandard = import_zstandard()
+        return zstandard.ZstdCompressor().stream_writer(raw_file, closefd=False)
 
+    return raw_file
 
-def write_dict_to_file(output_filepath: str, dictionary: Dict) -> None:
+
+@contextmanager
+def atomic_output_file(output_filepath: str, fsync: bool = False) -> Iterator[BinaryIO]:
     """
-    Write a dictionary to a file.
+    Opens a binary file where the output is written, compressed with gzip or zstd depending on the extension (`.gz`, `.zst`).
+    The output is written to a temporary file next to the output path, then renamed : the output path either keeps its
+    previous content or holds the complete new one, but never a truncated file.
 
     Parameters:
         - output_filepath (str): The path to the output file.
-        - dictionary (Dict): The dictionary to be written to the file.
+        - fsync (bool): Whether the file (and its folder) are flushed to the disk before returning. Slower, but survives power losses.
+
+    Returns:
+        - Iterator: The binary file to write to.
     """
     create_folders_if_not_exist(output_filepath)
+    temporary_filepath = f"{output_filepath}.{os.getpid()}.tmp"
+
+    try:
+        with open(temporary_filepath, "wb", buffering=WRITE_BUFFER_SIZE) as raw_file:
+            binary_file = open_compressed_writer(raw_file, output_filepath)
+
+            yield binary_file
+
+            if binary_file is not raw_file:
+                binary_file.close()  # Writes the end of the compressed stream
+
+            raw_file.flush()
+            if fsync:
+                os.fsync(raw_file.fileno())
+
+        os.replace(temporary_filepath, output_filepath)
+
+    except BaseException:
+        if os.path.exists(temporary_filepath):
+            os.remove(temporary_filepath)
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Also persist the rename itself
+        folder_fd = os.open(os.path.dirname(output_filepath) or ".", os.O_DIRECTORY)
+        try:
+            os.fsync(folder_fd)
+        finally:
+            os.close(folder_fd)
+
+
+def get_write_statistics(output_filepath: str, start_time: float) -> Dict:
+    """
+    Reports the number of bytes written to the output file (compressed, if so) and the write throughput.
+
+    Parameters:
+        - output_filepath (str): The path to the output file, once written.
+        - start_time (float): The `time.perf_counter()` value when the write started.
+
+    Returns:
+        - Dict: The number of bytes written, the duration in seconds and the throughput in MB/s.
+    """
+    seconds = time.perf_counter() - start_time
+    bytes_written = os.path.getsize(output_filepath)
+    mb_per_second = bytes_written / 1e6 / seconds if seconds > 0 else float("inf")
+
+    logger.info(
+        f"[Output] - Wrote {bytes_written} bytes to {output_filepath} in {seconds:.3f}s ({mb_per_second:.1f} MB/s)."
+    )
+
+    return {
+        "bytes_written": bytes_written,
+        "seconds": seconds,
+        "mb_per_second": mb_per_second,
+    }
+
 
-    with open(output_filepath, "w", encoding="utf-8") as hd:
-        json.dump(dictionary, hd, indent=4, ensure_ascii=False)
+def write_dict_to_file(
+    output_filepath: str, dictionary: Dict, fsync: bool = False, pretty: bool = False
+) -> Dict:
+    """
+    Write a dictionary to a json file, atomically and compressed depending on the extension (`.gz`, `.zst`).
+    The json is compact, unless pretty printing (indented by 4 spaces) is requested.
+
+    Parameters:
+        - output_filepath (str): The path to the output file.
+        - dictionary (Dict): The dictionary to be written to the file.
+        - fsync (bool): Whether the file is flushed to the disk before returning.
+        - pretty (bool): Whether the json is indented, for humans. Larger and slower to write.
+
+    Returns:
+        - Dict: The number of bytes written, the duration in seconds and the throughput in MB/s.
+    """
+    start_time = time.perf_counter()
+
+    with atomic_output_file(output_filepath, fsync=fsync) as hd:
+        get_json_serializer().dump(dictionary, hd, pretty=pretty)
+
+    return get_write_statistics(output_filepath, start_time)
+
+
+def encode_pretty_journal(journal_graph: Dict) -> bytes:
+    """
+    Encodes the graph of a journal indented as in the pretty link graph, where journals are nested twice (so each line is indented twice more).
+    """
+    journal_str = json.dumps(journal_graph, indent=4, ensure_ascii=False)
+
+    return ("        " + journal_str.replace("\n", "\n        ")).encode("utf-8")
+
+
+@contextmanager
+def open_journals_writer(
+    output_filepath: str, fsync: bool = False, pretty: bool = False
+) -> Iterator[Callable]:
+    """
+    Writes a link graph one journal at a time, with the same layout as `write_dict_to_file`, so the journals are written while the next ones are built.
+    The file is written atomically : the output path only holds the new graph once the block exits without error.
+
+    Parameters:
+        - output_filepath (str): The path to the output json file.
+        - fsync (bool): Whether the file is flushed to the disk before returning.
+        - pretty (bool): Whether the json is indented, for humans.
+
+    Returns:
+        - Iterator: The function writing the graph of a journal, to call on each journal in the order of the graph.
+    """
+    serializer = get_json_serializer()
+    nb_journals = 0
+
+    with atomic_output_file(output_filepath, fsync=fsync) as hd:
+
+        def write_journal(journal_graph: Dict) -> None:
+            nonlocal nb_journals
+
+            if pretty:
+                hd.write(b'{\n    "journals": [\n' if nb_journals == 0 else b",\n")
+                hd.write(encode_pretty_journal(journal_graph))
+            else:
+                hd.write(b'{"journals":[' if nb_journals == 0 else b",")
+                serializer.dump(journal_graph, hd)
+            nb_journals += 1
+
+        yield write_journal
+
+        if nb_journals == 0:
+            hd.write(b'{\n    "journals": []\n}' if pretty else b'{"journals":[]}')
+        else:
+            hd.write(b"\n    ]\n}" if pretty else b"]}")
+
+
+def open_input_file(filepath: str) -> BinaryIO:
+    """
+    Opens a binary file for reading, decompressed with gzip or zstd depending on the extension (`.gz`, `.zst`).
+    """
+    if filepath.endswith(".gz"):
+        return gzip.open(filepath, "rb")
+
+    elif filepath.endswith(".zst"):
+        zstandard = import_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb"))
+
+    return open(filepath, "rb")
 
 
 def fix_broken_json(filepath: str) -> Dict:
@@ -47,8 +226,8 @@ def fix_broken_json(filepath: str) -> Dict:
     Returns:
         - cleaned_json: The cleaned JSON data as a dictionary.
     """
-    with open(filepath, "r", encoding="utf-8") as hd:
-        json_str = hd.read()
+    with open_input_file(filepath) as hd:
+        json_str = hd.read().decode("utf-8")
 
     json_str = (
         json_str.replace("null", "None")
@@ -61,21 +240,28 @@ def fix_broken_json(filepath: str) -> Dict:
     return cleaned_json
 
 
-def import_json_file_as_dict(filepath: str) -> Dict:
+def import_json_file_as_dict(filepath: str, is_link_graph: bool = False) -> Dict:
     """
-    Imports a JSON file as a dictionary.
+    Imports a JSON file (optionally compressed, `.gz` or `.zst`) as a dictionary.
 
     Parameters:
         - filepath (str): The path to the JSON file.
+        - is_link_graph (bool): Whether the file is a link graph, its schema is then validated by the serializers supporting it (msgspec).
+          A graph not matching the schema raises the error of the serializer, it is not fixed like a broken json.
 
     Returns:
         - Dict: The JSON data loaded as a dictionary.
     """
+    serializer = get_json_serializer()
+
     try:
-        with open(filepath, "r", encoding="utf-8") as hd:
-            return json.load(hd)
+        with open_input_file(filepath) as hd:
+            return serializer.load(hd, is_link_graph=is_link_graph)
+
+    except serializer.schema_errors:
+        raise
 
-    except ValueError:
+    except serializer.decode_errors:
         logger.warning(
             f"Broken json detected in {filepath}. Attempting to clean it and re-load it."
         )
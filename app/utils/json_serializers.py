@@ -0,0 +1,168 @@
+# Built-in packages
+import importlib.util
+import json
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, List, Tuple, TypedDict
+
+JSON_SERIALIZERS = ["auto", "orjson", "msgspec", "json"]
+
+
+@dataclass
+class JsonSerializer:
+    name: str
+    dump: Callable  # (obj, binary_file, pretty) -> None
+    load: Callable  # (binary_file, is_link_graph) -> obj
+    decode_errors: Tuple  # Exceptions raised on invalid json
+    schema_errors: (
+        Tuple
+    ) = ()  # Exceptions raised on valid json not matching the schema, never fixed
+
+
+def dump_with_json(obj: Any, binary_file: BinaryIO, pretty: bool = False) -> None:
+    """
+    Writes the json with the standard library. The json is encoded in one shot, much faster than streaming it with `json.dump`.
+    """
+    if pretty:
+        json_str = json.dumps(obj, indent=4, ensure_ascii=False)
+    else:
+        json_str = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    binary_file.write(json_str.encode("utf-8"))
+
+
+def load_with_json(binary_file: BinaryIO, is_link_graph: bool = False) -> Any:
+    return json.loads(binary_file.read())
+
+
+def build_json_serializer() -> JsonSerializer:
+    return JsonSerializer(
+        name="json",
+        dump=dump_with_json,
+        load=load_with_json,
+        decode_errors=(ValueError,),
+    )
+
+
+def build_orjson_serializer() -> JsonSerializer:
+    import orjson
+
+    def dump(obj: Any, binary_file: BinaryIO, pretty: bool = False) -> None:
+        if pretty:
+            # orjson only indents with 2 spaces, the pretty output keeps the layout of the standard library
+            dump_with_json(obj, binary_file, pretty=True)
+        else:
+            binary_file.write(orjson.dumps(obj))
+
+    def load(binary_file: BinaryIO, is_link_graph: bool = False) -> Any:
+        return orjson.loads(binary_file.read())
+
+    return JsonSerializer(
+        name="orjson", dump=dump, load=load, decode_errors=(orjson.JSONDecodeError,)
+    )
+
+
+def build_msgspec_serializer() -> JsonSerializer:
+    """
+    The link graph is decoded with typed dictionaries, so its schema is validated while decoding.
+    The typed dictionaries are decoded straight into the dictionaries expected by the adhoc queries, without intermediate objects.
+    """
+    import msgspec
+
+    class RequiredMention(TypedDict):
+        articleId: str
+        articleTitle: str
+        mentionDate: str
+        mentionedDrugID: str
+        mentionedDrugName: str
+
+    class Mention(RequiredMention, total=False):
+        matchedAlias: str
+
+    class ReferencedBy(TypedDict):
+        pubmedArticles: List[Mention]
+        clinicalTrials: List[Mention]
+
+    class Journal(TypedDict):
+        title: str
+        referencedBy: ReferencedBy
+
+    class LinkGraph(TypedDict):
+        journals: List[Journal]
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    graph_decoder = msgspec.json.Decoder(LinkGraph)
+
+    def dump(obj: Any, binary_file: BinaryIO, pretty: bool = False) -> None:
+        if pretty:
+            binary_file.write(msgspec.json.format(encoder.encode(obj), indent=4))
+        else:
+            binary_file.write(encoder.encode(obj))
+
+    def load(binary_file: BinaryIO, is_link_graph: bool = False) -> Any:
+        if is_link_graph:
+            return graph_decoder.decode(binary_file.read())
+        return decoder.decode(binary_file.read())
+
+    return JsonSerializer(
+        name="msgspec",
+        dump=dump,
+        load=load,
+        decode_errors=(msgspec.DecodeError,),
+        # Subclass of DecodeError, but a schema mismatch is not a broken json to fix
+        schema_errors=(msgspec.ValidationError,),
+    )
+
+
+SERIALIZER_BUILDERS = {
+    "orjson": build_orjson_serializer,
+    "msgspec": build_msgspec_serializer,
+    "json": build_json_serializer,
+}
+
+_serializers_cache: Dict = {}
+_default_serializer_name = "auto"
+
+
+def get_json_serializer(name: str = None) -> JsonSerializer:
+    """
+    Returns the json serializer with the given name. With `auto`, the fastest installed serializer is used (orjson, then msgspec, then json).
+
+    Parameters:
+        - name (str): One of `auto`, `orjson`, `msgspec` or `json`. By default, the serializer set with `set_default_json_serializer`.
+
+    Returns:
+        - JsonSerializer: The serializer, with its dump and load functions.
+    """
+    name = name or _default_serializer_name
+
+    if name == "auto":
+        name = next(
+            candidate
+            for candidate in ["orjson", "msgspec", "json"]
+            if candidate == "json" or importlib.util.find_spec(candidate) is not None
+        )
+
+    if name not in SERIALIZER_BUILDERS:
+        raise ValueError(
+            f"The json serializer {name} is not supported (allowed values: {', '.join(JSON_SERIALIZERS)})."
+        )
+
+    if name not in _serializers_cache:
+        try:
+            _serializers_cache[name] = SERIALIZER_BUILDERS[name]()
+        except ImportError as error:
+            raise ImportError(
+                f"The {name} json serializer requires the `{name}` package, install it with `pip install {name}`."
+            ) from error
+
+    return _serializers_cache[name]
+
+
+def set_default_json_serializer(name: str) -> None:
+    """
+    Sets the serializer used to read and write every json file of the application (`auto` by default).
+    """
+    global _default_serializer_name
+
+    get_json_serializer(name)  # Fails early if the serializer is not installed
+    _default_serializer_name = name
@@ -0,0 +1,243 @@
+# Built-in packages
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds in seconds of the duration histograms, from a few milliseconds to 10 minutes
+DURATION_BUCKETS = [0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600]
+
+# Type and help of each metric of a pipeline run, the metrics recorded must be declared here
+METRICS_DEFINITIONS = {
+    "graph_link_rows_loaded_total": (
+        "counter",
+        "Rows loaded from each input file.",
+    ),
+    "graph_link_duplicate_rows_merged_total": (
+        "counter",
+        "Duplicate rows merged into another row of the same key.",
+    ),
+    "graph_link_empty_rows_dropped_total": (
+        "counter",
+        "Articles dropped for an empty title or journal.",
+    ),
+    "graph_link_duplicate_ids_dropped_total": (
+        "counter",
+        "Articles dropped for an ID already used by another article.",
+    ),
+    "graph_link_titles_without_drug_total": (
+        "counter",
+        "Article titles mentioning no drug.",
+    ),
+    "graph_link_journals_linked_total": (
+        "counter",
+        "Journals linked to the drugs mentioned by their articles.",
+    ),
+    "graph_link_edges_emitted_total": (
+        "counter",
+        "Mentions of a drug by an article written to the graph, by article type.",
+    ),
+    "graph_link_stage_duration_seconds": (
+        "histogram",
+        "Duration of each stage run.",
+    ),
+    "graph_link_output_size_bytes": (
+        "gauge",
+        "Size of each output file written.",
+    ),
+    "graph_link_last_run_success": (
+        "gauge",
+        "Whether the last run completed (1) or failed (0).",
+    ),
+    "graph_link_last_run_duration_seconds": (
+        "gauge",
+        "Duration of the last run.",
+    ),
+}
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of a pipeline run, recorded from the stages running concurrently.
+    Each value is identified by the metric name and its labels (e.g. the input file of a row count).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (name, labels) -> number, or bucket counts, sum and count for histograms
+        self.values = {}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values = {}
+
+    def get_key(self, name: str, labels: Dict, metric_type: str) -> Tuple:
+        if METRICS_DEFINITIONS.get(name, (None,))[0] != metric_type:
+            raise ValueError(f"The metric {name} is not a declared {metric_type}.")
+
+        return name, tuple(sorted(labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = self.get_key(name, labels, "counter")
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        key = self.get_key(name, labels, "gauge")
+        with self.lock:
+            self.values[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = self.get_key(name, labels, "histogram")
+        with self.lock:
+            bucket_counts, total, count = self.values.get(
+                key, ([0] * len(DURATION_BUCKETS), 0.0, 0)
+            )
+            bucket_counts = [
+                bucket_count + (value <= upper_bound)
+                for bucket_count, upper_bound in zip(bucket_counts, DURATION_BUCKETS)
+            ]
+            self.values[key] = (bucket_counts, total + value, count + 1)
+
+    def get(self, name: str, **labels):
+        """
+        Returns the value of a counter or gauge (0 when never recorded), or the bucket counts, sum and count of a histogram.
+        """
+        return self.values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def to_prometheus_text(self) -> str:
+        """
+        Formats all the recorded metrics in the Prometheus text exposition format (also read by the textfile collector of the node exporter).
+        """
+        with self.lock:
+            values = dict(self.values)
+
+        lines = []
+        for name, (metric_type, help_text) in METRICS_DEFINITIONS.items():
+            metric_values = sorted(
+                (labels, value)
+                for (value_name, labels), value in values.items()
+                if value_name == name
+            )
+            if not metric_values:
+                continue
+
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+            for labels, value in metric_values:
+                if metric_type != "histogram":
+                    lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+                    continue
+
+                bucket_counts, total, count = value
+                for upper_bound, bucket_count in zip(DURATION_BUCKETS, bucket_counts):
+                    bucket_labels = labels + (("le", format_value(upper_bound)),)
+                    lines.append(
+                        f"{name}_bucket{format_labels(bucket_labels)} {bucket_count}"
+                    )
+                lines += [
+                    f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}",
+                    f"{name}_sum{format_labels(labels)} {format_value(total)}",
+                    f"{name}_count{format_labels(labels)} {count}",
+                ]
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+
+    escaped_labels = [
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels
+    ]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped_labels) + "}"
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(value) if isinstance(value, float) else str(int(value))
+
+
+# Registry of the current process, the pipeline modules record their metrics in it
+METRICS = MetricsRegistry()
+
+
+def increment(name: str, value: float = 1, **labels) -> None:
+    METRICS.increment(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    METRICS.set(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    METRICS.observe(name, value, **labels)
+
+
+def write_metrics_file(metrics_path: str) -> None:
+    """
+    Writes the metrics in the Prometheus text format. The file is replaced atomically, so a collector never reads a partial file.
+    """
+    with U.atomic_output_file(metrics_path) as hd:
+        hd.write(METRICS.to_prometheus_text().encode("utf-8"))
+
+    logger.info(f"[Metrics] - Successfully wrote the run metrics to {metrics_path}.")
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404, "The metrics are served on /metrics")
+            return
+
+        body = METRICS.to_prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"[Metrics] - {format % args}")
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves the metrics on `http://<host>:<port>/metrics` from a background thread, until `shutdown` is called on the returned server.
+
+    Parameters:
+        - port (int): The port of the server, 0 to pick a free one (see `server.server_address`).
+        - host (str): The interface listened to. By default, only the local machine can scrape the metrics.
+
+    Returns:
+        - ThreadingHTTPServer: The running server.
+    """
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    logger.info(
+        f"[Metrics] - Serving the metrics on http://{host}:{server.server_address[1]}/metrics."
+    )
+    return server
+
+
+def serve_until_interrupted(server: ThreadingHTTPServer) -> None:
+    """
+    Keeps serving the metrics of the finished run until the process is interrupted (Ctrl+C, SIGINT), then stops the server.
+    """
+    logger.info("[Metrics] - The run is over, serving its metrics until interrupted.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,9 +1,89 @@
 from loguru import logger
+
+import os
+import threading
+from dataclasses import dataclass, field
 from sys import stderr
+from typing import List, Optional
+
+LOG_LEVELS = ["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"]
+LOG_FORMAT = "<cyan>[{file.name}:{line} - {function}()]</cyan> <green>{time:YYYY-MM-DD HH:mm:ss}</green> - {level} - <level>{message}</level>"
+
+
+def is_enabled_env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ["1", "true", "yes"]
+
+
+def configure_logger(
+    level: Optional[str] = None, json_output: bool = False, enqueue: bool = False
+) -> None:
+    """
+    Replaces the sink of the logger (stderr).
+
+    Parameters:
+        - level (str): The minimum level of the logged messages. By default, the `LogLevel` environment variable, else INFO.
+        - json_output (bool): Whether each message is written as a JSON object (one per line) instead of the colored text format.
+        - enqueue (bool): Whether the messages are written by a background thread, so the logging calls do not wait for stderr.
+    """
+    level = (level or os.environ.get("LogLevel") or "INFO").upper()
+    if level not in LOG_LEVELS:
+        raise ValueError(
+            f"The log level {level} is not supported (allowed values: {', '.join(LOG_LEVELS)})."
+        )
+
+    logger.remove()
+    logger.add(
+        stderr,
+        level=level,
+        format=LOG_FORMAT,
+        serialize=json_output,
+        enqueue=enqueue,
+    )
+
+
+@dataclass
+class AggregatedWarning:
+    """
+    Warning repeated in a hot loop (once per title...), counted instead of logged each time.
+    `flush` then logs a single warning with the number of occurrences and the first samples.
+    """
+
+    message: str  # Completed by the number of occurrences, e.g. `titles had no drug`
+    nb_samples: int = 5
+    count: int = field(default=0, init=False)
+    samples: List = field(default_factory=list, init=False)
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def add(self, sample) -> None:
+        with self.lock:
+            self.count += 1
+            if len(self.samples) < self.nb_samples:
+                self.samples.append(sample)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.count, self.samples = 0, []
+
+    def flush(self) -> int:
+        """
+        Logs the aggregated warning if it occurred since the last flush, then resets it. Returns the number of occurrences.
+        """
+        with self.lock:
+            count, samples = self.count, self.samples
+            self.count, self.samples = 0, []
+
+        if count > 0:
+            logger.opt(depth=1).warning(
+                f"{count} {self.message}, e.g. : "
+                + ", ".join(f"`{sample}`" for sample in samples)
+            )
+
+        return count
+
 
-logger.remove()
-logger.add(
-    stderr,
-    level="INFO",
-    format="<cyan>[{file.name}:{line} - {function}()]</cyan> <green>{time:YYYY-MM-DD HH:mm:ss}</green> - {level} - <level>{message}</level>",
+configure_logger(
+    json_output=is_enabled_env_flag("LogJson"),
+    enqueue=is_enabled_env_flag("LogEnqueue"),
 )
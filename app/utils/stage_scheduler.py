@@ -0,0 +1,261 @@
+# Built-in packages
+import os
+import pickle
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# My Custom packages
+from app.utils.my_logger import logger
+import app.utils.files_processing as U
+
+STAGE_CACHE_FINGERPRINT_FILENAME = "fingerprint.txt"
+# Cached stage outputs, and their temporary files left by an interrupted write
+STAGE_CACHE_FILENAME_PATTERN = re.compile(r"\w+\.pkl(\.\d+\.tmp)?")
+
+
+@dataclass
+class Stage:
+    name: str
+    function: Callable  # Called with the outputs of the input stages, in the order of `inputs`
+    inputs: List = field(default_factory=list)  # Names of the stages it depends on
+    cacheable: bool = True  # False for the stages writing files, which must always run
+
+
+def sort_stages(stages: List) -> List:
+    """
+    Sorts the stages so that each stage comes after its inputs (topological order, ties kept in the declared order).
+    Raises a ValueError when a stage name is duplicated, an input is unknown or the stages have a cycle.
+    """
+    stages_by_name = {}
+    for stage in stages:
+        if stage.name in stages_by_name:
+            raise ValueError(f"The stage {stage.name} is declared twice.")
+        stages_by_name[stage.name] = stage
+
+    for stage in stages:
+        for input_name in stage.inputs:
+            if input_name not in stages_by_name:
+                raise ValueError(
+                    f"The stage {stage.name} depends on the unknown stage {input_name}."
+                )
+
+    sorted_stages = []
+    sorted_names = set()
+    remaining_stages = list(stages)
+
+    while remaining_stages:
+        ready_stages = [
+            stage
+            for stage in remaining_stages
+            if all(input_name in sorted_names for input_name in stage.inputs)
+        ]
+        if not ready_stages:
+            raise ValueError(
+                f"The stages {', '.join(stage.name for stage in remaining_stages)} have a cyclic dependency."
+            )
+
+        sorted_stages += ready_stages
+        sorted_names.update(stage.name for stage in ready_stages)
+        remaining_stages = [
+            stage for stage in remaining_stages if stage.name not in sorted_names
+        ]
+
+    return sorted_stages
+
+
+def get_stage_cache_path(cache_dir: str, stage_name: str) -> str:
+    return os.path.join(cache_dir, f"{stage_name}.pkl")
+
+
+def open_stage_cache(cache_dir: str, fingerprint: str) -> None:
+    """
+    Prepares the folder of the cached stage outputs. The cached outputs are removed when they were computed from other inputs.
+
+    Parameters:
+        - cache_dir (str): The folder of the cached stage outputs.
+        - fingerprint (str): The fingerprint of the inputs and options of the current run.
+
+    Raises ValueError when the folder is not empty and was not created by a previous run (no fingerprint), so its files are never removed.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fingerprint_path = os.path.join(cache_dir, STAGE_CACHE_FINGERPRINT_FILENAME)
+
+    if os.listdir(cache_dir) and not os.path.exists(fingerprint_path):
+        raise ValueError(
+            f"The folder {cache_dir} is not empty and is not a stage cache folder (no {STAGE_CACHE_FINGERPRINT_FILENAME}), use an empty or new folder."
+        )
+
+    if os.path.exists(fingerprint_path):
+        with open(fingerprint_path, "r", encoding="utf-8") as hd:
+            if hd.read() == fingerprint:
+                return
+
+        logger.warning(
+            f"[Stages] - The inputs changed since the stage outputs of {cache_dir} were cached, clearing the cache."
+        )
+        # Only the files written by the scheduler, the other files of the folder are never touched
+        for filename in os.listdir(cache_dir):
+            if STAGE_CACHE_FILENAME_PATTERN.fullmatch(filename):
+                os.remove(os.path.join(cache_dir, filename))
+
+    with open(fingerprint_path, "w", encoding="utf-8") as hd:
+        hd.write(fingerprint)
+
+
+def write_stage_output(cache_dir: str, stage_name: str, output) -> None:
+    with U.atomic_output_file(get_stage_cache_path(cache_dir, stage_name)) as hd:
+        pickle.dump(output, hd, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_stage_output(cache_dir: str, stage_name: str):
+    with open(get_stage_cache_path(cache_dir, stage_name), "rb") as hd:
+        return pickle.load(hd)
+
+
+def plan_stages(
+    sorted_stages: List,
+    cache_dir: Optional[str],
+    rerun_stages: Iterable,
+    skip_stages: Iterable,
+) -> Dict:
+    """
+    Decides what happens to each stage : `run`, `cached` (its cached output is reused) or `skip` (never run).
+    A stage runs when it is rerun, not cacheable, not cached yet, or when one of its inputs runs (its output would change).
+    """
+    plan = {}
+
+    for stage in sorted_stages:
+        is_cached = cache_dir is not None and os.path.exists(
+            get_stage_cache_path(cache_dir, stage.name)
+        )
+
+        if stage.name in skip_stages:
+            plan[stage.name] = "skip"
+        elif (
+            stage.name in rerun_stages
+            or not stage.cacheable
+            or not is_cached
+            or any(plan[input_name] == "run" for input_name in stage.inputs)
+        ):
+            plan[stage.name] = "run"
+        else:
+            plan[stage.name] = "cached"
+
+    return plan
+
+
+def run_stages(
+    stages: List,
+    max_workers: int = 1,
+    cache_dir: Optional[str] = None,
+    rerun_stages: Iterable = (),
+    skip_stages: Iterable = (),
+    output_stages: Iterable = (),
+) -> Tuple[Dict, Dict]:
+    """
+    Runs a DAG of stages : each stage starts as soon as all its inputs are available, so independent stages run concurrently
+    in a pool of threads. With a cache folder, the output of each cacheable stage is saved, and the next runs reuse it instead
+    of running the stage again (unless the stage is rerun, or one of its inputs runs).
+
+    Parameters:
+        - stages (List): The stages to run, in any order.
+        - max_workers (int): The number of stages running at the same time.
+        - cache_dir (str): The folder of the cached stage outputs. By default, no output is cached.
+        - rerun_stages (Iterable): The names of the stages run even when their output is cached (and so the stages depending on them).
+        - skip_stages (Iterable): The names of the stages never run. Their output is read from the cache when another stage needs it.
+        - output_stages (Iterable): The names of the stages whose outputs are returned.
+
+    Returns:
+        - Tuple: The outputs of the output stages, and the duration in seconds of each stage run.
+    """
+    sorted_stages = sort_stages(stages)
+    stages_by_name = {stage.name: stage for stage in sorted_stages}
+
+    for stage_name in [*rerun_stages, *skip_stages, *output_stages]:
+        if stage_name not in stages_by_name:
+            raise ValueError(
+                f"The stage {stage_name} does not exist (allowed values: {', '.join(stages_by_name)})."
+            )
+
+    plan = plan_stages(sorted_stages, cache_dir, rerun_stages, skip_stages)
+
+    # Only the outputs needed by a stage running or returned are loaded from the cache
+    needed_names = set(output_stages)
+    for stage in sorted_stages:
+        if plan[stage.name] == "run":
+            needed_names.update(stage.inputs)
+
+    outputs = {}
+    for stage_name in sorted(needed_names):
+        if plan[stage_name] == "run":
+            continue
+
+        if cache_dir is None or not os.path.exists(
+            get_stage_cache_path(cache_dir, stage_name)
+        ):
+            raise ValueError(
+                f"The stage {stage_name} is skipped, but its output is needed and was never cached."
+            )
+        outputs[stage_name] = load_stage_output(cache_dir, stage_name)
+        logger.info(f"[Stages] - Reused the cached output of {stage_name}.")
+
+    timings = {}
+    waiting_stages = [stage for stage in sorted_stages if plan[stage.name] == "run"]
+
+    # The outputs are released once all the stages using them are done, so large dataframes do not outlive their last use
+    nb_pending_uses = {}
+    for stage in waiting_stages:
+        for input_name in stage.inputs:
+            nb_pending_uses[input_name] = nb_pending_uses.get(input_name, 0) + 1
+
+    def run_stage(stage: Stage):
+        start_time = time.perf_counter()
+        output = stage.function(*[outputs[input_name] for input_name in stage.inputs])
+        timings[stage.name] = time.perf_counter() - start_time
+        logger.info(f"[Stages] - {stage.name} completed in {timings[stage.name]:.3f}s.")
+
+        if cache_dir is not None and stage.cacheable:
+            write_stage_output(cache_dir, stage.name, output)
+
+        return output
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running_stages = {}
+
+        while waiting_stages or running_stages:
+            ready_stages = [
+                stage
+                for stage in waiting_stages
+                if all(input_name in outputs for input_name in stage.inputs)
+            ]
+            for stage in ready_stages:
+                waiting_stages.remove(stage)
+                running_stages[executor.submit(run_stage, stage)] = stage.name
+
+            done_futures, _ = wait(running_stages, return_when=FIRST_COMPLETED)
+            for future in done_futures:
+                stage_name = running_stages.pop(future)
+                try:
+                    outputs[stage_name] = future.result()
+                except BaseException:
+                    # The stages not started yet are dropped, the running ones are awaited by the pool
+                    waiting_stages.clear()
+                    raise
+
+                for input_name in stages_by_name[stage_name].inputs:
+                    nb_pending_uses[input_name] -= 1
+                    if (
+                        nb_pending_uses[input_name] == 0
+                        and input_name not in output_stages
+                    ):
+                        del outputs[input_name]
+
+    logger.info(
+        f"[Stages] - {len(timings)} stage(s) run, {sum(status == 'cached' for status in plan.values())} reused from the cache, "
+        f"{sum(status == 'skip' for status in plan.values())} skipped."
+    )
+
+    return {stage_name: outputs[stage_name] for stage_name in output_stages}, timings
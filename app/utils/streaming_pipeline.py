@@ -0,0 +1,124 @@
+# Built-in packages
+import queue
+import threading
+from typing import Callable, Iterable, Iterator
+
+# Marks the end of the items, sent by the reader to each worker then by each worker to the consumer
+END_OF_ITEMS = object()
+# Delay in seconds between two checks of the stop event by a waiting thread
+STOP_CHECK_INTERVAL = 0.1
+
+
+def put_unless_stopped(
+    bounded_queue: queue.Queue, entry, stop_event: threading.Event
+) -> bool:
+    """
+    Puts the entry in the queue, waiting for a free slot unless the pipeline is stopped. Returns whether the entry was put.
+    """
+    while not stop_event.is_set():
+        try:
+            bounded_queue.put(entry, timeout=STOP_CHECK_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+def iter_pipeline(
+    items: Iterable, process: Callable, nb_workers: int = 1, queue_size: int = 16
+) -> Iterator:
+    """
+    Processes the items with a streaming producer/consumer pipeline, whose stages all run at the same time :
+        - a reader thread iterates the items (reading them from the disk, slicing them...),
+        - a pool of `nb_workers` worker threads calls `process` on each item,
+        - the consumer (the caller iterating this generator) receives the results, in the order of the items.
+    The stages are connected by bounded queues, and at most `queue_size` items are in flight between the reader and the consumer :
+    a slow consumer pauses the reader and the workers (backpressure) instead of buffering all the results.
+    An exception raised by the reader or a worker stops the pipeline and is raised to the consumer.
+
+    Parameters:
+        - items (Iterable): The items to process, iterated in the reader thread.
+        - process (Callable): The function called on each item, in the worker threads.
+        - nb_workers (int): The number of worker threads.
+        - queue_size (int): The maximum number of items in flight.
+
+    Returns:
+        - Iterator: The result of `process` on each item, in the order of the items.
+    """
+    if nb_workers < 1 or queue_size < 1:
+        raise ValueError(
+            "The pipeline needs at least one worker and a queue of at least one item."
+        )
+
+    input_queue = queue.Queue(maxsize=queue_size)
+    # Bounded by the in flight slots : an item keeps its slot until the consumer received its result
+    output_queue = queue.Queue()
+    in_flight_slots = threading.Semaphore(queue_size)
+    stop_event = threading.Event()
+
+    def read():
+        try:
+            for position, item in enumerate(items):
+                while not in_flight_slots.acquire(timeout=STOP_CHECK_INTERVAL):
+                    if stop_event.is_set():
+                        return
+                if not put_unless_stopped(input_queue, (position, item), stop_event):
+                    return
+        except BaseException as error:
+            output_queue.put((None, error))
+        finally:
+            for _ in range(nb_workers):
+                put_unless_stopped(input_queue, END_OF_ITEMS, stop_event)
+
+    def work():
+        while not stop_event.is_set():
+            try:
+                entry = input_queue.get(timeout=STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if entry is END_OF_ITEMS:
+                output_queue.put(END_OF_ITEMS)
+                return
+
+            position, item = entry
+            try:
+                output_queue.put((position, process(item)))
+            except BaseException as error:
+                output_queue.put((None, error))
+                return
+
+    threads = [threading.Thread(target=read, daemon=True)] + [
+        threading.Thread(target=work, daemon=True) for _ in range(nb_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        # Results received before the results of the previous items
+        pending_results = {}
+        next_position = 0
+        nb_finished_workers = 0
+
+        while nb_finished_workers < nb_workers:
+            entry = output_queue.get()
+            if entry is END_OF_ITEMS:
+                nb_finished_workers += 1
+                continue
+
+            position, result = entry
+            if position is None:
+                raise result
+
+            pending_results[position] = result
+            while next_position in pending_results:
+                yield pending_results.pop(next_position)
+                in_flight_slots.release()
+                next_position += 1
+
+    finally:
+        # Also stops the threads when the consumer stops iterating early
+        stop_event.set()
+        for thread in threads:
+            thread.join()
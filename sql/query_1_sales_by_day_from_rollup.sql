@@ -0,0 +1,11 @@
+SELECT
+    date AS date,
+    SUM(ventes) AS ventes
+FROM
+    `test_sevrier.SALES_BY_DATE`
+WHERE
+    date BETWEEN "2019-01-01" AND "2019-12-31"
+GROUP BY
+    date
+ORDER BY
+    date ASC
@@ -0,0 +1,20 @@
+SELECT
+    client_id AS client_id,
+    SUM(
+        CASE
+            WHEN product_type = 'MEUBLE' THEN ventes
+            ELSE 0
+        END
+    ) AS ventes_meuble,
+    SUM(
+        CASE
+            WHEN product_type = 'DECO' THEN ventes
+            ELSE 0
+        END
+    ) AS ventes_deco
+FROM
+    `test_sevrier.SALES_BY_CLIENT_PRODUCT_TYPE`
+WHERE
+    date BETWEEN "2019-01-01" AND "2019-12-31"
+GROUP BY
+    client_id